@@ -0,0 +1,251 @@
+"""
+Модуль async_engine содержит асинхронный движок выполнения операций над фича‑флагами.
+Все выбранные окружения обрабатываются конкурентно в одном потоке и одном event loop
+вместо отдельного QThread на окружение. Модуль не зависит от PyQt5.
+
+Для работы требуется пакет aiohttp (необязательная зависимость); без него AVAILABLE = False.
+Повторы запросов, задержки (Retry-After или экспоненциальная) и ограничитель частоты окружения
+те же, что у client.request().
+
+Содержимое:
+  - AVAILABLE: установлен ли aiohttp.
+  - run_jobs(): корутина, выполняющая список заданий (окружение, операция, данные).
+  - AsyncEngine: запускает run_jobs() в собственном event loop и поддерживает остановку и паузу.
+"""
+
+import asyncio
+import time
+
+from config import ENV_CONFIG
+import client
+import results
+from client import get_token, OperationControl
+from results import FlagResult
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+AVAILABLE = aiohttp is not None
+
+
+async def _checkpoint(control):
+    """Ждёт, пока выполнение на паузе; после остановки отменяет текущую задачу."""
+    while control.paused:
+        await asyncio.sleep(0.1)
+    if control.cancelled:
+        raise asyncio.CancelledError()
+
+
+def _client_timeout(envKC):
+    timeout = ENV_CONFIG[envKC].get("timeout", client.REQUEST_TIMEOUT)
+    connect, read = timeout if isinstance(timeout, (list, tuple)) else (timeout, timeout)
+    return aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+
+
+async def _acquire(limiter, control):
+    """Ждёт токен ограничителя частоты окружения, не блокируя event loop."""
+    while True:
+        wait = limiter.try_acquire()
+        if not wait:
+            return
+        await asyncio.sleep(wait)
+        await _checkpoint(control)
+
+
+async def _send(envKC, session, slots, method, url, headers, control, json_data=None):
+    """
+    Выполняет запрос с повторами и ограничением частоты по правилам client.request(): идемпотентные
+    запросы повторяются при ошибках соединения и статусах client.RETRY_STATUSES, POST – только при 429.
+    :return: (HTTP-статус, ответ – json или текст); тело успешного ответа разбирается только
+             при results.KEEP_RESPONSES, иначе дочитывается и отбрасывается (ответ – None)
+    """
+    limiter = client.get_rate_limiter(envKC)
+    attempts = client.retry_attempts(envKC)
+    idempotent = method in client.IDEMPOTENT_METHODS
+    for attempt in range(attempts):
+        last_attempt = attempt == attempts - 1
+        await _checkpoint(control)
+        async with slots:
+            await _checkpoint(control)
+            await _acquire(limiter, control)
+            try:
+                async with session.request(method, url, headers=headers, json=json_data) as response:
+                    status = response.status
+                    if last_attempt or status not in client.RETRY_STATUSES or (not idempotent and status != 429):
+                        if status >= 400:
+                            raise aiohttp.ClientResponseError(
+                                response.request_info, response.history, status=status,
+                                message=(await response.text())[:results.BODY_LIMIT])
+                        body = await response.read()
+                        if not results.KEEP_RESPONSES:
+                            return status, None
+                        try:
+                            return status, client.loads_json(body)
+                        except ValueError:
+                            return status, await response.text()
+                    delay = client.retry_delay(attempt, response)
+                    if status == 429:
+                        limiter.pause(delay)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if not idempotent or last_attempt:
+                    raise
+                delay = client.retry_delay(attempt)
+        # Задержка перед повтором – вне слота, чтобы не занимать его у других запросов.
+        await asyncio.sleep(delay)
+
+
+async def _apply(envKC, op, feature_id, send, on_result, target=None):
+    """Выполняет запрос send (корутина _send) и передаёт результат по фиче в on_result."""
+    result = FlagResult(envKC, op, feature_id, target=target)
+    started = time.perf_counter()
+    try:
+        result.status, body = await send
+        if results.KEEP_RESPONSES:
+            result.body = body
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        result.ok = False
+        result.error = str(e)
+        result.error_class = type(e).__name__
+        if isinstance(e, aiohttp.ClientResponseError):
+            # Тело ответа хранится отдельно, в тексте ошибки – только статус и адрес.
+            result.error = f"{e.status} Error for url: {e.request_info.url}"
+            result.status = e.status
+            result.body = e.message
+    result.elapsed = time.perf_counter() - started
+    on_result(result)
+
+
+async def _run_env_job(envKC, op, data, username, password, slots, emit, on_result, control, started):
+    loop = asyncio.get_running_loop()
+    try:
+        # Токен берётся из общего кэша client; запрос в Keycloak при необходимости выполняется вне event loop.
+        token = await loop.run_in_executor(None, get_token, envKC, username, password)
+        emit(f"[{envKC}] Получен токен: {token[:30]}...")
+    except Exception as e:
+        emit(f"[{envKC}] Ошибка при получении токена: {str(e)}")
+        started[envKC] = False
+        return
+    started[envKC] = True
+
+    base_url = ENV_CONFIG[envKC]["feature"]
+    headers = {"accept": "*/*", "Content-Type": "application/json", "Authorization": f"Bearer {token}"}
+    limit = ENV_CONFIG[envKC].get("concurrency", client.ENV_CONCURRENCY)
+    connector = aiohttp.TCPConnector(limit=limit, ssl=False)
+    async with aiohttp.ClientSession(connector=connector, timeout=_client_timeout(envKC)) as session:
+        if op == "create":
+            await _apply(envKC, op, data.get("id"),
+                         _send(envKC, session, slots, "POST", base_url, headers, control, data), on_result)
+        elif op == "delete":
+            await asyncio.gather(*(
+                _apply(envKC, op, feature_id,
+                       _send(envKC, session, slots, "DELETE", f"{base_url}/{feature_id}", headers, control),
+                       on_result)
+                for feature_id in data))
+        elif op == "update":
+            await asyncio.gather(*(
+                _apply(envKC, op, feature_id,
+                       _send(envKC, session, slots, "PUT", f"{base_url}/{feature_id}/enabled/{enabled}", headers,
+                             control),
+                       on_result, enabled)
+                for feature_id, enabled in data))
+        else:
+            emit(f"[{envKC}] Неподдерживаемая операция: {op}")
+
+
+async def run_jobs(jobs, username, password, emit, control=None, on_result=None, started=None):
+    """
+    Выполняет задания для всех окружений конкурентно.
+
+    :param jobs: список кортежей (envKC, op, data), где op – "create" (data – feature_payload),
+                 "delete" (data – список ID) или "update" (data – список кортежей (ID, enabled))
+    :param username: имя пользователя для авторизации
+    :param password: пароль для авторизации
+    :param emit: функция, принимающая строку сообщения (тот же формат, что и result_signal worker-ов)
+    :param control: необязательный client.OperationControl для паузы и остановки
+    :param on_result: функция, принимающая результат по каждой фиче (results.FlagResult);
+                      по умолчанию текст результата передаётся в emit
+    :param started: необязательный словарь, в который записывается {envKC: True, если токен получен}
+    """
+    if not AVAILABLE:
+        raise RuntimeError("Для асинхронного движка требуется пакет aiohttp.")
+    control = control or OperationControl()
+    if on_result is None:
+        def on_result(result):
+            emit(result.format())
+    started = {} if started is None else started
+    slots = asyncio.Semaphore(client.GLOBAL_CONCURRENCY)
+    await asyncio.gather(*(
+        _run_env_job(envKC, op, data, username, password, slots, emit, on_result, control, started)
+        for envKC, op, data in jobs
+    ))
+
+
+def _job_items(op, data):
+    """Фичи задания run_jobs(): список кортежей (ID, целевое значение enabled или None)."""
+    if op == "create":
+        return [(data.get("id"), None)]
+    if op == "delete":
+        return [(feature_id, None) for feature_id in data]
+    if op == "update":
+        return list(data)
+    return []
+
+
+class AsyncEngine:
+    """
+    Выполняет run_jobs() в собственном event loop текущего потока.
+    Метод cancel() можно вызывать из любого потока – он отменяет все запросы в полёте;
+    control.pause()/control.resume() приостанавливают отправку новых запросов.
+    Фичи, по которым к моменту остановки нет результата, сообщаются в on_result с cancelled=True.
+    """
+
+    def __init__(self, jobs, username, password, emit, on_result=None):
+        self.jobs = jobs
+        self.username = username
+        self.password = password
+        self.emit = emit
+        self.on_result = on_result
+        self.control = OperationControl()
+        self.started = {}
+        self._pending = {(envKC, feature_id): (op, target)
+                         for envKC, op, data in jobs for feature_id, target in _job_items(op, data)}
+        self._loop = None
+        self._task = None
+
+    def _record(self, result):
+        self._pending.pop((result.env, result.id), None)
+        if self.on_result is not None:
+            self.on_result(result)
+        else:
+            self.emit(result.format())
+
+    def run(self):
+        """
+        Выполняет задания.
+        :return: словарь {envKC: True, если токен получен и операция запущена}
+        """
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._task = self._loop.create_task(run_jobs(self.jobs, self.username, self.password, self.emit,
+                                                      self.control, self._record, self.started))
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            self.emit("Выполнение прервано.")
+        finally:
+            self._loop.close()
+        if self.control.cancelled:
+            # Как у worker-ов с потоками: окружения без токена не сообщают результатов по фичам.
+            for (envKC, feature_id), (op, target) in list(self._pending.items()):
+                if self.started.get(envKC) is False:
+                    continue
+                self._record(FlagResult(envKC, op, feature_id, ok=False, target=target, cancelled=True))
+        return dict(self.started)
+
+    def cancel(self):
+        self.control.cancel()
+        if self._loop is not None and self._task is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._task.cancel)
@@ -0,0 +1,257 @@
+"""
+Модуль benchmark содержит офлайн‑бенчмарк сетевого слоя: worker-ы CreateMultipleWorker, DeleteMultipleWorker
+и ActivityUpdateWorker выполняются против локального mock_server.MockServer при разном числе фич
+и уровне параллелизма, а результаты дописываются в JSONL‑файл и сравниваются с предыдущими запусками.
+
+Worker-ы выполняются через run() в потоке бенчмарка (без event loop Qt), поэтому измеряется тот же код,
+что и в приложении, без влияния GUI. Ограничитель частоты клиента по умолчанию отключён, чтобы измерять
+пропускную способность самого сетевого слоя (--rate-limit возвращает его).
+
+config.py приложения не используется: до импорта client и worker-ов модулем config подставляется
+собственный ENV_CONFIG бенчмарка, в который записываются только окружения mock-сервера. Поэтому бенчмарк
+запускается отдельным процессом и не может отправить запросы на настоящие стенды.
+
+Пример:
+    python benchmark.py --counts 100 1000 --concurrency 4 8 16 --latency 0.02 --error-rate 0.01
+    python benchmark.py --quick --fail-on-regression   # перед сборкой релиза
+
+Код завершения 1 означает, что пропускная способность какого-либо сценария упала больше чем на
+--threshold относительно лучшего предыдущего результата того же сценария на этой машине.
+
+Содержимое:
+  - ENV_CONFIG: окружения mock-сервера, подставляемые вместо config.ENV_CONFIG.
+  - RESULTS_PATH, REGRESSION_THRESHOLD: файл результатов и допустимое падение по умолчанию.
+  - run_case(): выполняет один сценарий и возвращает результат.
+  - find_regressions(): сравнивает результаты с предыдущими.
+  - main(): точка входа.
+"""
+
+import argparse
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+ENV_CONFIG = {}
+sys.modules["config"] = types.ModuleType("config")
+sys.modules["config"].ENV_CONFIG = ENV_CONFIG
+
+import client
+from mock_server import MockServer
+from progress import percentile
+
+if client.ENV_CONFIG is not ENV_CONFIG:
+    raise ImportError("benchmark запускается отдельным процессом: config.py приложения уже загружен")
+
+RESULTS_PATH = os.path.join("benchmarks", "results.jsonl")
+REGRESSION_THRESHOLD = 0.15
+OPERATIONS = ("create", "delete", "update")
+USERNAME = "benchmark"
+PASSWORD = "benchmark"
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              timeout=5, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _configure(server, envs, concurrency, batch, rate_limit, retries):
+    """Направляет ENV_CONFIG бенчмарка на mock-сервер (только окружения envs) и сбрасывает сессии, токены и лимиты."""
+    ENV_CONFIG.clear()
+    for env, env_config in server.env_config(batch).items():
+        if env in envs:
+            env_config.update(concurrency=concurrency, pool_maxsize=max(concurrency, client.POOL_MAXSIZE),
+                              rate_limit=rate_limit, retries=retries)
+            ENV_CONFIG[env] = env_config
+    client.configure_concurrency(global_concurrency=concurrency * len(envs))
+    client.close_sessions()
+    client.clear_tokens()
+
+
+def _payload(feature_id):
+    return {
+        "id": feature_id,
+        "description": "benchmark",
+        "enabled": False,
+        "team": "mock-team",
+        "audience": {"type": "ALL", "target": ["mock"]},
+        "removalFeatureTaskId": "",
+        "isScheduledForRemoval": False,
+        "taskId": "OMNI-1",
+        "plannedRemovalDate": ""
+    }
+
+
+def run_case(server, op, envs, count, concurrency, batch=False, rate_limit=None, retries=0):
+    """
+    Выполняет сценарий: операция op над count фичами в каждом окружении envs.
+
+    :return: словарь с параметрами сценария и результатами: длительность, пропускная способность
+             (фич в секунду), успешные и неуспешные фичи, p50/p95/p99 длительности запроса в мс.
+    """
+    from workers import CreateMultipleWorker, DeleteMultipleWorker, ActivityUpdateWorker
+
+    _configure(server, envs, concurrency, batch, rate_limit, retries)
+    ids = [f"bench.{op}.feature{i}" for i in range(count)]
+    for env in envs:
+        server.flags[env].clear()
+        if op != "create":
+            server.seed(env, ids)
+    requests_before = sum(server.requests.values())
+    # Токены получаем заранее: в сценарий входит только выполнение операции.
+    for env in envs:
+        client.get_token(env, USERNAME, PASSWORD)
+
+    # Как в приложении: один пакетный worker на окружение, параллелизм внутри – client.run_concurrently().
+    if op == "create":
+        worker_class, data = CreateMultipleWorker, [_payload(feature_id) for feature_id in ids]
+    elif op == "delete":
+        worker_class, data = DeleteMultipleWorker, ids
+    else:
+        worker_class, data = ActivityUpdateWorker, [(feature_id, "true") for feature_id in ids]
+    workers = [worker_class(env, USERNAME, PASSWORD, data) for env in envs]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(envs)) as executor:
+        list(executor.map(lambda worker: worker.run(), workers))
+    duration = time.perf_counter() - started
+
+    latencies = sorted(latency for worker in workers for latency in worker.progress.latencies())
+    ok = sum(worker.progress.ok for worker in workers)
+    failed = sum(worker.progress.failed for worker in workers)
+    total = count * len(envs)
+    return {
+        "op": op,
+        "envs": len(envs),
+        "count": count,
+        "concurrency": concurrency,
+        "batch": batch,
+        "duration": round(duration, 4),
+        "throughput": round(total / duration, 1) if duration else None,
+        "ok": ok,
+        "failed": failed,
+        "requests": sum(server.requests.values()) - requests_before,
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 2) if latencies else None,
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2) if latencies else None,
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2) if latencies else None
+    }
+
+
+def _case_key(result, environment):
+    return (environment["host"], result["op"], result["envs"], result["count"], result["concurrency"],
+            result["batch"], environment["latency"], environment["error_rate"], environment["throttle_rps"],
+            environment.get("rate_limit"), environment.get("retries"))
+
+
+def load_results(path):
+    """Читает сохранённые результаты (некорректные строки пропускаются)."""
+    if not os.path.exists(path):
+        return []
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+def find_regressions(records, run, threshold=REGRESSION_THRESHOLD):
+    """
+    Сравнивает результаты запуска run с лучшими предыдущими результатами тех же сценариев.
+    :return: список строк с описанием регрессий
+    """
+    best = {}
+    for record in records:
+        for result in record.get("results", []):
+            key = _case_key(result, record["environment"])
+            if result.get("throughput") and result["throughput"] > best.get(key, 0):
+                best[key] = result["throughput"]
+    regressions = []
+    for result in run["results"]:
+        previous = best.get(_case_key(result, run["environment"]))
+        if previous and result["throughput"] is not None and result["throughput"] < previous * (1 - threshold):
+            regressions.append(f"{result['op']} count={result['count']} concurrency={result['concurrency']}: "
+                               f"{result['throughput']} фич/с против лучших {previous} "
+                               f"(-{(1 - result['throughput'] / previous) * 100:.0f}%)")
+    return regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Офлайн-бенчмарк сетевого слоя против локального mock-сервера.")
+    parser.add_argument("--ops", nargs="+", choices=OPERATIONS, default=list(OPERATIONS))
+    parser.add_argument("--counts", nargs="+", type=int, default=[100, 1000], help="число фич на окружение")
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[4, 8, 16],
+                        help="число параллельных запросов на окружение")
+    parser.add_argument("--envs", type=int, default=1, choices=range(1, 6), help="число окружений")
+    parser.add_argument("--batch", action="store_true", help="использовать пакетные endpoint-ы")
+    parser.add_argument("--latency", type=float, default=0.01, help="задержка ответа mock-сервера, с")
+    parser.add_argument("--jitter", type=float, default=0.0, help="разброс задержки, с")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="доля ответов с ошибкой 500")
+    parser.add_argument("--throttle-rps", type=int, help="лимит mock-сервера, сверх которого он отвечает 429")
+    parser.add_argument("--rate-limit", type=float, help="ограничитель частоты клиента, запросов/с на окружение")
+    parser.add_argument("--retries", type=int, default=0,
+                        help="число повторов запроса клиента (по умолчанию 0: ошибки mock-сервера не повторяются)")
+    parser.add_argument("--quick", action="store_true", help="короткий набор: 200 фич, параллелизм 8")
+    parser.add_argument("--output", "-o", default=RESULTS_PATH, help="файл результатов JSONL")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="допустимое падение пропускной способности (доля)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="код завершения 1 при регрессии")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.quick:
+        args.counts, args.concurrency = [200], [8]
+    server = MockServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                        throttle_rps=args.throttle_rps).start()
+    envs = list(server.flags)[:args.envs]
+    environment = {
+        "host": socket.gethostname(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "latency": args.latency,
+        "error_rate": args.error_rate,
+        "throttle_rps": args.throttle_rps,
+        "rate_limit": args.rate_limit,
+        "retries": args.retries
+    }
+    run = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "revision": _git_revision(),
+           "environment": environment, "results": []}
+    try:
+        for op in args.ops:
+            for count in args.counts:
+                for concurrency in args.concurrency:
+                    result = run_case(server, op, envs, count, concurrency, args.batch, args.rate_limit,
+                                      args.retries)
+                    run["results"].append(result)
+                    print(f"{op:<7} фич={count:<6} параллелизм={concurrency:<3} {result['duration']:>8.3f} с "
+                          f"{result['throughput']:>9} фич/с  p50={result['p50_ms']} мс  p95={result['p95_ms']} мс  "
+                          f"ошибок={result['failed']}", file=sys.stderr)
+    finally:
+        server.stop()
+        client.close_sessions()
+
+    regressions = find_regressions(load_results(args.output), run, args.threshold)
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.output, "a", encoding="utf-8") as f:
+        f.write(json.dumps(run, ensure_ascii=False) + "\n")
+    for regression in regressions:
+        print(f"Регрессия: {regression}", file=sys.stderr)
+    print(f"Результаты сохранены в {args.output}", file=sys.stderr)
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+"""
+Модуль catalogue содержит загрузку каталога фича‑флагов окружений и его локальный кэш на диске.
+Модуль не зависит от PyQt5.
+
+Каталог запрашивается GET‑запросом на адрес ENV_CONFIG[env]["catalogue"] (по умолчанию – адрес "feature").
+Поддерживаются ответы в виде списка фич и постраничные ответы ({"content": [...], "totalPages": N});
+страницы после первой загружаются параллельно. Снимок каталога хранится в компактном JSON
+в CATALOGUE_DIR вместе с ETag/Last-Modified, и при обновлении сервер сначала проверяет их
+(If-None-Match / If-Modified-Since): если каталог не изменился, ответ 304 без тела.
+Ответы и снимок разбираются через client.loads_json() – orjson, если он установлен.
+
+Содержимое:
+  - CATALOGUE_DIR, PAGE_SIZE: каталог снимков и размер страницы по умолчанию.
+  - load_snapshot(), save_snapshot(): чтение и запись снимка окружения.
+  - fetch_catalogue(): загружает каталог окружения с учётом ETag/Last-Modified.
+  - sync_catalogue(): обновляет каталог окружения и снимок на диске с готовым токеном.
+  - refresh_catalogue(): получает токен и обновляет каталог окружения.
+  - refresh_all(): параллельно обновляет каталоги нескольких окружений.
+  - get_flags(), cached_ids(): доступ к загруженным каталогам.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import ENV_CONFIG
+from client import request, get_token, run_concurrently, parse_response, loads_json
+
+CATALOGUE_DIR = os.path.join(os.path.expanduser("~"), ".feature_toggle_manager", "catalogue")
+PAGE_SIZE = 1000
+
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+
+
+def _snapshot_path(envKC):
+    return os.path.join(CATALOGUE_DIR, f"{envKC}.json")
+
+
+def load_snapshot(envKC):
+    """
+    Возвращает снимок каталога окружения (из памяти или с диска).
+    :return: словарь {"flags": [...], "etag": ..., "last_modified": ..., "fetched_at": ...} или None
+    """
+    with _snapshots_lock:
+        snapshot = _snapshots.get(envKC)
+    if snapshot is not None:
+        return snapshot
+    try:
+        with open(_snapshot_path(envKC), "rb") as f:
+            snapshot = loads_json(f.read())
+    except (OSError, ValueError):
+        return None
+    with _snapshots_lock:
+        _snapshots.setdefault(envKC, snapshot)
+    return snapshot
+
+
+def save_snapshot(envKC, snapshot):
+    """Атомарно сохраняет снимок каталога окружения на диск и в память."""
+    os.makedirs(CATALOGUE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=CATALOGUE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, _snapshot_path(envKC))
+    except Exception:
+        os.remove(tmp_path)
+        raise
+    with _snapshots_lock:
+        _snapshots[envKC] = snapshot
+
+
+def _page_items(body):
+    """Возвращает (фичи страницы, общее число страниц) для списка или постраничного ответа."""
+    if isinstance(body, list):
+        return body, 1
+    items = body.get("content", body.get("items", []))
+    return items, body.get("totalPages", 1)
+
+
+def fetch_catalogue(envKC, token, etag=None, last_modified=None):
+    """
+    Загружает каталог окружения.
+
+    :return: (список фич, etag, last_modified) или None, если каталог не изменился (304).
+    :raises: исключение при ошибке HTTP.
+    """
+    url = ENV_CONFIG[envKC].get("catalogue", ENV_CONFIG[envKC]["feature"])
+    page_size = ENV_CONFIG[envKC].get("catalogue_page_size", PAGE_SIZE)
+    headers = {"accept": "application/json", "Authorization": f"Bearer {token}"}
+
+    conditional = dict(headers)
+    if etag:
+        conditional["If-None-Match"] = etag
+    if last_modified:
+        conditional["If-Modified-Since"] = last_modified
+    response = request(envKC, "GET", url, headers=conditional, params={"page": 0, "size": page_size})
+    if response.status_code == 304:
+        return None
+    response.raise_for_status()
+    flags, total_pages = _page_items(parse_response(envKC, response, text_fallback=False))
+    flags = list(flags)
+
+    def fetch_page(page):
+        page_response = request(envKC, "GET", url, headers=headers, params={"page": page, "size": page_size})
+        page_response.raise_for_status()
+        return _page_items(parse_response(envKC, page_response, text_fallback=False))[0]
+
+    pages = {}
+    for page, items, error in run_concurrently(envKC, range(1, total_pages), fetch_page):
+        if error is not None:
+            raise error
+        pages[page] = items
+    for page in sorted(pages):
+        flags.extend(pages[page])
+    return flags, response.headers.get("ETag"), response.headers.get("Last-Modified")
+
+
+def sync_catalogue(envKC, token):
+    """
+    Обновляет каталог окружения с уже полученным токеном: проверяет снимок на сервере и при изменениях
+    загружает каталог заново.
+    :return: (список фич, True – если каталог изменился)
+    """
+    snapshot = load_snapshot(envKC) or {}
+    result = fetch_catalogue(envKC, token, snapshot.get("etag"), snapshot.get("last_modified"))
+    if result is None:
+        return snapshot.get("flags", []), False
+    flags, etag, last_modified = result
+    save_snapshot(envKC, {
+        "flags": flags,
+        "etag": etag,
+        "last_modified": last_modified,
+        "fetched_at": time.time()
+    })
+    return flags, True
+
+
+def refresh_catalogue(envKC, username, password):
+    """
+    Обновляет каталог окружения и снимок на диске (см. sync_catalogue()).
+    :return: (список фич, True – если каталог изменился)
+    """
+    return sync_catalogue(envKC, get_token(envKC, username, password))
+
+
+def refresh_all(envs, username, password, emit=None):
+    """
+    Параллельно обновляет каталоги окружений.
+    :param emit: необязательная функция для сообщений о ходе обновления
+    :return: словарь {envKC: список фич} для успешно обновлённых окружений
+    """
+    def refresh(envKC):
+        try:
+            flags, changed = refresh_catalogue(envKC, username, password)
+        except Exception as e:
+            if emit:
+                emit(f"[{envKC}] Ошибка при загрузке каталога: {str(e)}")
+            return envKC, None
+        if emit:
+            state = "загружен" if changed else "не изменился"
+            emit(f"[{envKC}] Каталог {state}: {len(flags)} фич")
+        return envKC, flags
+
+    with ThreadPoolExecutor(max_workers=max(1, len(envs))) as executor:
+        return {envKC: flags for envKC, flags in executor.map(refresh, envs) if flags is not None}
+
+
+def get_flags(envKC):
+    """Возвращает список фич окружения из снимка (пустой список, если каталог ещё не загружался)."""
+    snapshot = load_snapshot(envKC)
+    return snapshot.get("flags", []) if snapshot else []
+
+
+def cached_ids(envs=None):
+    """Возвращает отсортированный список ID фич из снимков указанных (или всех) окружений."""
+    ids = set()
+    for envKC in envs or ENV_CONFIG:
+        ids.update(flag.get("id") for flag in get_flags(envKC) if flag.get("id"))
+    return sorted(ids)
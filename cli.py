@@ -0,0 +1,234 @@
+"""
+Модуль cli содержит консольный (headless) режим клиента без импорта PyQt5.
+Операции читаются из файла или stdin (см. loaders), выполняются параллельно на выбранных средах
+через operations.run_job(), а результаты по каждой фиче пишутся в JSONL.
+
+Пример:
+    python main.py cli delete --env dev --env test -u Ivan.Ivanov -i flags.csv -o results.jsonl
+    cat updates.jsonl | python cli.py update --env all -u Ivan.Ivanov
+
+Пароль берётся из --password, переменной окружения FTM_PASSWORD или запрашивается интерактивно.
+Ctrl+C останавливает запуск: новые запросы не отправляются, в итоге отдельно считаются
+неотправленные фичи (в JSONL у них "cancelled": true). Тела успешных ответов в JSONL не пишутся,
+если не указан --responses. С --processes каждая среда выполняется в отдельном процессе (см. process_engine).
+Каждый запуск пишется в журнал (см. journal); прерванный запуск можно продолжить с невыполненных элементов:
+    python main.py cli delete --resume ~/.feature_toggle_manager/journal/<файл>.jsonl -u Ivan.Ivanov
+С --rollout среды выполняются поэтапно (см. scheduler), например ночью с паузой 30 минут между средами:
+    python main.py cli update --env all --rollout --start-at 01:00 --gap 30 --stage-concurrency prod=2 -i on.csv -u ...
+
+Содержимое:
+  - build_parser(): парсер аргументов командной строки.
+  - main(): точка входа консольного режима, возвращает код завершения.
+"""
+
+import argparse
+import getpass
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import ENV_CONFIG
+from loaders import FORMATS, read_records, records_to_data
+from validation import validate_payloads
+from client import OperationControl
+import results
+from operations import run_job
+from process_engine import ProcessEngine
+from scheduler import (STAGE_ORDER, DEFAULT_GAP, MAX_ERROR_RATE, MIN_SAMPLE, parse_start_time, build_stages,
+                       run_rollout)
+from journal import Journal
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="ftm-cli",
+        description="Массовое создание, удаление и изменение активности фича-флагов без GUI."
+    )
+    parser.add_argument("op", choices=["create", "delete", "update"], help="операция")
+    parser.add_argument("--env", "-e", action="append",
+                        help="среда (можно указать несколько раз) или 'all'")
+    parser.add_argument("--username", "-u", required=True, help="логин без @X5.RU")
+    parser.add_argument("--password", "-p", help="пароль (по умолчанию FTM_PASSWORD или запрос)")
+    parser.add_argument("--input", "-i", default="-", help="файл с операциями или '-' для stdin")
+    parser.add_argument("--format", "-f", choices=FORMATS, help="формат входного файла")
+    parser.add_argument("--output", "-o", default="-", help="файл для результатов JSONL или '-' для stdout")
+    parser.add_argument("--quiet", "-q", action="store_true", help="не выводить сообщения в stderr")
+    parser.add_argument("--resume", metavar="JOURNAL",
+                        help="продолжить прерванный запуск по журналу (--env и --input не нужны)")
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="сохранить длительность запросов по этапам: *.prom – формат Prometheus, иначе JSON")
+    parser.add_argument("--preflight", action="store_true",
+                        help="для delete и update: проверить текущее состояние сред и не отправлять запросы, "
+                             "которые ничего не изменят")
+    parser.add_argument("--responses", action="store_true", help="писать в JSONL тела успешных ответов")
+    parser.add_argument("--processes", action="store_true",
+                        help="выполнять каждую среду в отдельном процессе (для очень больших запусков)")
+    rollout = parser.add_argument_group("поэтапный запуск")
+    rollout.add_argument("--rollout", action="store_true",
+                         help="выполнять среды по очереди: " + " → ".join(STAGE_ORDER))
+    rollout.add_argument("--gap", type=float, default=DEFAULT_GAP / 60,
+                         help="пауза между этапами, минуты (по умолчанию %(default)s)")
+    rollout.add_argument("--start-at", metavar="TIME", type=parse_start_time,
+                         help="начать первый этап не раньше TIME (HH:MM или YYYY-MM-DDTHH:MM)")
+    rollout.add_argument("--stage-at", metavar="ENV=TIME", action="append", default=[],
+                         help="начать этап среды ENV не раньше TIME (можно указать несколько раз)")
+    rollout.add_argument("--stage-concurrency", metavar="[ENV=]N", action="append", default=[],
+                         help="параллельных запросов на этапе: для всех этапов или для среды ENV")
+    rollout.add_argument("--max-error-rate", type=float, default=MAX_ERROR_RATE,
+                         help="остановить запуск, если доля ошибок этапа больше (по умолчанию %(default)s)")
+    rollout.add_argument("--min-sample", type=int, default=MIN_SAMPLE,
+                         help="результатов этапа, после которых доля ошибок проверяется до его окончания")
+    parser.add_argument("--no-journal", action="store_true", help="не вести журнал запуска")
+    parser.add_argument("--update-hosts", action="store_true", help="обновить файл hosts перед запуском")
+    return parser
+
+
+def _resolve_envs(envs):
+    if "all" in envs:
+        return list(ENV_CONFIG)
+    unknown = [env for env in envs if env not in ENV_CONFIG]
+    if unknown:
+        raise ValueError(f"Окружения не настроены в ENV_CONFIG: {', '.join(unknown)}")
+    return list(dict.fromkeys(envs))
+
+
+def _stage_values(values, convert):
+    """Разбирает значения вида "N" и "ENV=N": (значение для всех этапов, {envKC: значение})."""
+    default, per_env = None, {}
+    for value in values:
+        env, separator, text = value.rpartition("=")
+        if separator:
+            per_env[env] = convert(text)
+        else:
+            default = convert(text)
+    return default, per_env
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    for value in args.stage_at:
+        env, separator, _ = value.partition("=")
+        if not env or not separator:
+            parser.error(f"--stage-at: ожидается ENV=TIME, получено '{value}' (для первого этапа – --start-at)")
+    journal = None
+    try:
+        if args.resume:
+            journal = Journal.load(args.resume)
+            if journal.op != args.op:
+                raise ValueError(f"Журнал относится к операции '{journal.op}'")
+            jobs = journal.resume()
+        else:
+            if not args.env:
+                raise ValueError("Не указана ни одна среда (--env)")
+            data = records_to_data(args.op, read_records(args.input, args.format))
+            errors = validate_payloads(data) if args.op == "create" else []
+            if errors:
+                raise ValueError("\n".join(str(error) for error in errors))
+            jobs = {env: data for env in _resolve_envs(args.env)} if data else {}
+            if jobs and not args.no_journal:
+                journal = Journal.create(args.op, jobs)
+        if args.rollout:
+            _, stage_start = _stage_values(args.stage_at, parse_start_time)
+            concurrency, stage_concurrency = _stage_values(args.stage_concurrency, int)
+            stages = build_stages(jobs, args.start_at, concurrency, stage_start, stage_concurrency)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка входных данных: {e}", file=sys.stderr)
+        return 2
+    if not jobs:
+        print("Нет записей для выполнения", file=sys.stderr)
+        if journal is not None:
+            journal.finish()
+        return 2
+    envs = list(jobs)
+    not_run = []
+
+    if args.update_hosts:
+        from utils import update_hosts
+        update_hosts()
+
+    results.KEEP_RESPONSES = args.responses
+    password = args.password or os.environ.get("FTM_PASSWORD") or getpass.getpass("Password: ")
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    lock = threading.Lock()
+    counters = {"ok": 0, "failed": 0, "cancelled": 0}
+    control = OperationControl()
+
+    def emit(message):
+        if not args.quiet:
+            with lock:
+                print(message, file=sys.stderr)
+
+    def on_result(result):
+        with lock:
+            counters["ok" if result.ok else "cancelled" if result.cancelled else "failed"] += 1
+            output.write(json.dumps(result.to_dict(), ensure_ascii=False, default=str) + "\n")
+            if not args.quiet and not result.cancelled:
+                print(result.format(), file=sys.stderr)
+        if journal is not None:
+            journal.record(result)
+
+    try:
+        if args.rollout:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                future = executor.submit(run_rollout, args.op, jobs, stages, args.username, password, emit,
+                                         on_result, control, args.gap * 60, args.max_error_rate, args.min_sample,
+                                         args.preflight)
+                try:
+                    started_envs, _ = future.result()
+                except KeyboardInterrupt:
+                    control.cancel()
+                    print("Остановка: новые запросы не отправляются, ожидание отправленных...", file=sys.stderr)
+                    started_envs, _ = future.result()
+            # Этапы, до которых запуск не дошёл, остаются в журнале и не считаются средами без токена.
+            not_run = [env for env in envs if env not in started_envs]
+            envs = [env for env in envs if env in started_envs]
+            started = [started_envs[env] for env in envs]
+        elif args.processes:
+            engine = ProcessEngine(args.op, jobs, args.username, password, emit, on_result, args.preflight)
+            control = engine.control
+            engine.start()
+            try:
+                started_envs = engine.wait()
+            except KeyboardInterrupt:
+                control.cancel()
+                print("Остановка: новые запросы не отправляются, ожидание отправленных...", file=sys.stderr)
+                started_envs = engine.wait()
+            started = [started_envs.get(env, False) for env in envs]
+        else:
+            with ThreadPoolExecutor(max_workers=len(envs)) as executor:
+                futures = [executor.submit(run_job, env, args.op, jobs[env], args.username, password, emit,
+                                           on_result, control, args.preflight) for env in envs]
+                try:
+                    started = [future.result() for future in futures]
+                except KeyboardInterrupt:
+                    control.cancel()
+                    print("Остановка: новые запросы не отправляются, ожидание отправленных...", file=sys.stderr)
+                    started = [future.result() for future in futures]
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if journal is not None:
+            journal.finish()
+            if journal.remaining():
+                print(f"Невыполненные элементы можно повторить: --resume {journal.path}", file=sys.stderr)
+
+    if args.metrics:
+        import metrics
+        try:
+            metrics.export(args.metrics)
+        except OSError as e:
+            print(f"Не удалось сохранить метрики: {e}", file=sys.stderr)
+
+    failed_envs = [env for env, ok in zip(envs, started) if not ok]
+    print(f"{'Остановлено' if control.cancelled else 'Готово'}: успешно {counters['ok']}, "
+          f"с ошибкой {counters['failed']}, не отправлено {counters['cancelled']}"
+          + (f", не получен токен: {', '.join(failed_envs)}" if failed_envs else "")
+          + (f", не выполнены этапы: {', '.join(not_run)}" if not_run else ""), file=sys.stderr)
+    return 0 if counters["failed"] == 0 and counters["cancelled"] == 0 and not failed_envs and not not_run else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,810 @@
+"""
+Модуль client содержит клиентский слой для сетевых запросов к Keycloak и feature-service.
+Модуль не зависит от PyQt5, через него проходят все worker-ы.
+
+Содержимое:
+  - POOL_CONNECTIONS, POOL_MAXSIZE: лимиты пула соединений по умолчанию.
+  - TimedHTTPAdapter: HTTPAdapter, сообщающий в metrics длительность DNS, TCP connect и TLS новых соединений.
+  - configure_pool(): изменяет лимиты пула и пересоздаёт сессии.
+  - get_session(): возвращает общий keep-alive requests.Session для окружения.
+  - close_sessions(): закрывает все открытые сессии.
+  - TOKEN_REFRESH_MARGIN: за сколько секунд до истечения токен обновляется заранее.
+  - TokenCache: кэш токенов по (окружение, пользователь) с учётом expires_in и обновлением по refresh_token.
+  - get_token(): получает Bearer‑токен (из общего кэша).
+  - clear_tokens(): очищает кэш токенов.
+  - RETRY_ATTEMPTS, RETRY_STATUSES, BACKOFF_BASE, BACKOFF_MAX: параметры повторов по умолчанию.
+  - RATE_LIMIT, RATE_BURST: лимит запросов в секунду на окружение по умолчанию (без ограничения).
+  - TokenBucket: ограничитель частоты запросов.
+  - get_rate_limiter(): возвращает ограничитель частоты окружения.
+  - retry_attempts(), retry_delay(): число попыток и задержка перед повтором (общие с async_engine).
+  - REQUEST_TIMEOUT: таймауты соединения и чтения ответа по умолчанию.
+  - OperationCancelled, OperationControl: остановка и пауза выполняемых операций.
+  - endpoint_name(): имя endpoint-а запроса для метрик.
+  - ORJSON_AVAILABLE: установлен ли orjson (быстрый разбор JSON, необязательная зависимость).
+  - LARGE_JSON: размер ответа, начиная с которого на время разбора приостанавливается сборщик мусора.
+  - loads_json(): разбирает JSON через orjson, если он установлен, иначе через json.
+  - parse_response(): разбирает тело ответа с замером длительности.
+  - RESPONSE_JSON, RESPONSE_LAZY, RESPONSE_STATUS: режимы обработки тела ответа в send_request().
+  - LazyBody: тело ответа, которое разбирается при первом обращении.
+  - request(): выполняет HTTP‑запрос с ограничением частоты, повторами и таймаутами
+    (длительность этапов и статусы ответов записываются в metrics).
+  - send_request(): отправляет HTTP‑запрос через сессию окружения.
+  - ENV_CONCURRENCY, GLOBAL_CONCURRENCY: лимиты параллельных запросов по умолчанию.
+  - configure_concurrency(): изменяет лимиты параллельных запросов.
+  - run_timed(): выполняет операции над списком фич параллельно и отдаёт результаты с длительностью
+    по мере готовности.
+  - run_concurrently(): то же без длительности.
+"""
+
+import gc
+import hashlib
+import json
+import random
+import socket
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+from config import ENV_CONFIG
+import metrics
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ORJSON_AVAILABLE = orjson is not None
+
+# Отключаем предупреждения об SSL сертификатах
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# Количество пулов (хостов) и максимальное число соединений в пуле на одно окружение.
+# Значения можно переопределить для окружения ключами "pool_connections" и "pool_maxsize" в ENV_CONFIG.
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 16
+
+# Число одновременных запросов внутри одного окружения (переопределяется ключом "concurrency" в ENV_CONFIG)
+# и общий лимит одновременных запросов на все окружения сразу.
+ENV_CONCURRENCY = 8
+GLOBAL_CONCURRENCY = 32
+
+# Токен обновляется в фоне, если до его истечения осталось меньше указанного числа секунд.
+TOKEN_REFRESH_MARGIN = 30
+
+# Повторы запросов: число повторов (ключ "retries" в ENV_CONFIG), статусы, при которых запрос повторяется,
+# и экспоненциальная задержка BACKOFF_BASE * 2^попытка (не больше BACKOFF_MAX) со случайным разбросом.
+# POST (создание) не идемпотентен и повторяется только при 429 – запрос не был принят сервером.
+RETRY_ATTEMPTS = 3
+RETRY_STATUSES = (429, 502, 503, 504)
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30
+IDEMPOTENT_METHODS = ("GET", "PUT", "DELETE")
+
+# Таймауты (соединение, чтение ответа) в секундах: зависший запрос не держит операцию и её остановку.
+# Переопределяются для окружения ключом "timeout" в ENV_CONFIG (число или пара чисел).
+REQUEST_TIMEOUT = (5, 30)
+
+# Режимы обработки тела ответа в send_request(): разобрать сразу (JSON или текст), прочитать и разобрать
+# при первом обращении (LazyBody) или только проверить статус – тело дочитывается без декодирования
+# и отбрасывается, соединение возвращается в пул.
+RESPONSE_JSON = "json"
+RESPONSE_LAZY = "lazy"
+RESPONSE_STATUS = "status"
+
+# Разбор большого JSON (каталог из десятков тысяч фич) создаёт сотни тысяч объектов, и циклический
+# сборщик мусора запускается на нём десятки раз впустую – для ответов от LARGE_JSON байт он приостанавливается.
+LARGE_JSON = 1024 * 1024
+
+# Лимит запросов в секунду и размер всплеска на окружение (ключи "rate_limit" и "rate_burst" в ENV_CONFIG).
+# По умолчанию частота не ограничивается (паузы по Retry-After ответа 429 действуют всегда);
+# лимит включается для окружения ключом "rate_limit".
+RATE_LIMIT = None
+RATE_BURST = 20
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+_rate_limiters = {}
+_global_slots = threading.BoundedSemaphore(GLOBAL_CONCURRENCY)
+
+
+def configure_pool(pool_connections=None, pool_maxsize=None):
+    """
+    Изменяет лимиты пула соединений по умолчанию.
+    Уже открытые сессии закрываются и будут пересозданы при следующем запросе.
+    """
+    global POOL_CONNECTIONS, POOL_MAXSIZE
+    if pool_connections is not None:
+        POOL_CONNECTIONS = pool_connections
+    if pool_maxsize is not None:
+        POOL_MAXSIZE = pool_maxsize
+    close_sessions()
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    """Соединение, измеряющее разрешение имени и установку TCP‑соединения (см. metrics)."""
+
+    def _new_conn(self):
+        started = time.perf_counter()
+        host = self._dns_host
+        try:
+            addresses = socket.getaddrinfo(host.strip("[]"), self.port, allowed_gai_family(), socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        resolved = time.perf_counter()
+        metrics.record_phase("dns", resolved - started)
+        # Соединение устанавливается по уже разрешённым адресам (по очереди, как в create_connection urllib3:
+        # при отказе или таймауте – следующий адрес), поэтому имя разрешается один раз.
+        # _dns_host, allowed_gai_family и NameResolutionError – из urllib3 2.x (см. requirements.txt).
+        try:
+            for number, address in enumerate(addresses, start=1):
+                self._dns_host = address[4][0]
+                try:
+                    sock = super()._new_conn()
+                    break
+                except (NewConnectionError, ConnectTimeoutError):
+                    if number == len(addresses):
+                        raise
+            else:
+                sock = super()._new_conn()
+        finally:
+            self._dns_host = host
+        connected = time.perf_counter()
+        metrics.record_phase("connect", connected - resolved)
+        self._new_conn_seconds = connected - started
+        return sock
+
+
+class _TimedHTTPSConnection(HTTPSConnection, _TimedHTTPConnection):
+    """HTTPS‑соединение, дополнительно измеряющее TLS‑рукопожатие."""
+
+    def connect(self):
+        self._new_conn_seconds = 0.0
+        started = time.perf_counter()
+        super().connect()
+        metrics.record_phase("tls", max(0.0, time.perf_counter() - started - self._new_conn_seconds))
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter, соединения которого сообщают в metrics длительность DNS, TCP connect и TLS."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool
+        }
+
+
+def get_session(envKC):
+    """
+    Возвращает requests.Session окружения с настроенным HTTPAdapter.
+    Сессия создаётся при первом обращении и переиспользуется всеми worker-ами,
+    поэтому TCP/TLS соединения сохраняются между запросами и нажатиями кнопок.
+
+    :param envKC: ключ окружения ("dev", "test", "preprod", "stage", "prod")
+    :return: requests.Session
+    """
+    session = _sessions.get(envKC)
+    if session is not None:
+        return session
+    with _sessions_lock:
+        session = _sessions.get(envKC)
+        if session is None:
+            env_config = ENV_CONFIG.get(envKC, {})
+            adapter = TimedHTTPAdapter(
+                pool_connections=env_config.get("pool_connections", POOL_CONNECTIONS),
+                pool_maxsize=env_config.get("pool_maxsize", POOL_MAXSIZE),
+                pool_block=True
+            )
+            session = requests.Session()
+            session.verify = False
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[envKC] = session
+    return session
+
+
+def close_sessions():
+    """Закрывает все открытые сессии и освобождает их соединения."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+        _rate_limiters.clear()
+
+
+class OperationCancelled(Exception):
+    """Операция остановлена через OperationControl.cancel()."""
+
+    def __str__(self):
+        return "Операция остановлена, запрос не отправлялся"
+
+
+class OperationControl:
+    """
+    Потокобезопасное управление выполняемой операцией: cancel() – остановить, pause()/resume() – приостановить
+    и продолжить. Сетевой слой вызывает checkpoint() перед каждым запросом, поэтому после остановки новые
+    запросы не отправляются, а уже отправленные завершаются не дольше чем за REQUEST_TIMEOUT.
+    """
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+
+    @classmethod
+    def shared(cls, context):
+        """
+        Создаёт OperationControl на событиях multiprocessing: его можно передать дочерним процессам
+        контекста context, и остановка или пауза в одном процессе действует во всех.
+        """
+        control = cls.__new__(cls)
+        control._cancelled = context.Event()
+        control._running = context.Event()
+        control._running.set()
+        return control
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def paused(self):
+        return not self._running.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+        self._running.set()
+
+    def pause(self):
+        if not self.cancelled:
+            self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def checkpoint(self):
+        """
+        Ждёт, пока операция на паузе; вызывается перед отправкой запроса.
+        :raises: OperationCancelled, если операция остановлена.
+        """
+        self._running.wait()
+        if self._cancelled.is_set():
+            raise OperationCancelled()
+
+    def sleep(self, seconds):
+        """Задержка (например, перед повтором запроса), прерываемая остановкой операции."""
+        if self._cancelled.wait(seconds):
+            raise OperationCancelled()
+
+
+class TokenBucket:
+    """
+    Потокобезопасный ограничитель частоты «ведро токенов»: rate токенов в секунду, не больше burst в запасе
+    (rate=None – без ограничения частоты, но паузы по-прежнему действуют).
+    acquire() блокирует поток до появления токена, try_acquire() не блокирует (для асинхронного движка);
+    pause() останавливает выдачу токенов на время (например, по Retry-After ответа 429), чтобы притормозили
+    все потоки окружения.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        """
+        Забирает токен, если он есть.
+        :return: 0, если токен получен, иначе сколько секунд подождать перед следующей попыткой
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            if not self.rate:
+                return 0
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, control=None):
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            if control is not None:
+                control.sleep(wait)
+            else:
+                time.sleep(wait)
+
+    def pause(self, seconds):
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+
+def get_rate_limiter(envKC):
+    """Возвращает общий для всех потоков ограничитель частоты запросов окружения."""
+    limiter = _rate_limiters.get(envKC)
+    if limiter is None:
+        with _sessions_lock:
+            limiter = _rate_limiters.get(envKC)
+            if limiter is None:
+                env_config = ENV_CONFIG.get(envKC, {})
+                limiter = TokenBucket(env_config.get("rate_limit", RATE_LIMIT),
+                                      env_config.get("rate_burst", RATE_BURST))
+                _rate_limiters[envKC] = limiter
+    return limiter
+
+
+def _retry_after(response):
+    """Возвращает задержку из заголовка Retry-After (секунды или HTTP-дата) или None."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff(attempt):
+    """Экспоненциальная задержка с полным случайным разбросом (full jitter)."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def retry_attempts(envKC):
+    """Число попыток запроса окружения: первая и повторы (ключ "retries" в ENV_CONFIG, иначе RETRY_ATTEMPTS)."""
+    return 1 + max(0, ENV_CONFIG.get(envKC, {}).get("retries", RETRY_ATTEMPTS))
+
+
+def retry_delay(attempt, response=None):
+    """Задержка перед повтором: из Retry-After ответа response, иначе экспоненциальная со случайным разбросом."""
+    delay = _retry_after(response) if response is not None else None
+    return _backoff(attempt) if delay is None else delay
+
+
+def _timeout(envKC):
+    timeout = ENV_CONFIG.get(envKC, {}).get("timeout", REQUEST_TIMEOUT)
+    return tuple(timeout) if isinstance(timeout, (list, tuple)) else timeout
+
+
+def endpoint_name(envKC, method, url):
+    """
+    Возвращает имя endpoint-а для метрик: метод и ключ ENV_CONFIG окружения с самым длинным совпадающим
+    префиксом URL ("DELETE feature", "POST batch_delete", "POST token"), иначе "<метод> other".
+    """
+    best = None
+    for key, value in ENV_CONFIG.get(envKC, {}).items():
+        if isinstance(value, str) and url.startswith(value) and (best is None or len(value) > len(best[1])):
+            best = (key, value)
+    return f"{method} {best[0] if best else 'other'}"
+
+
+def _timed_request(envKC, session, method, url, **kwargs):
+    """Выполняет один запрос через session и записывает длительность его этапов и статус в metrics."""
+    endpoint = endpoint_name(envKC, method, url)
+    metrics.begin_request()
+    started = time.perf_counter()
+    try:
+        response = session.request(method, url, **kwargs)
+    except Exception:
+        metrics.end_request()
+        metrics.count_response(envKC, endpoint, "error")
+        raise
+    total = time.perf_counter() - started
+    phases = metrics.end_request()
+    for phase, seconds in phases.items():
+        metrics.observe(envKC, endpoint, phase, seconds)
+    metrics.observe(envKC, endpoint, "server", max(0.0, response.elapsed.total_seconds() - sum(phases.values())))
+    metrics.observe(envKC, endpoint, "total", total)
+    metrics.count_response(envKC, endpoint, response.status_code)
+    return response
+
+
+_gc_lock = threading.Lock()
+_gc_pauses = 0
+
+
+def _pause_gc():
+    global _gc_pauses
+    with _gc_lock:
+        if _gc_pauses == 0 and gc.isenabled():
+            gc.disable()
+            _gc_pauses = 1
+        elif _gc_pauses:
+            _gc_pauses += 1
+
+
+def _resume_gc():
+    global _gc_pauses
+    with _gc_lock:
+        if _gc_pauses:
+            _gc_pauses -= 1
+            if _gc_pauses == 0:
+                gc.enable()
+
+
+def loads_json(data):
+    """
+    Разбирает JSON из bytes или str: через orjson, если он установлен, иначе через json.
+    На время разбора данных от LARGE_JSON байт сборщик мусора приостанавливается.
+    :raises: ValueError, если данные не JSON.
+    """
+    loads = orjson.loads if orjson is not None else json.loads
+    if len(data) < LARGE_JSON:
+        return loads(data)
+    _pause_gc()
+    try:
+        return loads(data)
+    finally:
+        _resume_gc()
+
+
+def parse_response(envKC, response, text_fallback=True):
+    """
+    Разбирает тело ответа (см. loads_json()) и записывает длительность разбора в metrics.
+    :param text_fallback: вернуть текст ответа, если тело не JSON (иначе – исключение ValueError)
+    """
+    started = time.perf_counter()
+    try:
+        return loads_json(response.content)
+    except ValueError:
+        if not text_fallback:
+            raise
+        return response.text
+    finally:
+        metrics.observe(envKC, endpoint_name(envKC, response.request.method, response.url), "parse",
+                        time.perf_counter() - started)
+
+
+class LazyBody:
+    """
+    Тело ответа, прочитанное, но не разобранное: value() разбирает его при первом обращении
+    (как parse_response()) и запоминает результат.
+    """
+
+    __slots__ = ("envKC", "response", "_value")
+
+    _UNPARSED = object()
+
+    def __init__(self, envKC, response):
+        self.envKC = envKC
+        self.response = response
+        self._value = self._UNPARSED
+        response.content  # Дочитываем тело, чтобы соединение вернулось в пул.
+
+    @property
+    def content(self):
+        return self.response.content
+
+    @property
+    def text(self):
+        return self.response.text
+
+    def value(self):
+        """:return: ответ (json или текст)"""
+        if self._value is self._UNPARSED:
+            self._value = parse_response(self.envKC, self.response)
+        return self._value
+
+    def __str__(self):
+        return self.text
+
+
+def _discard_body(response):
+    """Дочитывает тело ответа, открытого с stream=True, без декодирования и возвращает соединение в пул."""
+    response.raw.drain_conn()
+    response.raw.release_conn()
+
+
+def request(envKC, method, url, control=None, **kwargs):
+    """
+    Выполняет HTTP‑запрос через сессию окружения с учётом ограничителя частоты.
+    Идемпотентные запросы (GET, PUT, DELETE) повторяются при ошибках соединения и статусах
+    из RETRY_STATUSES, POST – только при 429. Задержка берётся из Retry-After, иначе –
+    экспоненциальная со случайным разбросом; 429 также приостанавливает ограничитель окружения.
+    Если timeout не передан, используется таймаут окружения (REQUEST_TIMEOUT).
+
+    :param control: необязательный OperationControl – пауза и остановка перед каждой попыткой
+    :return: requests.Response последней попытки (статус не проверяется)
+    :raises: requests.RequestException, если соединение не удалось после всех попыток;
+             OperationCancelled, если операция остановлена.
+    """
+    session = get_session(envKC)
+    limiter = get_rate_limiter(envKC)
+    attempts = retry_attempts(envKC)
+    idempotent = method in IDEMPOTENT_METHODS
+    kwargs.setdefault("timeout", _timeout(envKC))
+    wait = control.sleep if control is not None else time.sleep
+    for attempt in range(attempts):
+        last_attempt = attempt == attempts - 1
+        if control is not None:
+            control.checkpoint()
+        limiter.acquire(control)
+        if control is not None:
+            control.checkpoint()
+        try:
+            response = _timed_request(envKC, session, method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if not idempotent or last_attempt:
+                raise
+            wait(_backoff(attempt))
+            continue
+        status = response.status_code
+        if last_attempt or status not in RETRY_STATUSES or (not idempotent and status != 429):
+            return response
+        delay = retry_delay(attempt, response)
+        if status == 429:
+            limiter.pause(delay)
+        response.close()
+        wait(delay)
+
+
+def _request_token(envKC, token_payload):
+    """
+    Выполняет запрос к token endpoint окружения.
+    :return: словарь ответа Keycloak (access_token, expires_in, refresh_token, ...)
+    :raises: ValueError, если токен не найден или произошла ошибка HTTP.
+    """
+    urls = ENV_CONFIG.get(envKC)
+    if not urls:
+        raise ValueError(f"Окружение {envKC} не настроено в ENV_CONFIG.")
+    response = _timed_request(
+        envKC, get_session(envKC), "POST", urls["token"],
+        data=token_payload,
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+        timeout=_timeout(envKC)
+    )
+    response.raise_for_status()
+    token_json = parse_response(envKC, response)
+    if not isinstance(token_json, dict):
+        raise ValueError(f"[{envKC}] Ответ token endpoint не является JSON.")
+    if not token_json.get("access_token"):
+        raise ValueError(f"[{envKC}] Не найден access_token в ответе.")
+    return token_json
+
+
+class TokenCache:
+    """
+    Потокобезопасный кэш Bearer‑токенов по ключу (envKC, username).
+    Токен переиспользуется до истечения expires_in; если до истечения осталось меньше
+    refresh_margin секунд, он обновляется в фоне по refresh_token. Истёкший токен
+    обновляется синхронно: сначала по refresh_token, при неудаче – по логину и паролю.
+    """
+
+    def __init__(self, refresh_margin=None):
+        self.refresh_margin = TOKEN_REFRESH_MARGIN if refresh_margin is None else refresh_margin
+        self._entries = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(password):
+        return hashlib.sha256(password.encode("utf-8")).hexdigest()
+
+    def _store(self, key, token_json, digest):
+        now = time.monotonic()
+        entry = {
+            "access_token": token_json["access_token"],
+            "expires_at": now + token_json.get("expires_in", 0),
+            "refresh_token": token_json.get("refresh_token"),
+            "refresh_expires_at": now + token_json.get("refresh_expires_in", token_json.get("expires_in", 0)),
+            "password_digest": digest
+        }
+        with self._lock:
+            self._entries[key] = entry
+        return entry
+
+    def _password_grant(self, envKC, username, password):
+        token_json = _request_token(envKC, {
+            "client_id": "feature-service",
+            "username": username,
+            "grant_type": "password",
+            "password": password
+        })
+        return self._store((envKC, username), token_json, self._digest(password))
+
+    def _refresh_grant(self, envKC, username, entry):
+        token_json = _request_token(envKC, {
+            "client_id": "feature-service",
+            "grant_type": "refresh_token",
+            "refresh_token": entry["refresh_token"]
+        })
+        return self._store((envKC, username), token_json, entry["password_digest"])
+
+    def _refresh_in_background(self, envKC, username, entry):
+        key = (envKC, username)
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._refresh_grant(envKC, username, entry)
+            except Exception:
+                # Текущий токен ещё действует; при следующем обращении обновим синхронно.
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name=f"{envKC}-token-refresh", daemon=True).start()
+
+    def get(self, envKC, username, password):
+        """
+        Возвращает действующий токен для пользователя в окружении.
+        :return: токен (str)
+        """
+        key = (envKC, username)
+        digest = self._digest(password)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry["password_digest"] == digest:
+            now = time.monotonic()
+            if now < entry["expires_at"]:
+                if entry["refresh_token"] and entry["expires_at"] - now < self.refresh_margin:
+                    self._refresh_in_background(envKC, username, entry)
+                return entry["access_token"]
+            if entry["refresh_token"] and now < entry["refresh_expires_at"]:
+                try:
+                    return self._refresh_grant(envKC, username, entry)["access_token"]
+                except Exception:
+                    pass
+        return self._password_grant(envKC, username, password)["access_token"]
+
+    def invalidate(self, envKC, username):
+        """Удаляет токен пользователя окружения из кэша."""
+        with self._lock:
+            self._entries.pop((envKC, username), None)
+
+    def clear(self):
+        """Очищает кэш."""
+        with self._lock:
+            self._entries.clear()
+
+
+_token_cache = TokenCache()
+
+
+def get_token(envKC, username, password):
+    """
+    Возвращает Bearer‑токен для указанного окружения.
+    Токен берётся из общего кэша и запрашивается у Keycloak только при необходимости.
+
+    :param envKC: ключ окружения ("dev", "test", "preprod", "stage", "prod")
+    :param username: имя пользователя для авторизации
+    :param password: пароль для авторизации
+    :return: токен (str)
+    :raises: ValueError, если токен не найден или произошла ошибка HTTP.
+    """
+    return _token_cache.get(envKC, username, password)
+
+
+def clear_tokens():
+    """Очищает общий кэш токенов."""
+    _token_cache.clear()
+
+
+def send_request(envKC, method, url, headers=None, json_data=None, control=None, with_status=False,
+                 response_mode=RESPONSE_JSON):
+    """
+    Отправляет HTTP‑запрос через общую сессию окружения (с повторами и ограничением частоты, см. request()).
+    :param envKC: ключ окружения
+    :param method: "POST", "PUT" или "DELETE"
+    :param url: URL запроса
+    :param headers: заголовки запроса
+    :param json_data: данные для POST/PUT (если применимо)
+    :param control: необязательный OperationControl для паузы и остановки
+    :param with_status: вернуть кортеж (HTTP-статус, ответ)
+    :param response_mode: RESPONSE_JSON – ответ разбирается сразу, RESPONSE_LAZY – возвращается LazyBody,
+                          RESPONSE_STATUS – тело успешного ответа не читается в память, ответ – None
+    :return: ответ (json или текст, LazyBody или None – в зависимости от response_mode)
+    :raises: исключение, если запрос завершился ошибкой (тело ответа с ошибкой доступно
+             через исключение в любом режиме).
+    """
+    if method not in ("POST", "PUT", "DELETE"):
+        raise ValueError("Неподдерживаемый HTTP метод.")
+    stream = response_mode == RESPONSE_STATUS
+    response = request(envKC, method, url, control=control, headers=headers, json=json_data, stream=stream)
+    response.raise_for_status()
+    if response_mode == RESPONSE_STATUS:
+        _discard_body(response)
+        body = None
+    elif response_mode == RESPONSE_LAZY:
+        body = LazyBody(envKC, response)
+    else:
+        body = parse_response(envKC, response)
+    if with_status:
+        return response.status_code, body
+    return body
+
+
+def configure_concurrency(env_concurrency=None, global_concurrency=None):
+    """
+    Изменяет лимиты параллельных запросов.
+    Новый общий лимит применяется к операциям, запущенным после вызова.
+    """
+    global ENV_CONCURRENCY, GLOBAL_CONCURRENCY, _global_slots
+    if env_concurrency is not None:
+        ENV_CONCURRENCY = env_concurrency
+    if global_concurrency is not None:
+        GLOBAL_CONCURRENCY = global_concurrency
+        _global_slots = threading.BoundedSemaphore(GLOBAL_CONCURRENCY)
+
+
+def run_timed(envKC, items, func, control=None, concurrency=None):
+    """
+    Выполняет func(item) для каждого элемента items, держа в работе не более
+    ENV_CONCURRENCY запросов окружения и не более GLOBAL_CONCURRENCY запросов на все окружения.
+
+    :param envKC: ключ окружения
+    :param items: элементы (ID фич, кортежи (ID, enabled) и т.п.)
+    :param func: функция, выполняющая запрос для одного элемента
+    :param control: необязательный OperationControl; после остановки оставшиеся элементы
+                    не выполняются и возвращаются с исключением OperationCancelled
+    :param concurrency: лимит параллельных запросов окружения для этого вызова
+                        (None – ключ "concurrency" в ENV_CONFIG, иначе ENV_CONCURRENCY)
+    :return: генератор кортежей (item, результат, исключение, длительность func в секундах или None)
+             в порядке завершения запросов
+    """
+    if concurrency is None:
+        concurrency = ENV_CONFIG.get(envKC, {}).get("concurrency", ENV_CONCURRENCY)
+    concurrency = max(1, concurrency)
+    slots = _global_slots
+
+    def call(item):
+        try:
+            if control is not None:
+                control.checkpoint()
+            with slots:
+                if control is not None:
+                    control.checkpoint()
+                started = time.perf_counter()
+                try:
+                    return func(item), None, time.perf_counter() - started
+                except Exception as e:
+                    return None, e, time.perf_counter() - started
+        except OperationCancelled as e:
+            return None, e, None
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"{envKC}-request") as executor:
+        futures = {executor.submit(call, item): item for item in items}
+        for future in as_completed(futures):
+            yield (futures[future],) + future.result()
+
+
+def run_concurrently(envKC, items, func, control=None, concurrency=None):
+    """
+    То же, что run_timed(), без длительности запросов.
+    :return: генератор кортежей (item, результат, исключение) в порядке завершения запросов
+    """
+    for item, result, error, _ in run_timed(envKC, items, func, control, concurrency):
+        yield item, result, error
@@ -0,0 +1,125 @@
+"""
+Модуль drift содержит сравнение состояния фича‑флагов между окружениями.
+Модуль не зависит от PyQt5.
+
+Состояние окружений берётся из каталога (catalogue.refresh_all – параллельно, с проверкой ETag),
+затем за один проход по всем каталогам строится словарь ID → {окружение: фича} (hash join по ID)
+и для каждого ID сравниваются поля из DRIFT_FIELDS.
+
+Содержимое:
+  - DRIFT_FIELDS: сравниваемые поля.
+  - fetch_states(): загружает каталоги окружений.
+  - compute_drift(): находит расхождения между окружениями.
+  - export_drift(): сохраняет расхождения в CSV или JSON.
+  - convergence_batch(): формирует списки обновления enabled по эталонному окружению.
+"""
+
+import csv
+import json
+
+from catalogue import refresh_all
+from loaders import parse_bool
+
+DRIFT_FIELDS = ("enabled", "audience", "isScheduledForRemoval", "plannedRemovalDate", "removalFeatureTaskId")
+
+# Значение поля для окружения, в котором фичи нет.
+MISSING = "<нет>"
+
+
+def fetch_states(envs, username, password, emit=None):
+    """
+    Параллельно загружает каталоги окружений.
+    :return: словарь {envKC: список фич} для успешно загруженных окружений
+    """
+    return refresh_all(envs, username, password, emit)
+
+
+def _normalize(field, value):
+    if field == "audience" and isinstance(value, dict):
+        return (value.get("type"), tuple(sorted(str(target) for target in value.get("target") or [])))
+    if field in ("enabled", "isScheduledForRemoval"):
+        return parse_bool(value)
+    return value or ""
+
+
+def _display(field, value):
+    if field == "audience" and isinstance(value, dict):
+        return f"{value.get('type')}: {', '.join(str(target) for target in value.get('target') or [])}"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return "" if value is None else str(value)
+
+
+def compute_drift(states, fields=DRIFT_FIELDS):
+    """
+    Находит расхождения между окружениями.
+
+    :param states: словарь {envKC: список фич}
+    :param fields: сравниваемые поля
+    :return: список расхождений, отсортированный по ID; каждое расхождение – словарь
+             {"id": ..., "field": ..., "values": {envKC: отображаемое значение}, "raw": {envKC: значение}},
+             где field == "exists" означает, что фичи нет в части окружений.
+    """
+    envs = list(states)
+    joined = {}
+    for envKC in envs:
+        for flag in states[envKC]:
+            feature_id = flag.get("id")
+            if feature_id:
+                joined.setdefault(feature_id, {})[envKC] = flag
+
+    drift = []
+    for feature_id in sorted(joined):
+        by_env = joined[feature_id]
+        if len(by_env) < len(envs):
+            drift.append({
+                "id": feature_id,
+                "field": "exists",
+                "values": {envKC: "есть" if envKC in by_env else MISSING for envKC in envs},
+                "raw": {envKC: envKC in by_env for envKC in envs}
+            })
+        if len(by_env) < 2:
+            continue
+        for field in fields:
+            normalized = {_normalize(field, flag.get(field)) for flag in by_env.values()}
+            if len(normalized) > 1:
+                drift.append({
+                    "id": feature_id,
+                    "field": field,
+                    "values": {envKC: _display(field, by_env[envKC].get(field)) if envKC in by_env else MISSING
+                               for envKC in envs},
+                    "raw": {envKC: by_env[envKC].get(field) for envKC in envs if envKC in by_env}
+                })
+    return drift
+
+
+def export_drift(drift, envs, path):
+    """Сохраняет расхождения в файл: JSON для *.json, иначе CSV (id, field, значения по окружениям)."""
+    if path.lower().endswith(".json"):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([{"id": row["id"], "field": row["field"], "values": row["values"]} for row in drift],
+                      f, ensure_ascii=False, indent=2)
+        return
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "field"] + list(envs))
+        for row in drift:
+            writer.writerow([row["id"], row["field"]] + [row["values"].get(envKC, "") for envKC in envs])
+
+
+def convergence_batch(drift, reference_env, target_envs):
+    """
+    Формирует пакеты обновления enabled, приводящие целевые окружения к эталонному.
+    Учитываются только фичи, существующие и в эталонном, и в целевом окружении.
+
+    :return: словарь {envKC: список кортежей (feature_id, "true"/"false")} для ActivityUpdateWorker
+    """
+    batches = {envKC: [] for envKC in target_envs if envKC != reference_env}
+    for row in drift:
+        if row["field"] != "enabled" or reference_env not in row["raw"]:
+            continue
+        reference = parse_bool(row["raw"][reference_env])
+        for envKC in batches:
+            if envKC in row["raw"] and parse_bool(row["raw"][envKC]) != reference:
+                batches[envKC].append((row["id"], "true" if reference else "false"))
+    return {envKC: batch for envKC, batch in batches.items() if batch}
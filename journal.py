@@ -0,0 +1,174 @@
+"""
+Модуль journal содержит журнал массовых операций для возобновления прерванных запусков.
+Модуль не зависит от PyQt5.
+
+Журнал – файл JSONL в JOURNAL_DIR, в который только дописываются записи:
+  - {"type": "plan", "op": ..., "jobs": {env: данные операции}, "created_at": ...} – план запуска;
+  - {"type": "result", "env": ..., "id": ..., "ok": bool, "error": ..., "skipped": true} – результат по фиче
+    ("skipped" – только для фич, пропущенных предварительной проверкой);
+  - {"type": "resume", "at": ...} – запуск продолжен;
+  - {"type": "end", "at": ...} – запуск завершён.
+Выполненными считаются успешные и пропущенные предварительной проверкой фичи (например, фичи нет
+в окружении): при продолжении запуска они не отправляются повторно.
+Каждая запись сразу сбрасывается в файл, а os.fsync выполняется не чаще раза в FSYNC_INTERVAL секунд
+и при закрытии. Недописанная последняя строка (аварийное завершение) при чтении пропускается.
+
+Содержимое:
+  - JOURNAL_DIR: каталог журналов.
+  - Journal: журнал одного запуска (create(), load(), record(), remaining(), finish()).
+  - list_unfinished(): журналы запусков с невыполненными элементами.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+
+JOURNAL_DIR = os.path.join(os.path.expanduser("~"), ".feature_toggle_manager", "journal")
+FSYNC_INTERVAL = 1.0
+
+
+def _item_id(op, item):
+    if op == "create":
+        return item.get("id")
+    if op == "update":
+        return item[0]
+    return item
+
+
+class Journal:
+    """
+    Журнал одного запуска массовой операции.
+    record() потокобезопасен и подходит в качестве on_result для функций модуля operations.
+    """
+
+    def __init__(self, path, op, jobs, done=None, finished=False):
+        self.path = path
+        self.op = op
+        self.jobs = jobs
+        self.done = done if done is not None else {env: set() for env in jobs}
+        self.finished = finished
+        self._file = None
+        self._lock = threading.Lock()
+        self._last_fsync = 0.0
+
+    @classmethod
+    def create(cls, op, jobs, directory=None):
+        """
+        Создаёт журнал нового запуска и записывает в него план.
+        :param op: "create", "delete" или "update"
+        :param jobs: словарь {envKC: данные операции} (как для operations.run_job)
+        """
+        directory = directory or JOURNAL_DIR
+        os.makedirs(directory, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{op}-{uuid.uuid4().hex[:8]}.jsonl"
+        journal = cls(os.path.join(directory, name), op, {env: list(data) for env, data in jobs.items()})
+        journal._write({"type": "plan", "op": op, "jobs": journal.jobs, "created_at": time.time()}, fsync=True)
+        return journal
+
+    @classmethod
+    def load(cls, path):
+        """Читает журнал с диска."""
+        plan = None
+        done = {}
+        finished = False
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get("type") == "plan":
+                    plan = entry
+                    done = {env: set() for env in plan["jobs"]}
+                elif entry.get("type") == "result" and plan is not None and (entry.get("ok") or entry.get("skipped")):
+                    done.setdefault(entry["env"], set()).add(entry["id"])
+                elif entry.get("type") == "end":
+                    finished = True
+                elif entry.get("type") == "resume":
+                    finished = False
+        if plan is None:
+            raise ValueError(f"В журнале {path} нет плана запуска")
+        jobs = plan["jobs"]
+        if plan["op"] == "update":
+            jobs = {env: [tuple(item) for item in data] for env, data in jobs.items()}
+        return cls(path, plan["op"], jobs, done, finished)
+
+    def _write(self, entry, fsync=False):
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._file.flush()
+            now = time.monotonic()
+            if fsync or now - self._last_fsync >= FSYNC_INTERVAL:
+                os.fsync(self._file.fileno())
+                self._last_fsync = now
+
+    def record(self, result):
+        """
+        Записывает результат по фиче (results.FlagResult из on_result модуля operations).
+        Успешные и пропущенные предварительной проверкой фичи считаются выполненными.
+        """
+        if result.ok or result.skipped:
+            with self._lock:
+                self.done.setdefault(result.env, set()).add(result.id)
+        entry = {"type": "result", "env": result.env, "id": result.id, "ok": result.ok, "error": result.error}
+        if result.skipped:
+            entry["skipped"] = True
+        self._write(entry)
+
+    def remaining(self):
+        """Возвращает словарь {envKC: данные операции} из ещё не выполненных элементов."""
+        with self._lock:
+            remaining = {}
+            for env, data in self.jobs.items():
+                done = self.done.get(env, set())
+                items = [item for item in data if _item_id(self.op, item) not in done]
+                if items:
+                    remaining[env] = items
+            return remaining
+
+    def resume(self):
+        """Отмечает продолжение запуска; возвращает оставшиеся элементы."""
+        self.finished = False
+        self._write({"type": "resume", "at": time.time()}, fsync=True)
+        return self.remaining()
+
+    def finish(self):
+        """Отмечает завершение запуска и закрывает файл."""
+        self.finished = True
+        self._write({"type": "end", "at": time.time()}, fsync=True)
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def summary(self):
+        """Краткое описание для списка журналов."""
+        remaining = self.remaining()
+        total = sum(len(data) for data in self.jobs.values())
+        left = sum(len(data) for data in remaining.values())
+        return f"{os.path.basename(self.path)}: {self.op}, осталось {left} из {total} ({', '.join(remaining)})"
+
+
+def list_unfinished(op=None, directory=None):
+    """
+    Возвращает журналы (новые первыми), в которых остались невыполненные элементы.
+    :param op: если указан – только журналы этой операции
+    """
+    directory = directory or JOURNAL_DIR
+    if not os.path.isdir(directory):
+        return []
+    journals = []
+    for name in sorted(os.listdir(directory), reverse=True):
+        if not name.endswith(".jsonl"):
+            continue
+        try:
+            journal = Journal.load(os.path.join(directory, name))
+        except (OSError, ValueError):
+            continue
+        if (op is None or journal.op == op) and journal.remaining():
+            journals.append(journal)
+    return journals
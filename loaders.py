@@ -0,0 +1,179 @@
+"""
+Модуль loaders содержит функции чтения списков операций над фича‑флагами из файлов.
+Модуль не зависит от PyQt5.
+
+Поддерживаемые форматы:
+  - csv: таблица с заголовком (обязательная колонка "id");
+  - json: массив объектов или строк (ID фич);
+  - jsonl: по одному объекту или строке в JSON на строку;
+  - txt: по одному ID фичи на строку;
+  - yaml: список объектов или строк (требуется необязательный пакет PyYAML).
+Манифест в JSON/YAML может быть объектом {"defaults": {...}, "features": [...]}: значения из defaults
+подставляются в записи, где соответствующее поле не заполнено.
+
+Содержимое:
+  - FORMATS: поддерживаемые форматы.
+  - detect_format(): определяет формат по расширению файла.
+  - YAML_AVAILABLE: установлен ли PyYAML.
+  - read_records(): читает записи из файла или stdin ("-").
+  - apply_defaults(): подставляет значения по умолчанию в незаполненные поля записей.
+  - parse_bool(): приводит значение к bool.
+  - build_feature_payload(): собирает feature_payload из записи.
+  - records_to_data(): преобразует записи в данные операции для operations.run_job().
+"""
+
+import csv
+import io
+import json
+import os
+import sys
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+YAML_AVAILABLE = yaml is not None
+
+FORMATS = ("csv", "json", "jsonl", "txt", "yaml")
+
+
+def detect_format(path):
+    """
+    Определяет формат по расширению файла; для stdin ("-") и неизвестных расширений возвращает "jsonl".
+    """
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    if ext == "ndjson":
+        return "jsonl"
+    if ext == "yml":
+        return "yaml"
+    return ext if ext in FORMATS else "jsonl"
+
+
+def _normalize(record):
+    if isinstance(record, str):
+        return {"id": record.strip()}
+    if not isinstance(record, dict):
+        raise ValueError(f"Ожидался объект или строка, получено: {record!r}")
+    return record
+
+
+def read_records(path, fmt=None):
+    """
+    Читает записи операций.
+
+    :param path: путь к файлу или "-" для stdin
+    :param fmt: формат из FORMATS; если не указан – определяется по расширению
+    :return: список словарей (у каждого есть ключ "id")
+    :raises: ValueError при ошибке формата.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Неподдерживаемый формат: {fmt}")
+    if path == "-":
+        text = sys.stdin.read()
+    else:
+        with open(path, "r", encoding="utf-8-sig") as f:
+            text = f.read()
+
+    if fmt == "csv":
+        reader = csv.DictReader(io.StringIO(text))
+        if not reader.fieldnames or "id" not in reader.fieldnames:
+            raise ValueError("В CSV должна быть колонка 'id'.")
+        records = [dict(row) for row in reader]
+    elif fmt in ("json", "yaml"):
+        if fmt == "json":
+            data = json.loads(text)
+        elif yaml is None:
+            raise ValueError("Для чтения YAML требуется пакет PyYAML.")
+        else:
+            try:
+                data = yaml.safe_load(text)
+            except yaml.YAMLError as e:
+                raise ValueError(f"Ошибка YAML: {e}")
+        defaults = {}
+        if isinstance(data, dict):
+            defaults = data.get("defaults") or {}
+            data = data.get("features", [data])
+        records = apply_defaults([_normalize(item) for item in data or []], defaults)
+    elif fmt == "jsonl":
+        records = [_normalize(json.loads(line)) for line in text.splitlines() if line.strip()]
+    else:
+        records = [{"id": line.strip()} for line in text.splitlines() if line.strip()]
+
+    for i, record in enumerate(records, 1):
+        if not str(record.get("id") or "").strip():
+            raise ValueError(f"В записи {i} не заполнен id")
+        record["id"] = str(record["id"]).strip()
+    return records
+
+
+def _is_empty(value):
+    return value is None or (isinstance(value, str) and not value.strip()) or value == []
+
+
+def apply_defaults(records, defaults):
+    """
+    Подставляет значения из defaults в незаполненные поля записей.
+    :return: новый список записей (исходные записи не изменяются)
+    """
+    if not defaults:
+        return records
+    result = []
+    for record in records:
+        merged = dict(record)
+        for key, value in defaults.items():
+            if _is_empty(merged.get(key)):
+                merged[key] = value
+        result.append(merged)
+    return result
+
+
+def parse_bool(value):
+    """Приводит значение ("true"/"false", 1/0, bool) к bool."""
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("true", "1", "yes", "y", "да")
+
+
+def build_feature_payload(record):
+    """
+    Собирает feature_payload для создания фичи из записи.
+    Для плоских форматов (CSV) поддерживаются колонки audience_type и audience_target (через ',').
+    """
+    audience = record.get("audience")
+    if not isinstance(audience, dict):
+        target = record.get("audience_target", "")
+        if isinstance(target, str):
+            target = [s.strip() for s in target.split(",") if s.strip()]
+        audience = {"type": record.get("audience_type") or "ALL", "target": target}
+    return {
+        "id": record["id"],
+        "description": record.get("description", ""),
+        "enabled": parse_bool(record.get("enabled", False)),
+        "team": record.get("team", ""),
+        "audience": audience,
+        "removalFeatureTaskId": record.get("removalFeatureTaskId", ""),
+        "isScheduledForRemoval": parse_bool(record.get("isScheduledForRemoval", False)),
+        "taskId": record.get("taskId", ""),
+        "plannedRemovalDate": record.get("plannedRemovalDate", "")
+    }
+
+
+def records_to_data(op, records):
+    """
+    Преобразует записи в данные операции для operations.run_job().
+    :param op: "create", "delete" или "update"
+    """
+    if op == "create":
+        return [build_feature_payload(record) for record in records]
+    if op == "delete":
+        return [record["id"] for record in records]
+    if op == "update":
+        data = []
+        for i, record in enumerate(records, 1):
+            if "enabled" not in record or record["enabled"] in ("", None):
+                raise ValueError(f"В записи {i} не заполнен enabled")
+            data.append((record["id"], "true" if parse_bool(record["enabled"]) else "false"))
+        return data
+    raise ValueError(f"Неподдерживаемая операция: {op}")
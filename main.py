@@ -1,19 +1,67 @@
 """
 Точка входа в проект Feature Toggle Manager Client.
-Перед запуском основного окна вызывается функция update_hosts() для обновления файла hosts.
+Функция update_hosts() для обновления файла hosts выполняется в фоновом потоке, чтобы не задерживать
+показ основного окна; тяжёлые модули (requests, worker-ы) загружаются после показа окна.
+Если первым аргументом передан "cli", запускается консольный режим (см. cli.py) без импорта PyQt5.
+Флаг --profile-startup печатает в stderr разбивку времени запуска по этапам.
+multiprocessing.freeze_support() нужен процессам сред (см. process_engine) в собранном PyInstaller приложении.
 """
 
+import multiprocessing
 import sys
-from PyQt5.QtWidgets import QApplication
-from views import MainWindow
-from utils import update_hosts
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    if len(sys.argv) > 1 and sys.argv[1] == "cli":
+        from cli import main as cli_main
+        sys.exit(cli_main(sys.argv[2:]))
+
+    import importlib
+    import threading
+    from utils import update_hosts, StartupProfiler
+
+    profile = "--profile-startup" in sys.argv
+    if profile:
+        sys.argv.remove("--profile-startup")
+    profiler = StartupProfiler(enabled=profile)
+
     # Обновляем файл hosts – для успешного выполнения может потребоваться запуск с правами администратора.
-    update_hosts()
+    hosts_thread = threading.Thread(target=update_hosts, name="update-hosts", daemon=True)
+    hosts_thread.start()
+    profiler.mark("Запуск update_hosts в фоне")
+
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QTimer
+    profiler.mark("Импорт PyQt5")
+    from views import MainWindow
+    profiler.mark("Импорт views")
 
     app = QApplication(sys.argv)
+    profiler.mark("Создание QApplication")
     window = MainWindow()
     window.resize(800, 600)
+    profiler.mark("Создание MainWindow")
     window.show()
+    profiler.mark("MainWindow.show()")
+
+    def on_first_event_loop_tick():
+        profiler.mark("Первый проход event loop")
+        # Прогреваем сетевой слой в фоне, пока пользователь заполняет форму.
+        threading.Thread(target=importlib.import_module, args=("workers",), name="preload-workers",
+                         daemon=True).start()
+        if profile:
+            hosts_thread.join()
+            profiler.mark("Ожидание update_hosts")
+            importlib.import_module("workers")
+            profiler.mark("Фоновый прогрев workers (окно уже показано)")
+            profiler.report()
+
+    def close_sessions():
+        # Закрываем keep-alive соединения пула при выходе, только если сетевой слой загружался.
+        client = sys.modules.get("client")
+        if client is not None:
+            client.close_sessions()
+
+    app.aboutToQuit.connect(close_sessions)
+    QTimer.singleShot(0, on_first_event_loop_tick)
     sys.exit(app.exec_())
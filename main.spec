@@ -6,11 +6,13 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    # Модули, импортируемые отложенно (после показа окна), PyInstaller должен найти явно.
+    hiddenimports=['workers', 'operations', 'client', 'async_engine', 'journal', 'process_engine', 'scheduler'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # Не упаковываем неиспользуемые модули: меньше архив – быстрее распаковка --onefile при запуске.
+    excludes=['tkinter', 'unittest', 'pydoc', 'doctest', 'pytest'],
     noarchive=False,
     optimize=0,
 )
@@ -0,0 +1,206 @@
+"""
+Модуль metrics содержит измерение длительности сетевых запросов по этапам.
+Модуль не зависит от PyQt5 и от остальных модулей проекта.
+
+Сетевой слой (client) сообщает длительность этапов каждого запроса:
+  - dns – разрешение имени хоста (только для нового соединения);
+  - connect – установка TCP‑соединения (только для нового соединения);
+  - tls – TLS‑рукопожатие (только для нового HTTPS‑соединения);
+  - server – от отправки запроса до получения заголовков ответа без учёта установки соединения;
+  - parse – разбор тела ответа;
+  - total – запрос целиком.
+Значения складываются в гистограммы с границами BUCKETS по ключу (окружение, endpoint, этап) и
+выгружаются в JSON или в текстовый формат Prometheus (например, для textfile collector node_exporter).
+
+Содержимое:
+  - BUCKETS, PHASES: границы гистограмм (секунды) и этапы запроса.
+  - Histogram: гистограмма длительностей с оценкой перцентилей.
+  - MetricsRegistry: гистограммы и счётчики ответов по окружениям и endpoint-ам.
+  - registry: общий реестр приложения.
+  - begin_request(), record_phase(), end_request(): сбор этапов запроса в текущем потоке.
+  - observe(), count_response(): запись в общий реестр.
+  - export_json(), export_prometheus(), export(): выгрузка общего реестра в файл.
+"""
+
+import json
+import threading
+import time
+from bisect import bisect_left
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PHASES = ("dns", "connect", "tls", "server", "parse", "total")
+
+
+class Histogram:
+    """Гистограмма длительностей: число значений в каждом интервале BUCKETS (последний – +Inf), сумма и максимум."""
+
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, fraction):
+        """
+        Оценивает перцентиль линейной интерполяцией внутри интервала (как histogram_quantile в Prometheus).
+        :return: секунды или None, если значений нет
+        """
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if cumulative + bucket_count >= rank and bucket_count:
+                lower = BUCKETS[index - 1] if index else 0.0
+                upper = BUCKETS[index] if index < len(BUCKETS) else self.max
+                return min(self.max, lower + (upper - lower) * (rank - cumulative) / bucket_count)
+            cumulative += bucket_count
+        return self.max
+
+
+class MetricsRegistry:
+    """Потокобезопасный набор гистограмм по (envKC, endpoint, этап) и счётчиков ответов по (envKC, endpoint, статус)."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._histograms = {}
+        self._responses = {}
+        self._lock = threading.Lock()
+
+    def observe(self, envKC, endpoint, phase, seconds):
+        key = (envKC, endpoint, phase)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def count_response(self, envKC, endpoint, status):
+        """Считает ответ со статусом status ("error" – ответ не получен)."""
+        key = (envKC, endpoint, str(status))
+        with self._lock:
+            self._responses[key] = self._responses.get(key, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._responses.clear()
+            self.started_at = time.time()
+
+    def snapshot(self):
+        """
+        Возвращает состояние реестра:
+        {"started_at", "buckets", "series": [{"env", "endpoint", "phase", "count", "sum", "max", "p50", "p95",
+        "buckets"}], "responses": [{"env", "endpoint", "status", "count"}]}
+        """
+        with self._lock:
+            series = []
+            for (envKC, endpoint, phase), histogram in sorted(self._histograms.items(), key=_series_order):
+                series.append({
+                    "env": envKC,
+                    "endpoint": endpoint,
+                    "phase": phase,
+                    "count": histogram.count,
+                    "sum": histogram.sum,
+                    "max": histogram.max,
+                    "p50": histogram.quantile(0.5),
+                    "p95": histogram.quantile(0.95),
+                    "buckets": list(histogram.counts)
+                })
+            responses = [{"env": envKC, "endpoint": endpoint, "status": status, "count": count}
+                         for (envKC, endpoint, status), count in sorted(self._responses.items())]
+        return {"started_at": self.started_at, "buckets": list(BUCKETS), "series": series, "responses": responses}
+
+    def to_prometheus(self):
+        """Возвращает метрики в текстовом формате Prometheus."""
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP ftm_request_phase_seconds Длительность этапов запросов к Keycloak и feature-service.",
+            "# TYPE ftm_request_phase_seconds histogram"
+        ]
+        for series in snapshot["series"]:
+            labels = _labels(env=series["env"], endpoint=series["endpoint"], phase=series["phase"])
+            cumulative = 0
+            for bound, bucket_count in zip(list(BUCKETS) + ["+Inf"], series["buckets"]):
+                cumulative += bucket_count
+                lines.append(f'ftm_request_phase_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"ftm_request_phase_seconds_sum{{{labels}}} {series['sum']:.6f}")
+            lines.append(f"ftm_request_phase_seconds_count{{{labels}}} {series['count']}")
+        lines.append("# HELP ftm_responses_total Ответы по HTTP-статусам (error – ответ не получен).")
+        lines.append("# TYPE ftm_responses_total counter")
+        for response in snapshot["responses"]:
+            labels = _labels(env=response["env"], endpoint=response["endpoint"], status=response["status"])
+            lines.append(f"ftm_responses_total{{{labels}}} {response['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def _series_order(item):
+    (envKC, endpoint, phase), _ = item
+    return envKC, endpoint, PHASES.index(phase) if phase in PHASES else len(PHASES)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+registry = MetricsRegistry()
+
+_local = threading.local()
+
+
+def begin_request():
+    """Начинает сбор этапов запроса в текущем потоке."""
+    _local.phases = {}
+
+
+def record_phase(phase, seconds):
+    """Добавляет длительность этапа к запросу, выполняемому в текущем потоке (вне запроса – игнорируется)."""
+    phases = getattr(_local, "phases", None)
+    if phases is not None:
+        phases[phase] = phases.get(phase, 0.0) + seconds
+
+
+def end_request():
+    """Заканчивает сбор этапов запроса в текущем потоке. :return: словарь {этап: секунды}"""
+    phases = getattr(_local, "phases", None) or {}
+    _local.phases = None
+    return phases
+
+
+def observe(envKC, endpoint, phase, seconds):
+    registry.observe(envKC, endpoint, phase, seconds)
+
+
+def count_response(envKC, endpoint, status):
+    registry.count_response(envKC, endpoint, status)
+
+
+def export_json(path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(registry.snapshot(), f, ensure_ascii=False, indent=2)
+
+
+def export_prometheus(path):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(registry.to_prometheus())
+
+
+def export(path):
+    """Выгружает общий реестр: в формате Prometheus для *.prom, иначе в JSON."""
+    if path.lower().endswith(".prom"):
+        export_prometheus(path)
+    else:
+        export_json(path)
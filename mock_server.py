@@ -0,0 +1,244 @@
+"""
+Модуль mock_server содержит локальную замену Keycloak и feature-service для бенчмарков и ручной проверки
+без доступа к стендам. Модуль не зависит от PyQt5 и от остальных модулей проекта.
+
+Сервер обслуживает окружения по адресам вида http://127.0.0.1:<port>/<env>/...:
+  - POST /<env>/token – выдаёт токен (password и refresh_token grant);
+  - POST /<env>/features – создание фичи;
+  - GET /<env>/features?page=&size= – каталог постранично с ETag (If-None-Match → 304);
+  - GET и DELETE /<env>/features/<id> – чтение и удаление фичи;
+  - PUT /<env>/features/<id>/enabled/<true|false> – изменение активности;
+  - POST /<env>/features/batch-delete, PUT /<env>/features/batch-enabled – пакетные endpoint-ы.
+Задержка ответа, доля ошибок и ограничение частоты (429 с Retry-After) настраиваются.
+
+Пример:
+    python mock_server.py --port 18080 --latency 0.02 --error-rate 0.01 --throttle-rps 200
+
+Содержимое:
+  - MockServer: сервер с хранилищем фич по окружениям (start(), stop(), env_config(), seed()).
+  - main(): запуск сервера из командной строки.
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+ENVS = ("dev", "test", "preprod", "stage", "prod")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body=None, headers=None):
+        payload = b"" if body is None else json.dumps(body, ensure_ascii=False).encode("utf-8")
+        # Заголовки и тело отправляются одной записью, чтобы задержка не зависела от алгоритма Нейгла.
+        lines = [f"HTTP/1.1 {status} {self.responses.get(status, ('',))[0]}",
+                 "Content-Type: application/json",
+                 f"Content-Length: {len(payload)}"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        self.wfile.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + payload)
+
+    def _handle(self, method):
+        server = self.server.mock
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length) if length else b""
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        server.count(method)
+        if len(parts) < 2 or parts[0] not in server.flags:
+            return self._reply(404, {"error": "unknown path"})
+        if server.latency:
+            time.sleep(max(0.0, random.gauss(server.latency, server.jitter)) if server.jitter else server.latency)
+        if server.throttled():
+            return self._reply(429, {"error": "too many requests"}, {"Retry-After": server.retry_after})
+        if server.error_rate and random.random() < server.error_rate:
+            return self._reply(server.error_status, {"error": "injected error"})
+
+        env, resource, rest = parts[0], parts[1], parts[2:]
+        if resource == "token" and method == "POST":
+            return self._reply(200, {"access_token": hashlib.sha1(str(random.random()).encode()).hexdigest() * 2,
+                                     "expires_in": server.token_ttl, "refresh_token": "refresh",
+                                     "refresh_expires_in": server.token_ttl * 6})
+        if resource != "features":
+            return self._reply(404, {"error": "unknown path"})
+        try:
+            body = json.loads(raw_body) if raw_body else None
+        except ValueError:
+            return self._reply(400, {"error": "invalid json"})
+        flags = server.flags[env]
+        with server.lock:
+            if method == "GET" and not rest:
+                return self._catalogue(flags, parse_qs(url.query))
+            if method == "POST" and not rest:
+                if not isinstance(body, dict) or not body.get("id"):
+                    return self._reply(400, {"error": "id is required"})
+                if body["id"] in flags:
+                    return self._reply(409, {"error": "already exists"})
+                flags[body["id"]] = body
+                return self._reply(200, body)
+            if method == "POST" and rest == ["batch-delete"]:
+                failed = [{"id": feature_id, "error": "not found"} for feature_id in body.get("ids", [])
+                          if flags.pop(feature_id, None) is None]
+                return self._reply(200, {"failed": failed})
+            if method == "PUT" and rest == ["batch-enabled"]:
+                failed = []
+                for item in body or []:
+                    if item.get("id") in flags:
+                        flags[item["id"]]["enabled"] = bool(item.get("enabled"))
+                    else:
+                        failed.append({"id": item.get("id"), "error": "not found"})
+                return self._reply(200, {"failed": failed})
+            if len(rest) == 1 and method in ("GET", "DELETE"):
+                flag = flags.get(rest[0]) if method == "GET" else flags.pop(rest[0], None)
+                return self._reply(404, {"error": "not found"}) if flag is None else self._reply(200, flag)
+            if len(rest) == 3 and rest[1] == "enabled" and method == "PUT":
+                flag = flags.get(rest[0])
+                if flag is None:
+                    return self._reply(404, {"error": "not found"})
+                flag["enabled"] = rest[2] == "true"
+                return self._reply(200, flag)
+        return self._reply(405, {"error": "method not allowed"})
+
+    def _catalogue(self, flags, query):
+        etag = f'"{len(flags)}-{hash(tuple(flags))}"'
+        if self.headers.get("If-None-Match") == etag:
+            return self._reply(304)
+        page = int(query.get("page", ["0"])[0])
+        size = max(1, int(query.get("size", ["1000"])[0]))
+        items = list(flags.values())
+        return self._reply(200, {"content": items[page * size:(page + 1) * size],
+                                 "totalPages": max(1, (len(items) + size - 1) // size)}, {"ETag": etag})
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+class MockServer:
+    """
+    Локальный сервер, эмулирующий token endpoint Keycloak и feature-service для окружений envs.
+
+    :param latency: средняя задержка ответа в секундах
+    :param jitter: стандартное отклонение задержки
+    :param error_rate: доля запросов, завершающихся ошибкой error_status
+    :param throttle_rps: лимит запросов в секунду, сверх которого отвечает 429 (None – без лимита)
+    :param retry_after: значение заголовка Retry-After в ответе 429
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, envs=ENVS, latency=0.0, jitter=0.0, error_rate=0.0,
+                 error_status=500, throttle_rps=None, retry_after="1", token_ttl=300):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.throttle_rps = throttle_rps
+        self.retry_after = retry_after
+        self.token_ttl = token_ttl
+        self.flags = {env: {} for env in envs}
+        self.lock = threading.Lock()
+        self.requests = {}
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._stats_lock = threading.Lock()
+        self._httpd = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        self._httpd = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.mock = self
+        self.port = self._httpd.server_address[1]
+        threading.Thread(target=self._httpd.serve_forever, name="mock-server", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def count(self, method):
+        with self._stats_lock:
+            self.requests[method] = self.requests.get(method, 0) + 1
+
+    def throttled(self):
+        """Считает запросы в окне длиной в секунду и сообщает, превышен ли throttle_rps."""
+        if not self.throttle_rps:
+            return False
+        with self._stats_lock:
+            now = time.monotonic()
+            if now - self._window_start >= 1.0:
+                self._window_start = now
+                self._window_count = 0
+            self._window_count += 1
+            return self._window_count > self.throttle_rps
+
+    def seed(self, env, ids, enabled=False):
+        """Добавляет в окружение фичи с указанными ID."""
+        with self.lock:
+            for feature_id in ids:
+                self.flags[env][feature_id] = {"id": feature_id, "enabled": enabled, "team": "mock-team",
+                                               "audience": {"type": "ALL", "target": ["mock"]},
+                                               "isScheduledForRemoval": False, "plannedRemovalDate": ""}
+
+    def env_config(self, batch=False):
+        """
+        Возвращает настройки окружений в формате ENV_CONFIG, указывающие на этот сервер.
+        :param batch: объявить пакетные endpoint-ы batch_delete и batch_update
+        """
+        config = {}
+        for env in self.flags:
+            config[env] = {"token": f"{self.url}/{env}/token", "feature": f"{self.url}/{env}/features"}
+            if batch:
+                config[env]["batch_delete"] = f"{self.url}/{env}/features/batch-delete"
+                config[env]["batch_update"] = f"{self.url}/{env}/features/batch-enabled"
+        return config
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Локальная замена Keycloak и feature-service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--latency", type=float, default=0.0, help="задержка ответа, с")
+    parser.add_argument("--jitter", type=float, default=0.0, help="разброс задержки, с")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="доля ответов с ошибкой")
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--throttle-rps", type=int, help="лимит запросов в секунду (сверх – 429)")
+    parser.add_argument("--seed", type=int, default=0, help="число фич в каждом окружении при запуске")
+    args = parser.parse_args(argv)
+    server = MockServer(args.host, args.port, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                        error_status=args.error_status, throttle_rps=args.throttle_rps).start()
+    for env in server.flags:
+        server.seed(env, [f"mock.service.feature{i}" for i in range(args.seed)])
+    print(f"Сервер запущен на {server.url}; настройки окружений для config.ENV_CONFIG:")
+    print(json.dumps(server.env_config(), indent=2))
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
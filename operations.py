@@ -0,0 +1,337 @@
+"""
+Модуль operations содержит логику операций над фича‑флагами без зависимости от PyQt5.
+Её используют QThread worker-ы (workers.py) и консольный режим (cli.py).
+
+Общие сообщения (токен, пакетные endpoint-ы, предварительная проверка) операции передают через emit(str) –
+строки того же формата, что и result_signal worker-ов. Результат по каждой фиче передаётся в on_result
+записью results.FlagResult с HTTP-статусом и длительностью запроса; тело ответа в ней сохраняется только
+для ошибок или при results.KEEP_RESPONSES = True, а текст сообщения формируется при выводе
+(FlagResult.format()).
+
+Если в ENV_CONFIG окружения объявлен пакетный endpoint ("batch_delete" и/или "batch_update"),
+удаление и обновление активности отправляются пачками по BATCH_SIZE (переопределяется ключом
+"batch_size"), а результат по-прежнему сообщается по каждой фиче. Контракт пакетных endpoint-ов:
+  - batch_delete: POST {"ids": [...]};
+  - batch_update: PUT [{"id": ..., "enabled": bool}, ...];
+  - ответ 2xx, необязательный список неуспешных элементов {"failed": [{"id": ..., "error": ...}]}.
+Если endpoint отвечает 404/405/501, он считается неподдерживаемым, и до перезапуска приложения
+для окружения используются одиночные запросы; при других ошибках одиночными запросами
+повторяется только неудавшаяся пачка.
+
+Удаление и обновление активности с preflight=True сначала загружают текущее состояние окружения
+одним запросом каталога (catalogue.sync_catalogue(), с проверкой ETag снимка) и не отправляют запросы,
+которые ничего не изменят: фичи, которых нет в окружении (для удаления – успешный результат,
+для обновления – ошибка), и фичи, уже имеющие нужное значение enabled. Такие фичи сообщаются в on_result
+со skipped=True без elapsed. Если каталог загрузить не удалось, отправляются все запросы.
+
+Операции принимают необязательный control (client.OperationControl): на паузе новые запросы
+не отправляются, а после остановки оставшиеся фичи сообщаются в on_result с cancelled=True.
+Необязательный concurrency задаёт лимит параллельных запросов окружения только для этой операции
+(см. client.run_timed()), не меняя ENV_CONFIG.
+
+Содержимое:
+  - BATCH_SIZE: размер пачки по умолчанию.
+  - fetch_token(): получает токен и сообщает о результате.
+  - create_features(): создание фича‑флагов (POST‑запросы).
+  - delete_features(): удаление нескольких фича‑флагов (DELETE‑запросы).
+  - update_activity(): обновление активности фича‑флагов (PUT‑запросы).
+  - preflight(): отбирает элементы, запросы для которых изменят состояние окружения.
+  - OPERATIONS: соответствие имени операции ("create", "delete", "update") и функции.
+  - run_job(): получает токен и выполняет операцию для одного окружения.
+  - ResultSummary: итог операции по результатам on_result (применено, с ошибкой, не отправлено).
+"""
+
+import threading
+
+import requests
+
+from config import ENV_CONFIG
+from client import get_token, send_request, run_timed, OperationCancelled, RESPONSE_JSON, RESPONSE_STATUS
+from catalogue import sync_catalogue
+from loaders import parse_bool
+import results
+from results import FlagResult, BODY_LIMIT
+
+BATCH_SIZE = 100
+
+# Пары (envKC, op), для которых пакетный endpoint оказался неподдерживаемым.
+_unsupported_batches = set()
+
+
+def _report(on_result, envKC, op, feature_id, status=None, resp=None, error=None, elapsed=None, target=None,
+            skipped=False, note=None):
+    if on_result is None:
+        return
+    result = FlagResult(envKC, op, feature_id, error is None, status, elapsed, target=target, skipped=skipped,
+                        note=note)
+    if error is None:
+        if results.KEEP_RESPONSES:
+            result.body = resp
+    else:
+        result.error = str(error)
+        if isinstance(error, Exception):
+            result.error_class = type(error).__name__
+            result.cancelled = isinstance(error, OperationCancelled)
+            response = getattr(error, "response", None)
+            if response is not None:
+                result.status = response.status_code
+                result.body = response.text[:BODY_LIMIT]
+    on_result(result)
+
+
+def _response_mode():
+    """
+    Режим обработки ответов на одиночные запросы: тела успешных ответов нужны только для выгрузки
+    (results.KEEP_RESPONSES), иначе они не читаются в память и не разбираются.
+    """
+    return RESPONSE_JSON if results.KEEP_RESPONSES else RESPONSE_STATUS
+
+
+def _batch_url(envKC, op):
+    if (envKC, op) in _unsupported_batches:
+        return None
+    return ENV_CONFIG[envKC].get(f"batch_{op}")
+
+
+def _send_batch(envKC, op, chunk, headers, control=None):
+    """
+    Отправляет одну пачку на пакетный endpoint.
+    :return: (HTTP-статус, словарь {feature_id: сообщение об ошибке} для неуспешных элементов пачки)
+    """
+    url = ENV_CONFIG[envKC][f"batch_{op}"]
+    if op == "delete":
+        status, resp = send_request(envKC, "POST", url, headers=headers, json_data={"ids": list(chunk)},
+                                    control=control, with_status=True)
+    else:
+        payload = [{"id": feature_id, "enabled": enabled == "true"} for feature_id, enabled in chunk]
+        status, resp = send_request(envKC, "PUT", url, headers=headers, json_data=payload, control=control,
+                                    with_status=True)
+    failed = resp.get("failed", []) if isinstance(resp, dict) else []
+    return status, {item.get("id"): item.get("error", "ошибка в пакете") for item in failed}
+
+
+def _execute(envKC, op, items, send_one, report, headers, emit, control=None, concurrency=None):
+    """
+    Выполняет операцию для всех items: через пакетный endpoint, если он объявлен, иначе
+    (и для неудавшихся пачек) – одиночными запросами send_one, возвращающими (HTTP-статус, ответ).
+    report(item, status, resp, error, elapsed) вызывается для каждого элемента.
+    """
+    remaining = items
+    if _batch_url(envKC, op) and items:
+        size = max(1, ENV_CONFIG[envKC].get("batch_size", BATCH_SIZE))
+        chunks = [tuple(items[i:i + size]) for i in range(0, len(items), size)]
+        remaining = []
+
+        def send_chunk(chunk):
+            return _send_batch(envKC, op, chunk, headers, control)
+
+        for chunk, sent, error, elapsed in run_timed(envKC, chunks, send_chunk, control, concurrency):
+            if isinstance(error, OperationCancelled):
+                for item in chunk:
+                    report(item, None, None, error, None)
+                continue
+            if error is not None:
+                status = getattr(getattr(error, "response", None), "status_code", None)
+                if isinstance(error, requests.HTTPError) and status in (404, 405, 501):
+                    if (envKC, op) not in _unsupported_batches:
+                        _unsupported_batches.add((envKC, op))
+                        emit(f"[{envKC}] Пакетный endpoint не поддерживается ({status}), "
+                             f"выполняются одиночные запросы")
+                remaining.extend(chunk)
+                continue
+            status, failed = sent
+            for item in chunk:
+                feature_id = item if op == "delete" else item[0]
+                report(item, status, None, failed.get(feature_id), elapsed)
+    for item, sent, error, elapsed in run_timed(envKC, remaining, send_one, control, concurrency):
+        status, resp = sent if error is None else (None, None)
+        report(item, status, resp, error, elapsed)
+
+
+def preflight(envKC, token, op, items, emit, on_result=None):
+    """
+    Загружает текущее состояние окружения и отбирает из items (ID для "delete", (ID, enabled) для "update")
+    элементы, запросы для которых что-то изменят. Об остальных сообщает в on_result со skipped=True.
+    :return: список элементов для отправки (все items, если каталог загрузить не удалось)
+    """
+    try:
+        flags, _ = sync_catalogue(envKC, token)
+    except Exception as e:
+        emit(f"[{envKC}] Не удалось проверить текущее состояние, отправляются все запросы: {str(e)}")
+        return items
+    current = {flag.get("id"): flag for flag in flags}
+    to_send = []
+    unchanged = missing = 0
+    for item in items:
+        feature_id, target = (item, None) if op == "delete" else item
+        flag = current.get(feature_id)
+        if flag is None:
+            missing += 1
+            if op == "delete":
+                _report(on_result, envKC, op, feature_id, skipped=True, note="фичи нет в окружении")
+            else:
+                _report(on_result, envKC, op, feature_id, error="фичи нет в окружении", target=target,
+                        skipped=True)
+        elif op == "update" and parse_bool(flag.get("enabled", False)) == (target == "true"):
+            unchanged += 1
+            _report(on_result, envKC, op, feature_id, target=target, skipped=True, note="без изменений")
+        else:
+            to_send.append(item)
+    emit(f"[{envKC}] Предварительная проверка: к отправке {len(to_send)}, без изменений {unchanged}, "
+         f"нет в окружении {missing}")
+    return to_send
+
+
+def fetch_token(envKC, username, password, emit):
+    """
+    Получает токен и сообщает о результате через emit.
+    :return: токен (str) или None, если произошла ошибка.
+    """
+    try:
+        token = get_token(envKC, username, password)
+        emit(f"[{envKC}] Получен токен: {token[:30]}...")
+        return token
+    except Exception as e:
+        emit(f"[{envKC}] Ошибка при получении токена: {str(e)}")
+        return None
+
+
+def create_features(envKC, token, feature_payloads, emit, on_result=None, control=None, concurrency=None):
+    """Создаёт фича‑флаги из списка feature_payloads (POST‑запросы выполняются параллельно)."""
+    feature_url = ENV_CONFIG[envKC]["feature"]
+    headers = {
+        "accept": "*/*",
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {token}"
+    }
+
+    response_mode = _response_mode()
+
+    def create(feature_payload):
+        return send_request(envKC, "POST", feature_url, headers=headers, json_data=feature_payload,
+                            control=control, with_status=True, response_mode=response_mode)
+
+    for feature_payload, sent, error, elapsed in run_timed(envKC, feature_payloads, create, control, concurrency):
+        status, resp = sent if error is None else (None, None)
+        _report(on_result, envKC, "create", feature_payload.get("id"), status, resp, error, elapsed)
+
+
+def delete_features(envKC, token, feature_ids, emit, on_result=None, control=None, preflight_check=False,
+                    concurrency=None):
+    """
+    Удаляет фича‑флаги из feature_ids: пачками через batch_delete, если он объявлен,
+    иначе параллельными DELETE‑запросами.
+    :param preflight_check: не отправлять запросы для фич, которых нет в окружении (см. preflight())
+    """
+    base_url = ENV_CONFIG[envKC]["feature"]
+    headers = {"accept": "*/*", "Authorization": f"Bearer {token}"}
+    response_mode = _response_mode()
+
+    def delete(feature_id):
+        return send_request(envKC, "DELETE", f"{base_url}/{feature_id}", headers=headers, control=control,
+                            with_status=True, response_mode=response_mode)
+
+    def report(feature_id, status, resp, error, elapsed):
+        _report(on_result, envKC, "delete", feature_id, status, resp, error, elapsed)
+
+    feature_ids = list(feature_ids)
+    if preflight_check:
+        feature_ids = preflight(envKC, token, "delete", feature_ids, emit, on_result)
+    _execute(envKC, "delete", feature_ids, delete, report, headers, emit, control, concurrency)
+
+
+def update_activity(envKC, token, update_list, emit, on_result=None, control=None, preflight_check=False,
+                    concurrency=None):
+    """
+    Обновляет активность фича‑флагов. update_list – список кортежей (feature_id, enabled);
+    Пачками через batch_update, если он объявлен, иначе параллельными
+    PUT‑запросами вида {base_url}/{feature_id}/enabled/{enabled}.
+    :param preflight_check: не отправлять запросы для фич, которых нет в окружении или у которых
+                            enabled уже имеет нужное значение (см. preflight())
+    """
+    base_url = ENV_CONFIG[envKC]["feature"]
+    headers = {
+        "accept": "*/*",
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {token}"
+    }
+
+    response_mode = _response_mode()
+
+    def update(item):
+        feature_id, enabled = item
+        return send_request(envKC, "PUT", f"{base_url}/{feature_id}/enabled/{enabled}", headers=headers,
+                            control=control, with_status=True, response_mode=response_mode)
+
+    def report(item, status, resp, error, elapsed):
+        feature_id, enabled = item
+        _report(on_result, envKC, "update", feature_id, status, resp, error, elapsed, target=enabled)
+
+    update_list = list(update_list)
+    if preflight_check:
+        update_list = preflight(envKC, token, "update", update_list, emit, on_result)
+    _execute(envKC, "update", update_list, update, report, headers, emit, control, concurrency)
+
+
+OPERATIONS = {
+    "create": create_features,
+    "delete": delete_features,
+    "update": update_activity,
+}
+
+
+def run_job(envKC, op, data, username, password, emit, on_result=None, control=None, preflight_check=False,
+            concurrency=None):
+    """
+    Получает токен и выполняет операцию op для окружения envKC.
+
+    :param op: "create" (data – список feature_payload), "delete" (data – список ID)
+               или "update" (data – список кортежей (ID, enabled))
+    :param control: необязательный client.OperationControl для паузы и остановки
+    :param preflight_check: для "delete" и "update" – не отправлять запросы, которые ничего не изменят
+    :param concurrency: лимит параллельных запросов окружения для этой операции (None – из ENV_CONFIG)
+    :return: True, если токен получен и операция запущена.
+    """
+    token = fetch_token(envKC, username, password, emit)
+    if not token:
+        return False
+    if op == "create":
+        create_features(envKC, token, data, emit, on_result, control, concurrency)
+    else:
+        OPERATIONS[op](envKC, token, data, emit, on_result, control, preflight_check, concurrency)
+    return True
+
+
+class ResultSummary:
+    """
+    Итог операции: потокобезопасно считает результаты on_result (применено, с ошибкой,
+    не отправлено из-за остановки). record() подходит в качестве on_result.
+    """
+
+    def __init__(self, on_result=None):
+        self.on_result = on_result
+        self.ok = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+
+    def record(self, result):
+        with self._lock:
+            if result.skipped:
+                self.skipped += 1
+            if result.ok:
+                self.ok += 1
+            elif result.cancelled:
+                self.cancelled += 1
+            else:
+                self.failed += 1
+        if self.on_result is not None:
+            self.on_result(result)
+
+    def format(self, envKC):
+        text = (f"[{envKC}] Итог: применено {self.ok}, с ошибкой {self.failed}, "
+                f"не отправлено из-за остановки {self.cancelled}")
+        if self.skipped:
+            text += f" (без запроса по результатам проверки: {self.skipped})"
+        return text
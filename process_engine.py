@@ -0,0 +1,166 @@
+"""
+Модуль process_engine содержит выполнение заданий окружений в отдельных процессах.
+Модуль не зависит от PyQt5.
+
+Задание каждого окружения (токен, пул соединений, пачки запросов – operations.run_job()) выполняется
+в своём процессе, поэтому JSON‑кодирование и разбор ответов не конкурируют за GIL с GUI и друг с другом.
+Процессы запускаются способом spawn (одинаково в Windows, Linux и в собранном PyInstaller приложении)
+и получают настройки своего окружения из ENV_CONFIG родительского процесса. Сообщения emit и результаты
+по фичам (кортежи results.FlagResult.astuple()) передаются в общую очередь пачками – по SEND_BATCH
+записей или раз в SEND_INTERVAL секунд, – а в родительском процессе передаются в emit и on_result
+в том же порядке. Остановка и пауза действуют через общий client.OperationControl.shared().
+
+Метрики запросов (metrics) собираются в дочерних процессах и на вкладку «Диагностика» не попадают.
+
+Содержимое:
+  - SEND_BATCH, SEND_INTERVAL: размер пачки и интервал отправки результатов в очередь.
+  - ProcessEngine: запускает процессы окружений и передаёт их сообщения и результаты (start(), wait(), run()).
+"""
+
+import multiprocessing
+import queue
+import signal
+import threading
+import time
+
+import client
+import results
+from config import ENV_CONFIG
+from client import OperationControl
+from operations import run_job
+from results import FlagResult
+
+SEND_BATCH = 500
+SEND_INTERVAL = 0.1
+
+
+class _BatchSender:
+    """Собирает сообщения (str) и результаты (кортежи) дочернего процесса в пачки для очереди."""
+
+    def __init__(self, out):
+        self.out = out
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        threading.Thread(target=self._flush_periodically, name="process-engine-sender", daemon=True).start()
+
+    def _put(self, entry):
+        with self._lock:
+            self._buffer.append(entry)
+            if len(self._buffer) < SEND_BATCH:
+                return
+            batch, self._buffer = self._buffer, []
+        self.out.put(("batch", batch))
+
+    def message(self, text):
+        self._put(text)
+
+    def result(self, result):
+        self._put(result.astuple())
+
+    def flush(self):
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if batch:
+            self.out.put(("batch", batch))
+
+    def _flush_periodically(self):
+        while not self._stopped.wait(SEND_INTERVAL):
+            self.flush()
+
+    def close(self):
+        self._stopped.set()
+        self.flush()
+
+
+def _run_env(envKC, env_config, op, data, username, password, preflight_check, keep_responses, out, control):
+    """Точка входа дочернего процесса: выполняет задание окружения envKC."""
+    # Ctrl+C в консоли обрабатывает родительский процесс (через control.cancel()).
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    ENV_CONFIG[envKC] = env_config
+    results.KEEP_RESPONSES = keep_responses
+    sender = _BatchSender(out)
+    started = False
+    try:
+        started = run_job(envKC, op, data, username, password, sender.message, sender.result, control,
+                          preflight_check)
+    except Exception as e:
+        sender.message(f"[{envKC}] Ошибка процесса окружения: {str(e)}")
+    finally:
+        sender.close()
+        client.close_sessions()
+        out.put(("done", envKC, started))
+
+
+class ProcessEngine:
+    """
+    Выполняет операцию op для окружений jobs ({envKC: данные операции}) – по процессу на окружение.
+    emit и on_result вызываются в потоке, вызвавшем wait(). control.cancel()/pause()/resume()
+    можно вызывать из любого потока.
+    """
+
+    def __init__(self, op, jobs, username, password, emit, on_result, preflight_check=False):
+        self.op = op
+        self.jobs = jobs
+        self.username = username
+        self.password = password
+        self.emit = emit
+        self.on_result = on_result
+        self.preflight_check = preflight_check
+        self._context = multiprocessing.get_context("spawn")
+        self.control = OperationControl.shared(self._context)
+        self._queue = self._context.Queue()
+        self._processes = {}
+        self.started = {}
+
+    def start(self):
+        for envKC, data in self.jobs.items():
+            process = self._context.Process(
+                target=_run_env, name=f"ftm-{envKC}", daemon=True,
+                args=(envKC, ENV_CONFIG[envKC], self.op, data, self.username, self.password, self.preflight_check,
+                      results.KEEP_RESPONSES, self._queue, self.control))
+            process.start()
+            self._processes[envKC] = process
+
+    def _dispatch(self, message):
+        kind = message[0]
+        if kind == "batch":
+            for entry in message[1]:
+                if isinstance(entry, str):
+                    self.emit(entry)
+                else:
+                    self.on_result(FlagResult.fromtuple(entry))
+        elif kind == "done":
+            self.started[message[1]] = message[2]
+
+    def wait(self):
+        """
+        Передаёт сообщения и результаты процессов, пока все они не завершатся.
+        :return: словарь {envKC: True, если токен получен и операция запущена}
+        """
+        while len(self.started) < len(self._processes):
+            try:
+                self._dispatch(self._queue.get(timeout=0.5))
+            except queue.Empty:
+                for envKC, process in self._processes.items():
+                    if envKC not in self.started and not process.is_alive():
+                        # Процесс завершился аварийно, не успев сообщить о завершении; дочитываем очередь.
+                        time.sleep(SEND_INTERVAL)
+                        self._drain()
+                        if envKC not in self.started:
+                            self.emit(f"[{envKC}] Процесс окружения завершился с кодом {process.exitcode}")
+                            self.started[envKC] = False
+        for process in self._processes.values():
+            process.join()
+        return dict(self.started)
+
+    def _drain(self):
+        while True:
+            try:
+                self._dispatch(self._queue.get_nowait())
+            except queue.Empty:
+                return
+
+    def run(self):
+        self.start()
+        return self.wait()
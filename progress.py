@@ -0,0 +1,120 @@
+"""
+Модуль progress содержит модель хода выполнения массовой операции в одном окружении.
+Модуль не зависит от PyQt5.
+
+ProgressTracker получает результаты по каждой фиче (results.FlagResult из on_result модуля operations) и считает
+выполненные, с ошибкой и неотправленные фичи, скорость выполнения за последние RATE_WINDOW секунд,
+медиану и 95‑й перцентиль длительности запросов и оставшееся время. Снимок состояния передаётся
+в on_progress не чаще раза в PROGRESS_INTERVAL секунд и отдаётся методом snapshot():
+{"env", "total", "done", "ok", "failed", "cancelled", "rate", "p50", "p95", "eta", "elapsed", "finished"}.
+
+Содержимое:
+  - PROGRESS_INTERVAL, RATE_WINDOW, LATENCY_SAMPLES: параметры расчёта.
+  - percentile(): перцентиль отсортированного списка.
+  - ProgressTracker: ход выполнения операции в окружении.
+"""
+
+import time
+from collections import deque
+
+from operations import ResultSummary
+
+PROGRESS_INTERVAL = 0.2
+RATE_WINDOW = 10.0
+LATENCY_SAMPLES = 5000
+
+
+def percentile(values, fraction):
+    """Возвращает перцентиль fraction (0..1) отсортированного списка values или None для пустого списка."""
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+class ProgressTracker(ResultSummary):
+    """
+    Ход выполнения операции в окружении envKC из total фич.
+    record() потокобезопасен и подходит в качестве on_result; результаты передаются дальше в on_result.
+    """
+
+    def __init__(self, envKC, total, on_result=None, on_progress=None, interval=PROGRESS_INTERVAL):
+        super().__init__(on_result)
+        self.envKC = envKC
+        self.total = total
+        self.on_progress = on_progress
+        self.interval = interval
+        self.started_at = time.monotonic()
+        self.finished_at = None
+        self._completions = deque()
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._last_progress = 0.0
+
+    def record(self, result):
+        now = time.monotonic()
+        with self._lock:
+            if not result.cancelled:
+                self._completions.append(now)
+            self._trim(now)
+            if result.elapsed is not None:
+                self._latencies.append(result.elapsed)
+            notify = self.on_progress is not None and now - self._last_progress >= self.interval
+            if notify:
+                self._last_progress = now
+        super().record(result)
+        if notify:
+            self.on_progress(self.snapshot())
+
+    def start(self):
+        """Отмечает начало отправки запросов (например, после получения токена) и передаёт первый снимок."""
+        self.started_at = time.monotonic()
+        if self.on_progress is not None:
+            self.on_progress(self.snapshot())
+
+    def latencies(self):
+        """Возвращает отсортированные длительности последних LATENCY_SAMPLES запросов (секунды)."""
+        with self._lock:
+            return sorted(self._latencies)
+
+    def _trim(self, now):
+        while self._completions and now - self._completions[0] > RATE_WINDOW:
+            self._completions.popleft()
+
+    def finish(self):
+        """Отмечает завершение операции и передаёт итоговый снимок в on_progress."""
+        self.finished_at = time.monotonic()
+        if self.on_progress is not None:
+            self.on_progress(self.snapshot())
+
+    @property
+    def finished(self):
+        return self.finished_at is not None
+
+    def snapshot(self):
+        now = self.finished_at or time.monotonic()
+        with self._lock:
+            self._trim(now)
+            done = self.ok + self.failed + self.cancelled
+            if self.finished:
+                # Итоговая скорость – по всему запуску, а не по последнему окну.
+                window = now - self.started_at
+                rate = done / window if window > 0 else 0.0
+            else:
+                window = min(RATE_WINDOW, now - self.started_at)
+                rate = len(self._completions) / window if window > 0 else 0.0
+            latencies = sorted(self._latencies)
+            snapshot = {
+                "env": self.envKC,
+                "total": self.total,
+                "done": done,
+                "ok": self.ok,
+                "failed": self.failed,
+                "cancelled": self.cancelled,
+                "rate": rate,
+                "p50": percentile(latencies, 0.5),
+                "p95": percentile(latencies, 0.95),
+                "elapsed": now - self.started_at,
+                "finished": self.finished
+            }
+        remaining = max(0, self.total - done)
+        snapshot["eta"] = 0.0 if not remaining or self.finished else (remaining / rate if rate else None)
+        return snapshot
@@ -0,0 +1,120 @@
+"""
+Модуль results содержит компактную запись результата операции над одной фичей.
+Модуль не зависит от PyQt5 и от остальных модулей проекта.
+
+FlagResult создаётся на каждую фичу и передаётся в on_result функций модуля operations и асинхронного
+движка, а worker-ы отправляют его в GUI через record_signal. Запись хранит только поля, нужные для подсчёта,
+фильтрации и выгрузки: среду, операцию, ID, HTTP-статус, длительность запроса и класс ошибки. Тело ответа
+хранится только для ошибок (не длиннее BODY_LIMIT символов) или если его запросили (KEEP_RESPONSES = True).
+Текст сообщения для журнала формируется только при выводе – методом format().
+
+Содержимое:
+  - BODY_LIMIT: максимальная длина сохраняемого тела ответа с ошибкой.
+  - KEEP_RESPONSES: сохранять тела успешных ответов.
+  - FlagResult: результат по одной фиче (format(), to_dict(), astuple()/fromtuple() для передачи между процессами).
+"""
+
+BODY_LIMIT = 2000
+KEEP_RESPONSES = False
+
+_OK_TEXT = {
+    "create": "Фича '{id}' создана успешно",
+    "delete": "Фича с id '{id}' успешно удалена",
+    "update": "Обновление активности фичи '{id}' на '{target}' успешно"
+}
+_ERROR_TEXT = {
+    "create": "Ошибка при создании фичи '{id}'",
+    "delete": "Ошибка при удалении фичи '{id}'",
+    "update": "Ошибка при обновлении фичи '{id}'"
+}
+
+
+class FlagResult:
+    """
+    Результат операции op над фичей feature_id в среде envKC.
+
+    :param status: HTTP-статус ответа (None – ответ не получен или фича не отправлялась)
+    :param elapsed: длительность запроса в секундах (для фичи из пачки – длительность пакетного запроса)
+    :param error: текст ошибки (None – успешно)
+    :param error_class: имя класса исключения
+    :param body: тело ответа (для ошибок или по запросу)
+    :param target: новое значение enabled для "update"
+    :param note: пояснение для фич, не отправленных по результатам предварительной проверки
+    """
+
+    __slots__ = ("env", "op", "id", "ok", "status", "elapsed", "error", "error_class", "body", "target",
+                 "cancelled", "skipped", "note")
+
+    def __init__(self, envKC, op, feature_id, ok=True, status=None, elapsed=None, error=None, error_class=None,
+                 body=None, target=None, cancelled=False, skipped=False, note=None):
+        self.env = envKC
+        self.op = op
+        self.id = feature_id
+        self.ok = ok
+        self.status = status
+        self.elapsed = elapsed
+        self.error = error
+        self.error_class = error_class
+        self.body = body
+        self.target = target
+        self.cancelled = cancelled
+        self.skipped = skipped
+        self.note = note
+
+    def format(self):
+        """Возвращает сообщение для журнала результатов."""
+        if self.cancelled:
+            return f"[{self.env}] Фича '{self.id}' не отправлена: операция остановлена"
+        template = _OK_TEXT if self.ok else _ERROR_TEXT
+        text = f"[{self.env}] " + template.get(self.op, "{id}").format(id=self.id, target=self.target)
+        if self.skipped:
+            return f"{text} без запроса: {self.note}" if self.ok else f"{text}: {self.error}"
+        details = []
+        if self.status is not None:
+            details.append(f"статус {self.status}")
+        if self.elapsed is not None:
+            details.append(f"{self.elapsed * 1000:.0f} мс")
+        if details:
+            text += f" ({', '.join(details)})"
+        if not self.ok:
+            text += f": {self.error}"
+        if self.body not in (None, ""):
+            text += f". Ответ: {self.body}"
+        return text
+
+    __str__ = format
+
+    def __repr__(self):
+        return f"FlagResult({self.env!r}, {self.op!r}, {self.id!r}, ok={self.ok}, status={self.status})"
+
+    def astuple(self):
+        """Возвращает значения полей в порядке __slots__ (компактная форма для передачи между процессами)."""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    @classmethod
+    def fromtuple(cls, values):
+        """Восстанавливает запись из astuple()."""
+        result = cls.__new__(cls)
+        for name, value in zip(cls.__slots__, values):
+            setattr(result, name, value)
+        return result
+
+    def to_dict(self):
+        """
+        Возвращает словарь для выгрузки в JSON: {"env", "op", "id", "ok", "status", "elapsed"} и, если заданы,
+        "error", "error_class", "response", "cancelled", "skipped", "note".
+        """
+        result = {"env": self.env, "op": self.op, "id": self.id, "ok": self.ok, "status": self.status,
+                  "elapsed": None if self.elapsed is None else round(self.elapsed, 4)}
+        if self.error is not None:
+            result["error"] = self.error
+            result["error_class"] = self.error_class
+        if self.body is not None:
+            result["response"] = self.body
+        if self.cancelled:
+            result["cancelled"] = True
+        if self.skipped:
+            result["skipped"] = True
+        if self.note is not None:
+            result["note"] = self.note
+        return result
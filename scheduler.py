@@ -0,0 +1,206 @@
+"""
+Модуль scheduler содержит поэтапный запуск операции по окружениям (dev → test → preprod → stage → prod).
+Модуль не зависит от PyQt5.
+
+Окружения выполняются по очереди в порядке STAGE_ORDER: этап начинается не раньше своего времени start_at
+и не раньше чем через gap секунд после окончания предыдущего этапа. Для этапа можно задать свой лимит
+параллельных запросов – он передаётся в operations.run_job() и действует только на запросы этапа
+(ENV_CONFIG и другие запуски в том же окружении его не видят).
+ErrorRateGuard следит за долей ошибок этапа: если после min_sample результатов она превышает max_error_rate
+(или превышает её по итогам этапа), запуск останавливается через control.cancel() – оставшиеся фичи этапа
+и следующие этапы не выполняются и остаются в журнале запуска для возобновления.
+
+Содержимое:
+  - STAGE_ORDER, DEFAULT_GAP, MAX_ERROR_RATE, MIN_SAMPLE: параметры по умолчанию.
+  - Stage: этап – окружение, время начала и параллелизм.
+  - parse_start_time(): разбирает время начала ("HH:MM" или ISO 8601).
+  - build_stages(): этапы для выбранных окружений в порядке STAGE_ORDER.
+  - ErrorRateGuard: доля ошибок этапа и остановка запуска при превышении порога.
+  - run_rollout(): выполняет этапы по очереди.
+"""
+
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from client import OperationControl, OperationCancelled
+from operations import run_job
+
+STAGE_ORDER = ("dev", "test", "preprod", "stage", "prod")
+DEFAULT_GAP = 10 * 60
+MAX_ERROR_RATE = 0.05
+MIN_SAMPLE = 20
+
+
+class Stage(namedtuple("Stage", "env start_at concurrency", defaults=(None, None))):
+    """
+    Этап поэтапного запуска.
+    :param env: ключ окружения
+    :param start_at: datetime, раньше которого этап не начинается (None – сразу после паузы между этапами)
+    :param concurrency: число параллельных запросов окружения на время этапа (None – как в ENV_CONFIG)
+    """
+
+    __slots__ = ()
+
+
+def parse_start_time(text, now=None):
+    """
+    Разбирает время начала: "HH:MM" – ближайшее такое время (сегодня или завтра) или дата и время ISO 8601.
+    :raises: ValueError, если время не распознано.
+    """
+    now = now or datetime.now()
+    text = text.strip()
+    try:
+        moment = datetime.strptime(text, "%H:%M")
+    except ValueError:
+        try:
+            return datetime.fromisoformat(text)
+        except ValueError:
+            raise ValueError(f"Не удалось разобрать время '{text}': ожидается HH:MM или YYYY-MM-DDTHH:MM")
+    start_at = now.replace(hour=moment.hour, minute=moment.minute, second=0, microsecond=0)
+    return start_at if start_at > now else start_at + timedelta(days=1)
+
+
+def build_stages(envs, start_at=None, concurrency=None, stage_start=None, stage_concurrency=None):
+    """
+    Возвращает этапы для окружений envs в порядке STAGE_ORDER (окружения не из STAGE_ORDER – в конце,
+    в порядке envs).
+    :param start_at: время начала первого этапа
+    :param concurrency: параллелизм всех этапов
+    :param stage_start: {envKC: datetime} – время начала отдельных этапов
+    :param stage_concurrency: {envKC: число} – параллелизм отдельных этапов
+    """
+    stage_start = stage_start or {}
+    stage_concurrency = stage_concurrency or {}
+    rank = {env: i for i, env in enumerate(STAGE_ORDER)}
+    ordered = sorted(dict.fromkeys(envs), key=lambda env: rank.get(env, len(STAGE_ORDER)))
+    stages = []
+    for i, env in enumerate(ordered):
+        stages.append(Stage(env, stage_start.get(env, start_at if i == 0 else None),
+                            stage_concurrency.get(env, concurrency)))
+    return stages
+
+
+class ErrorRateGuard:
+    """
+    Считает результаты этапа (фичи, не отправленные из-за остановки или по результатам проверки,
+    не учитываются) и вызывает control.cancel(), когда доля ошибок после min_sample результатов
+    превышает max_error_rate. record() потокобезопасен и подходит в качестве on_result;
+    результаты передаются дальше в on_result.
+    """
+
+    def __init__(self, control, max_error_rate=MAX_ERROR_RATE, min_sample=MIN_SAMPLE, on_result=None):
+        self.control = control
+        self.max_error_rate = max_error_rate
+        self.min_sample = min_sample
+        self.on_result = on_result
+        self.envKC = None
+        self.done = 0
+        self.failed = 0
+        self.reason = None
+        self._lock = threading.Lock()
+
+    def start(self, envKC):
+        """Начинает подсчёт для этапа окружения envKC."""
+        with self._lock:
+            self.envKC = envKC
+            self.done = 0
+            self.failed = 0
+
+    @property
+    def rate(self):
+        return self.failed / self.done if self.done else 0.0
+
+    def record(self, result):
+        if not result.cancelled and not result.skipped:
+            with self._lock:
+                self.done += 1
+                if not result.ok:
+                    self.failed += 1
+                exceeded = self.reason is None and self.done >= self.min_sample and self._exceeded()
+                if exceeded:
+                    self._trip()
+            if exceeded:
+                self.control.cancel()
+        if self.on_result is not None:
+            self.on_result(result)
+
+    def check(self):
+        """
+        Проверяет долю ошибок по итогам этапа (независимо от min_sample).
+        :return: True, если порог превышен и запуск остановлен.
+        """
+        with self._lock:
+            exceeded = self.reason is None and self.done > 0 and self._exceeded()
+            if exceeded:
+                self._trip()
+        if exceeded:
+            self.control.cancel()
+        return self.reason is not None
+
+    def _exceeded(self):
+        return self.max_error_rate is not None and self.failed / self.done > self.max_error_rate
+
+    def _trip(self):
+        self.reason = (f"доля ошибок в {self.envKC} {self.failed / self.done:.1%} ({self.failed} из {self.done}) "
+                       f"превышает порог {self.max_error_rate:.1%}")
+
+
+def _wait(seconds, control, emit, envKC, number, total):
+    if seconds <= 0:
+        return
+    start_at = datetime.now() + timedelta(seconds=seconds)
+    emit(f"[{envKC}] Этап {number}/{total} начнётся {start_at:%d.%m %H:%M:%S}")
+    control.sleep(seconds)
+
+
+def run_rollout(op, data, stages, username, password, emit, on_result=None, control=None, gap=DEFAULT_GAP,
+                max_error_rate=MAX_ERROR_RATE, min_sample=MIN_SAMPLE, preflight_check=False, on_stage=None):
+    """
+    Выполняет операцию op (см. operations.run_job()) по этапам stages по очереди.
+
+    :param data: данные операции – общие для всех этапов или словарь {envKC: данные}
+    :param gap: пауза между окончанием этапа и началом следующего, секунды
+    :param max_error_rate: доля ошибок, при превышении которой запуск останавливается (None – не проверять)
+    :param min_sample: сколько результатов этапа нужно, чтобы остановить его до окончания
+    :param on_stage: необязательная функция on_stage(envKC), вызываемая в начале отправки этапа
+    :return: (словарь {envKC: True, если токен получен и операция запущена} по начатым этапам,
+             причина остановки или None)
+    """
+    control = control or OperationControl()
+    guard = ErrorRateGuard(control, max_error_rate, min_sample, on_result)
+    started = {}
+    finished_at = None
+    for number, stage in enumerate(stages, start=1):
+        env_data = data[stage.env] if isinstance(data, dict) else data
+        delay = 0.0
+        if stage.start_at is not None:
+            delay = (stage.start_at - datetime.now()).total_seconds()
+        if finished_at is not None:
+            delay = max(delay, finished_at + gap - time.monotonic())
+        try:
+            _wait(delay, control, emit, stage.env, number, len(stages))
+        except OperationCancelled:
+            break
+        emit(f"[{stage.env}] Этап {number}/{len(stages)}: {op}, элементов {len(env_data)}")
+        guard.start(stage.env)
+        if on_stage is not None:
+            on_stage(stage.env)
+        started[stage.env] = run_job(stage.env, op, env_data, username, password, emit, guard.record,
+                                     control, preflight_check, stage.concurrency or None)
+        finished_at = time.monotonic()
+        if not started[stage.env]:
+            control.cancel()
+            guard.reason = f"не получен токен {stage.env}"
+        elif guard.done:
+            emit(f"[{stage.env}] Этап завершён: ошибок {guard.failed} из {guard.done} ({guard.rate:.1%})")
+        if guard.check() or control.cancelled:
+            break
+
+    reason = guard.reason or ("остановлено пользователем" if control.cancelled else None)
+    not_run = [stage.env for stage in stages if stage.env not in started]
+    if reason is not None:
+        emit(f"Поэтапный запуск остановлен: {reason}."
+             + (f" Не выполнены этапы: {', '.join(not_run)}" if not_run else ""))
+    return started, reason
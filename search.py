@@ -0,0 +1,207 @@
+"""
+Модуль search содержит индекс для быстрого поиска по каталогу фича‑флагов (см. catalogue).
+Модуль не зависит от PyQt5.
+
+ID фич имеют вид "Команда.Сервис.НазваниеФичи", поэтому индекс строится из:
+  - префиксного дерева по сегментам ID, разделённым точками ("delivery.orders.Ne" – всё под delivery.orders
+    с последним сегментом на "Ne");
+  - отсортированного словаря слов ID (части через '-'/'_' и слова CamelCase) для поиска по префиксам слов
+    в любом месте ID;
+  - инвертированных индексов по team, audience.target, enabled, isScheduledForRemoval;
+  - отсортированного списка plannedRemovalDate для запросов по диапазону дат.
+Каждый запрос – пересечение множеств позиций, начиная с наименьшего, без перебора всего каталога.
+Диапазон дат превращается в множество, только если он меньше остальных условий; иначе по дате
+проверяются позиции уже найденного пересечения.
+
+Содержимое:
+  - normalize_date(): приводит дату к виду YYYY-MM-DD.
+  - CatalogueIndex: индекс каталога и метод search().
+"""
+
+import heapq
+import re
+from bisect import bisect_left
+
+from loaders import parse_bool
+
+_WORD_RE = re.compile(r"[A-ZА-ЯЁ]?[a-zа-яё0-9]+|[A-ZА-ЯЁ]+(?![a-zа-яё])|\d+")
+_DATE_RE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})")
+_RU_DATE_RE = re.compile(r"^(\d{2})\.(\d{2})\.(\d{4})")
+
+
+def normalize_date(value):
+    """Приводит дату ("2025-03-01", "2025-03-01T00:00:00", "01.03.2025") к "YYYY-MM-DD" или None."""
+    if not value:
+        return None
+    value = str(value).strip()
+    match = _DATE_RE.match(value)
+    if match:
+        return "-".join(match.groups())
+    match = _RU_DATE_RE.match(value)
+    if match:
+        day, month, year = match.groups()
+        return f"{year}-{month}-{day}"
+    return None
+
+
+def _words(feature_id):
+    words = set()
+    for part in re.split(r"[.\-_\s]+", feature_id):
+        if not part:
+            continue
+        camel_words = _WORD_RE.findall(part)
+        # Целый сегмент индексируется отдельно, только если он не делится на слова CamelCase:
+        # иначе уникальные длинные сегменты раздувают словарь и замедляют поиск по префиксу.
+        if len(camel_words) <= 1:
+            words.add(part.lower())
+        words.update(word.lower() for word in camel_words)
+    return words
+
+
+class _TrieNode:
+    __slots__ = ("children", "positions")
+
+    def __init__(self):
+        self.children = {}
+        self.positions = set()
+
+
+class CatalogueIndex:
+    """
+    Индекс каталога фич. Строится один раз из списка фич (словарей ответа feature-service);
+    search() возвращает фичи, подходящие под все заданные условия.
+    """
+
+    def __init__(self, flags):
+        self.flags = list(flags)
+        self._trie = _TrieNode()
+        self._word_positions = {}
+        self._by_team = {}
+        self._by_target = {}
+        self._by_enabled = {True: set(), False: set()}
+        self._by_scheduled = {True: set(), False: set()}
+        removal_dates = []
+        for position, flag in enumerate(self.flags):
+            feature_id = str(flag.get("id", ""))
+            node = self._trie
+            node.positions.add(position)
+            for segment in feature_id.lower().split("."):
+                node = node.children.setdefault(segment, _TrieNode())
+                node.positions.add(position)
+            for word in _words(feature_id):
+                self._word_positions.setdefault(word, set()).add(position)
+            self._by_team.setdefault(flag.get("team") or "", set()).add(position)
+            audience = flag.get("audience") or {}
+            for target in audience.get("target") or []:
+                self._by_target.setdefault(str(target).lower(), set()).add(position)
+            self._by_enabled[parse_bool(flag.get("enabled"))].add(position)
+            self._by_scheduled[parse_bool(flag.get("isScheduledForRemoval"))].add(position)
+            removal_date = normalize_date(flag.get("plannedRemovalDate"))
+            if removal_date:
+                removal_dates.append((removal_date, position))
+        removal_dates.sort()
+        self._removal_date_of = dict((position, date) for date, position in removal_dates)
+        self._removal_dates = [date for date, _ in removal_dates]
+        self._removal_positions = [position for _, position in removal_dates]
+        self._sorted_words = sorted(self._word_positions)
+
+    def teams(self):
+        """Возвращает отсортированный список команд, встречающихся в каталоге."""
+        return sorted(team for team in self._by_team if team)
+
+    def _id_prefix(self, prefix):
+        """Позиции фич, ID которых начинается с prefix (по сегментам через точку)."""
+        segments = prefix.lower().split(".")
+        node = self._trie
+        for segment in segments[:-1]:
+            node = node.children.get(segment)
+            if node is None:
+                return set()
+        last = segments[-1]
+        if not last:
+            return node.positions
+        return set().union(*(child.positions for segment, child in node.children.items()
+                             if segment.startswith(last)))
+
+    def _word_prefix(self, prefix):
+        """Позиции фич, в ID которых есть слово, начинающееся с prefix."""
+        start = bisect_left(self._sorted_words, prefix)
+        end = bisect_left(self._sorted_words, prefix + "\uffff", start)
+        return set().union(*(self._word_positions[word] for word in self._sorted_words[start:end]))
+
+    def _text(self, text):
+        """
+        Запрос с точкой ищется как префикс ID по сегментам, иначе каждое слово запроса
+        должно быть префиксом какого-либо слова ID.
+        """
+        text = text.strip()
+        if "." in text:
+            return self._id_prefix(text)
+        result = None
+        for word in text.lower().split():
+            positions = self._word_prefix(word)
+            result = positions if result is None else result & positions
+            if not result:
+                return set()
+        return result
+
+    def _removal_bounds(self, removal_after=None, removal_before=None):
+        """Границы среза _removal_dates (start, end) для plannedRemovalDate в [removal_after, removal_before)."""
+        start = bisect_left(self._removal_dates, removal_after) if removal_after else 0
+        end = bisect_left(self._removal_dates, removal_before) if removal_before else len(self._removal_dates)
+        return start, end
+
+    def _in_removal_range(self, positions, removal_after=None, removal_before=None):
+        """Позиции из positions, plannedRemovalDate которых попадает в [removal_after, removal_before)."""
+        date_of = self._removal_date_of
+        return {position for position in positions
+                if position in date_of
+                and (not removal_after or date_of[position] >= removal_after)
+                and (not removal_before or date_of[position] < removal_before)}
+
+    def search(self, text=None, team=None, audience_target=None, enabled=None,
+               scheduled_for_removal=None, removal_before=None, removal_after=None, limit=None):
+        """
+        Возвращает фичи, удовлетворяющие всем заданным условиям (None – условие не задано).
+
+        :param text: префикс ID ("delivery.orders.") или слова ID ("orders new")
+        :param team: команда
+        :param audience_target: сервис из audience.target
+        :param enabled: True/False
+        :param scheduled_for_removal: True/False
+        :param removal_before: дата (plannedRemovalDate строго раньше); нераспознанная дата не учитывается
+        :param removal_after: дата (plannedRemovalDate не раньше); нераспознанная дата не учитывается
+        :param limit: максимальное количество результатов
+        """
+        candidates = []
+        if text and text.strip():
+            candidates.append(self._text(text))
+        if team:
+            candidates.append(self._by_team.get(team, set()))
+        if audience_target:
+            candidates.append(self._by_target.get(audience_target.strip().lower(), set()))
+        if enabled is not None:
+            candidates.append(self._by_enabled[parse_bool(enabled)])
+        if scheduled_for_removal is not None:
+            candidates.append(self._by_scheduled[parse_bool(scheduled_for_removal)])
+        removal_after, removal_before = normalize_date(removal_after), normalize_date(removal_before)
+        filter_removal = False
+        if removal_after or removal_before:
+            start, end = self._removal_bounds(removal_after, removal_before)
+            if not candidates or end - start < min(len(positions) for positions in candidates):
+                candidates.append(set(self._removal_positions[start:end]))
+            else:
+                filter_removal = True
+
+        if not candidates:
+            positions = range(len(self.flags) if limit is None else min(limit, len(self.flags)))
+            return [self.flags[position] for position in positions]
+        candidates.sort(key=len)
+        positions = candidates[0].intersection(*candidates[1:]) if len(candidates) > 1 else candidates[0]
+        if filter_removal:
+            positions = self._in_removal_range(positions, removal_after, removal_before)
+        if limit is not None and len(positions) > limit:
+            positions = heapq.nsmallest(limit, positions)
+        else:
+            positions = sorted(positions)
+        return [self.flags[position] for position in positions]
@@ -2,9 +2,14 @@
 Модуль utils содержит вспомогательные функции для проекта.
 Функция update_hosts() добавляет запись "193.232.108.20 kc-omni.x5.ru" в файл hosts
 (Windows и macOS), если она ещё не присутствует. Для изменения файла hosts требуется запуск с правами администратора.
+Класс StartupProfiler собирает разбивку времени запуска приложения по этапам (режим --profile-startup).
 """
 
+import os
 import platform
+import sys
+import tempfile
+import time
 
 
 def update_hosts():
@@ -27,3 +32,38 @@ def update_hosts():
         print("Запись добавлена в hosts.")
     except Exception as e:
         print(f"Ошибка при обновлении hosts: {e}")
+
+
+class StartupProfiler:
+    """
+    Замеряет время этапов запуска.
+    mark(name) фиксирует окончание этапа, report() печатает разбивку в stderr
+    (или в файл ftm_startup_profile.txt во временной папке, если консоли нет).
+    Если profiler выключен, mark() и report() ничего не делают.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.last = self.started
+        self.stages = []
+
+    def mark(self, name):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.stages.append((name, now - self.last))
+        self.last = now
+
+    def report(self):
+        if not self.enabled:
+            return
+        lines = [f"{name:<40} {duration * 1000:8.1f} ms" for name, duration in self.stages]
+        lines.append(f"{'Итого':<40} {(self.last - self.started) * 1000:8.1f} ms")
+        text = "Время запуска:\n" + "\n".join(lines)
+        if sys.stderr is not None:
+            print(text, file=sys.stderr)
+        else:
+            # В сборке --windowed консоли нет – сохраняем отчёт во временную папку.
+            with open(os.path.join(tempfile.gettempdir(), "ftm_startup_profile.txt"), "w", encoding="utf-8") as f:
+                f.write(text + "\n")
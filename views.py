@@ -1,17 +1,50 @@
 """
 Модуль views содержит классы для создания пользовательского интерфейса:
   - EnvironmentSelector: универсальный виджет выбора сред.
+  - ResultLog: буферизованный журнал результатов с фильтрами по среде и ошибкам и выгрузкой в JSONL.
+  - choose_unfinished_journal(): диалог выбора прерванного запуска для возобновления.
+  - RunControls: кнопки паузы и остановки worker‑ов запуска; warn_if_running().
+  - ProgressPanel: полосы прогресса по средам со скоростью, длительностью запросов и оставшимся временем.
+  - create_async_checkbox(): чекбокс включения асинхронного движка.
+  - create_preflight_checkbox(): чекбокс предварительной проверки текущего состояния сред.
+  - create_process_checkbox(): чекбокс выполнения сред в отдельных процессах.
+  - RolloutOptions: параметры поэтапного запуска по средам.
   - CreateTab: вкладка создания фича‑флагов.
+  - FeatureListModel: модель списка фич (ID и enabled) для QTableView.
+  - FeatureListEditor: виджет списка фич с вставкой из буфера и загрузкой из файла.
+  - summarize_ids(): сокращённое перечисление ID для диалогов подтверждения.
+  - BulkOperationTab: общая часть вкладок массовых операций (каталог, журнал запуска, возобновление).
   - DeleteTab: вкладка для удаления фича‑флагов с возможностью множественного удаления.
   - UpdateActivityTab: вкладка для изменения активности фича‑флагов с динамическим добавлением записей.
+  - CatalogueResultModel: модель результатов поиска по каталогу.
+  - CatalogueTab: вкладка поиска по каталогу фич с передачей результатов во вкладки удаления и обновления.
+  - DriftModel: модель таблицы расхождений между средами.
+  - DriftTab: вкладка сравнения сред с выгрузкой и выравниванием enabled.
+  - MetricsModel: модель таблицы длительности запросов по этапам.
+  - DiagnosticsTab: вкладка диагностики с метриками запросов и их выгрузкой.
   - MainWindow: главное окно, содержащее все вкладки.
 """
 
+import importlib.util
+import json
+import re
+from collections import deque
+
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QFormLayout, QLineEdit,
-                             QComboBox, QTextEdit, QPushButton, QMessageBox,
-                             QGroupBox, QHBoxLayout, QCheckBox, QTabWidget)
-from PyQt5.QtCore import Qt
-from workers import EnvWorker, DeleteMultipleWorker, ActivityUpdateWorker
+                             QComboBox, QPlainTextEdit, QPushButton, QMessageBox,
+                             QGroupBox, QHBoxLayout, QCheckBox, QTabWidget,
+                             QTableView, QHeaderView, QAbstractItemView, QLabel,
+                             QShortcut, QFileDialog, QApplication, QCompleter,
+                             QInputDialog, QProgressBar, QGridLayout, QSpinBox, QDoubleSpinBox,
+                             QDateTimeEdit)
+from PyQt5.QtGui import QKeySequence
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer, QStringListModel, QDateTime
+from loaders import read_records, parse_bool, apply_defaults, build_feature_payload
+from validation import TEAMS, validate_payloads, validate_update_items, format_errors
+
+# Модуль workers (и вместе с ним requests/urllib3) импортируется при первом запросе,
+# чтобы не замедлять показ главного окна. Наличие aiohttp проверяется без его импорта.
+ASYNC_ENGINE_AVAILABLE = importlib.util.find_spec("aiohttp") is not None
 
 
 class EnvironmentSelector(QWidget):
@@ -54,6 +87,367 @@ class EnvironmentSelector(QWidget):
         return [env for env, cb in self.env_checkboxes.items() if cb.isChecked()]
 
 
+class ResultLog(QWidget):
+    """
+    Буферизованный журнал результатов.
+    Сообщения worker-ов (строки result_signal и записи results.FlagResult из record_signal) складываются
+    в буфер и раз в FLUSH_INTERVAL_MS выводятся в QPlainTextEdit одной вставкой, поэтому поток результатов
+    не забивает event loop. Текст записи формируется только при выводе. В виджете хранится не более
+    MAX_BLOCK_COUNT строк; полный список сообщений (до STORED_LIMIT) хранится отдельно с привязкой
+    к среде и отрисовывается по запросу при смене фильтра. Записи по фичам можно выгрузить в JSONL.
+    """
+
+    FLUSH_INTERVAL_MS = 100
+    MAX_BLOCK_COUNT = 5000
+    STORED_LIMIT = 200000
+    SEPARATOR = "-" * 60
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._entries = deque(maxlen=self.STORED_LIMIT)
+        self._pending = []
+        self._failed = 0
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(self.FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self.flush)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Среда:"))
+        self.env_filter = QComboBox()
+        self.env_filter.addItems(["Все", "dev", "test", "preprod", "stage", "prod"])
+        self.env_filter.currentIndexChanged.connect(self.render)
+        filter_layout.addWidget(self.env_filter)
+        self.errors_only = QCheckBox("Только ошибки")
+        self.errors_only.stateChanged.connect(self.render)
+        filter_layout.addWidget(self.errors_only)
+        filter_layout.addStretch()
+        self.count_label = QLabel()
+        filter_layout.addWidget(self.count_label)
+        self.export_button = QPushButton("Выгрузить результаты")
+        self.export_button.clicked.connect(self.export_records)
+        filter_layout.addWidget(self.export_button)
+        layout.addLayout(filter_layout)
+        self.text_area = QPlainTextEdit()
+        self.text_area.setReadOnly(True)
+        self.text_area.setMaximumBlockCount(self.MAX_BLOCK_COUNT)
+        layout.addWidget(self.text_area)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(layout)
+
+    @staticmethod
+    def _env_of(text):
+        if text.startswith("["):
+            end = text.find("]")
+            if end > 0:
+                return text[1:end]
+        return None
+
+    def _matches(self, env, entry):
+        selected = self.env_filter.currentText()
+        if self.errors_only.isChecked() and (isinstance(entry, str) or entry.ok):
+            return False
+        return selected == "Все" or env == selected
+
+    def _add(self, env, entry):
+        self._entries.append((env, entry))
+        if self._matches(env, entry):
+            self._pending.append(entry)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def append(self, text):
+        self._add(self._env_of(text), text)
+
+    def append_record(self, record):
+        """Добавляет результат по фиче (results.FlagResult)."""
+        if not record.ok:
+            self._failed += 1
+        self._add(record.env, record)
+
+    def flush(self):
+        if self._pending:
+            pending = self._pending[-self.MAX_BLOCK_COUNT:]
+            self._pending = []
+            self.text_area.appendPlainText(
+                ("\n" + self.SEPARATOR + "\n").join(map(str, pending)) + "\n" + self.SEPARATOR)
+        self.count_label.setText(f"Сообщений: {len(self._entries)}, ошибок: {self._failed}")
+
+    def render(self):
+        """Перерисовывает журнал из сохранённых сообщений с учётом фильтров."""
+        self._pending = []
+        self.text_area.clear()
+        for env, entry in self._entries:
+            if self._matches(env, entry):
+                self._pending.append(entry)
+        self.flush()
+
+    def clear(self):
+        self._entries.clear()
+        self._pending = []
+        self._failed = 0
+        self.text_area.clear()
+        self.count_label.setText("")
+
+    def entries(self, env=None):
+        """Возвращает сохранённые сообщения, при необходимости только для указанной среды."""
+        return [str(entry) for entry_env, entry in self._entries if env is None or entry_env == env]
+
+    def records(self, env=None):
+        """Возвращает сохранённые результаты по фичам (results.FlagResult)."""
+        return [entry for entry_env, entry in self._entries
+                if not isinstance(entry, str) and (env is None or entry_env == env)]
+
+    def export_records(self):
+        records = self.records()
+        if not records:
+            QMessageBox.information(self, "Выгрузка", "Нет результатов по фичам для выгрузки")
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Выгрузить результаты", "results.jsonl", "JSONL (*.jsonl)")
+        if not path:
+            return
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(record.to_dict(), ensure_ascii=False, default=str) + "\n"
+                             for record in records)
+        except OSError as e:
+            QMessageBox.warning(self, "Ошибка", f"Не удалось сохранить файл: {e}")
+
+
+def choose_unfinished_journal(parent, op):
+    """
+    Предлагает выбрать журнал прерванного запуска операции op.
+    :return: journal.Journal или None
+    """
+    from journal import list_unfinished
+    journals = list_unfinished(op)
+    if not journals:
+        QMessageBox.information(parent, "Возобновление", "Нет прерванных запусков")
+        return None
+    summaries = [journal.summary() for journal in journals]
+    choice, ok = QInputDialog.getItem(parent, "Возобновление", "Прерванный запуск:", summaries, 0, False)
+    if not ok:
+        return None
+    return journals[summaries.index(choice)]
+
+
+def create_async_checkbox():
+    """
+    Создаёт чекбокс выбора асинхронного движка.
+    Если aiohttp не установлен, чекбокс недоступен.
+    """
+    checkbox = QCheckBox("Асинхронный движок (все среды в одном потоке)")
+    if not ASYNC_ENGINE_AVAILABLE:
+        checkbox.setEnabled(False)
+        checkbox.setToolTip("Требуется пакет aiohttp")
+    return checkbox
+
+
+def create_preflight_checkbox(text):
+    """Создаёт чекбокс предварительной проверки: перед запуском загружается каталог каждой выбранной среды."""
+    checkbox = QCheckBox(text)
+    checkbox.setToolTip("Перед отправкой загружается каталог среды (один запрос с проверкой ETag), "
+                        "запросы, которые ничего не изменят, не отправляются. "
+                        "Несовместим с асинхронным движком.")
+    return checkbox
+
+
+def create_process_checkbox():
+    """Создаёт чекбокс выполнения каждой среды в отдельном процессе (см. process_engine)."""
+    checkbox = QCheckBox("Отдельный процесс для каждой среды (для очень больших запусков)")
+    checkbox.setToolTip("Запросы каждой среды отправляются из отдельного процесса, интерфейс не замедляется. "
+                        "Метрики запросов на вкладке «Диагностика» при этом не собираются.")
+    return checkbox
+
+
+class RolloutOptions(QGroupBox):
+    """
+    Параметры поэтапного запуска (см. scheduler): среды выполняются по очереди dev → test → preprod →
+    stage → prod с паузой между этапами, не раньше заданного времени и с остановкой при доле ошибок
+    выше порога. Группа включается флажком в заголовке; stages() и options() возвращают этапы
+    и параметры для RolloutWorker.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__("Поэтапный запуск: dev → test → preprod → stage → prod", parent)
+        self.setCheckable(True)
+        self.setChecked(False)
+        layout = QFormLayout()
+        self.gap_spin = QSpinBox()
+        self.gap_spin.setRange(0, 24 * 60)
+        self.gap_spin.setValue(10)
+        self.gap_spin.setSuffix(" мин")
+        layout.addRow("Пауза между этапами:", self.gap_spin)
+        start_layout = QHBoxLayout()
+        self.start_checkbox = QCheckBox("Начать не раньше")
+        self.start_edit = QDateTimeEdit(QDateTime.currentDateTime().addSecs(3600))
+        self.start_edit.setCalendarPopup(True)
+        self.start_edit.setDisplayFormat("dd.MM.yyyy HH:mm")
+        self.start_edit.setEnabled(False)
+        self.start_checkbox.toggled.connect(self.start_edit.setEnabled)
+        start_layout.addWidget(self.start_checkbox)
+        start_layout.addWidget(self.start_edit)
+        start_layout.addStretch()
+        layout.addRow(start_layout)
+        self.concurrency_spin = QSpinBox()
+        self.concurrency_spin.setRange(0, 64)
+        self.concurrency_spin.setSpecialValueText("как в настройках среды")
+        layout.addRow("Параллельных запросов на этапе:", self.concurrency_spin)
+        self.error_rate_spin = QDoubleSpinBox()
+        self.error_rate_spin.setRange(0, 100)
+        self.error_rate_spin.setDecimals(1)
+        self.error_rate_spin.setValue(5.0)
+        self.error_rate_spin.setSuffix(" %")
+        layout.addRow("Остановить при доле ошибок больше:", self.error_rate_spin)
+        self.setLayout(layout)
+
+    def stages(self, envs):
+        """Возвращает этапы (scheduler.Stage) для сред envs."""
+        from scheduler import build_stages
+        start_at = self.start_edit.dateTime().toPyDateTime() if self.start_checkbox.isChecked() else None
+        return build_stages(envs, start_at, self.concurrency_spin.value() or None)
+
+    def options(self):
+        """Возвращает параметры scheduler.run_rollout(): паузу между этапами и порог доли ошибок."""
+        return {"gap": self.gap_spin.value() * 60, "max_error_rate": self.error_rate_spin.value() / 100}
+
+    def describe(self, envs):
+        """Описание плана для диалога подтверждения."""
+        text = f"Поэтапно: {' → '.join(stage.env for stage in self.stages(envs))}, пауза {self.gap_spin.value()} мин"
+        if self.start_checkbox.isChecked():
+            text += f", начало не раньше {self.start_edit.dateTime().toString('dd.MM.yyyy HH:mm')}"
+        return text
+
+
+class RunControls(QWidget):
+    """
+    Кнопки «Пауза»/«Продолжить» и «Остановить» для worker‑ов текущего запуска вкладки.
+    Worker-ы передаются в attach() до их запуска; кнопки доступны, пока хотя бы один из них работает.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.workers = []
+        layout = QHBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.pause_button = QPushButton("Пауза")
+        self.pause_button.setCheckable(True)
+        self.pause_button.toggled.connect(self.toggle_pause)
+        layout.addWidget(self.pause_button)
+        self.stop_button = QPushButton("Остановить")
+        self.stop_button.clicked.connect(self.stop)
+        layout.addWidget(self.stop_button)
+        self.setLayout(layout)
+        self.set_active(False)
+
+    def set_active(self, active):
+        self.pause_button.blockSignals(True)
+        self.pause_button.setChecked(False)
+        self.pause_button.setText("Пауза")
+        self.pause_button.blockSignals(False)
+        self.pause_button.setEnabled(active)
+        self.stop_button.setText("Остановить")
+        self.stop_button.setEnabled(active)
+
+    def attach(self, workers):
+        self.workers = list(workers)
+        for worker in self.workers:
+            worker.finished.connect(self.on_worker_finished)
+        self.set_active(bool(self.workers))
+
+    def is_running(self):
+        return any(worker.isRunning() for worker in self.workers)
+
+    def toggle_pause(self, paused):
+        for worker in self.workers:
+            if paused:
+                worker.pause()
+            else:
+                worker.resume()
+        self.pause_button.setText("Продолжить" if paused else "Пауза")
+
+    def stop(self):
+        for worker in self.workers:
+            worker.cancel()
+        self.pause_button.setEnabled(False)
+        self.stop_button.setEnabled(False)
+        self.stop_button.setText("Остановка...")
+
+    def on_worker_finished(self):
+        if not self.is_running():
+            self.set_active(False)
+
+
+def format_duration(seconds):
+    """Форматирует длительность в секундах как Ч:ММ:СС или ММ:СС."""
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}:{minutes:02}:{seconds:02}" if hours else f"{minutes:02}:{seconds:02}"
+
+
+class ProgressPanel(QWidget):
+    """
+    Ход выполнения запуска по средам: полоса прогресса и строка со счётчиками, скоростью,
+    медианой и 95‑м перцентилем длительности запросов и оставшимся временем.
+    Принимает снимки progress.ProgressTracker через update_progress(); строки сред создаются по мере поступления.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = {}
+        self.grid = QGridLayout()
+        self.grid.setContentsMargins(0, 0, 0, 0)
+        self.grid.setColumnStretch(1, 1)
+        self.setLayout(self.grid)
+        self.hide()
+
+    def reset(self):
+        for label, bar, stats in self.rows.values():
+            for widget in (label, bar, stats):
+                self.grid.removeWidget(widget)
+                widget.deleteLater()
+        self.rows = {}
+        self.hide()
+
+    def update_progress(self, snapshot):
+        env = snapshot["env"]
+        if env not in self.rows:
+            row = len(self.rows)
+            label, bar, stats = QLabel(env), QProgressBar(), QLabel()
+            self.grid.addWidget(label, row, 0)
+            self.grid.addWidget(bar, row, 1)
+            self.grid.addWidget(stats, row, 2)
+            self.rows[env] = (label, bar, stats)
+            self.show()
+        _, bar, stats = self.rows[env]
+        bar.setMaximum(max(1, snapshot["total"]))
+        bar.setValue(snapshot["done"])
+        bar.setFormat(f"{snapshot['done']}/{snapshot['total']}")
+        parts = [f"ошибок {snapshot['failed']}"]
+        if snapshot["cancelled"]:
+            parts.append(f"не отправлено {snapshot['cancelled']}")
+        parts.append(f"{snapshot['rate']:.1f} запр/с")
+        if snapshot["p50"] is not None:
+            parts.append(f"p50 {snapshot['p50'] * 1000:.0f} мс, p95 {snapshot['p95'] * 1000:.0f} мс")
+        if snapshot["finished"]:
+            parts.append(f"готово за {format_duration(snapshot['elapsed'])}")
+        elif snapshot["eta"] is not None:
+            parts.append(f"осталось ~{format_duration(snapshot['eta'])}")
+        stats.setText(" · ".join(parts))
+
+
+def warn_if_running(parent, run_controls):
+    """Предупреждает, что предыдущий запуск ещё выполняется. :return: True, если запуск выполняется"""
+    if run_controls.is_running():
+        QMessageBox.warning(parent, "Input Error", "Дождитесь завершения текущего запуска или остановите его")
+        return True
+    return False
+
+
 class CreateTab(QWidget):
     """Вкладка создания фича‑флагов."""
 
@@ -92,11 +486,7 @@ class CreateTab(QWidget):
         form_layout.addRow("Enabled:", self.enabled_field)
 
         self.team_field = QComboBox()
-        self.team_field.addItems([
-            "autotest-team", "b2b-united", "delivery-team", "devops-team",
-            "pnb-team", "randi-team", "reporting-team", "rnd-team",
-            "storebox-team", "tms-team", "ux-team"
-        ])
+        self.team_field.addItems(TEAMS)
         form_layout.addRow("Team:", self.team_field)
 
         self.audience_type_field = QComboBox()
@@ -130,19 +520,31 @@ class CreateTab(QWidget):
         layout.addLayout(form_layout)
         self.env_selector = EnvironmentSelector()
         layout.addWidget(self.env_selector)
+        self.async_checkbox = create_async_checkbox()
+        layout.addWidget(self.async_checkbox)
+        self.rollout_options = RolloutOptions()
+        layout.addWidget(self.rollout_options)
         self.submit_button = QPushButton("Создать фича-флаг")
         self.submit_button.clicked.connect(self.submit_action)
         layout.addWidget(self.submit_button)
-        self.result_area = QTextEdit()
-        self.result_area.setReadOnly(True)
+        self.manifest_button = QPushButton("Создать из манифеста...")
+        self.manifest_button.setToolTip("Создать фичи из CSV/JSON/YAML; незаполненные поля берутся из формы")
+        self.manifest_button.clicked.connect(self.manifest_action)
+        layout.addWidget(self.manifest_button)
+        self.run_controls = RunControls()
+        layout.addWidget(self.run_controls)
+        self.progress_panel = ProgressPanel()
+        layout.addWidget(self.progress_panel)
+        self.result_area = ResultLog()
         layout.addWidget(self.result_area)
         self.setLayout(layout)
 
     def append_result(self, text):
         self.result_area.append(text)
-        self.result_area.append("-" * 60)
 
     def submit_action(self):
+        if warn_if_running(self, self.run_controls):
+            return
         self.result_area.clear()
         feature_id = self.id_field.text().strip()
         description = self.description_field.text().strip()
@@ -161,23 +563,10 @@ class CreateTab(QWidget):
         password = self.password_field.text().strip()
 
         missing_fields = []
-        if not feature_id:
-            missing_fields.append("ID")
-        if not description:
-            missing_fields.append("Description")
-        if not audience_target_str:
-            missing_fields.append("Audience Target")
-        if not taskId:
-            missing_fields.append("Task ID")
         if not username:
             missing_fields.append("Username")
         if not password:
             missing_fields.append("Password")
-        if isScheduledForRemoval:
-            if not plannedRemovalDate:
-                missing_fields.append("Planned Removal Date (Обязательное)")
-            if not removalFeatureTaskId:
-                missing_fields.append("Removal Feature Task ID (Обязательное)")
         if missing_fields:
             QMessageBox.warning(self, "Input Error",
                                 "Пожалуйста, заполните обязательные поля: " + ", ".join(missing_fields))
@@ -194,60 +583,537 @@ class CreateTab(QWidget):
             "taskId": taskId,
             "plannedRemovalDate": plannedRemovalDate
         }
+        errors = validate_payloads([feature_payload])
+        if errors:
+            QMessageBox.warning(self, "Input Error", "Проверьте поля:\n" +
+                                "\n".join(f"{error.field or 'ID'}: {error.message}" for error in errors))
+            return
 
         selected_envs = self.env_selector.get_selected_envs()
         if not selected_envs:
             QMessageBox.warning(self, "Input Error", "Выберите хотя бы одну среду для выполнения запроса")
             return
 
+        from workers import EnvWorker, AsyncEngineWorker, RolloutWorker
         self.workers = []
-        for env in selected_envs:
-            worker = EnvWorker(env, username, password, feature_payload)
+        if self.rollout_options.isChecked():
+            jobs = {env: [feature_payload] for env in selected_envs}
+            worker = RolloutWorker("create", jobs, self.rollout_options.stages(selected_envs), username, password,
+                                   self.rollout_options.options())
             worker.result_signal.connect(self.append_result)
+            worker.record_signal.connect(self.result_area.append_record)
             self.workers.append(worker)
+        elif self.async_checkbox.isChecked():
+            jobs = [(env, "create", feature_payload) for env in selected_envs]
+            worker = AsyncEngineWorker(jobs, username, password)
+            worker.result_signal.connect(self.append_result)
+            worker.record_signal.connect(self.result_area.append_record)
+            self.workers.append(worker)
+        else:
+            for env in selected_envs:
+                worker = EnvWorker(env, username, password, feature_payload)
+                worker.result_signal.connect(self.append_result)
+                worker.record_signal.connect(self.result_area.append_record)
+                self.workers.append(worker)
+        self.run_controls.attach(self.workers)
+        self.progress_panel.reset()
+        for worker in self.workers:
+            if hasattr(worker, "progress_signal"):
+                worker.progress_signal.connect(self.progress_panel.update_progress)
             worker.start()
 
+    def form_defaults(self):
+        """Значения полей формы (кроме ID) для подстановки в незаполненные поля манифеста."""
+        defaults = {
+            "description": self.description_field.text().strip(),
+            "enabled": self.enabled_field.currentText(),
+            "team": self.team_field.currentText(),
+            "audience_type": self.audience_type_field.currentText(),
+            "audience_target": self.audience_target_field.text().strip(),
+            "taskId": self.taskId_field.text().strip(),
+            "removalFeatureTaskId": self.removalFeatureTaskId_field.text().strip(),
+            "isScheduledForRemoval": self.isScheduledForRemoval_field.currentText(),
+            "plannedRemovalDate": self.plannedRemovalDate_field.text().strip()
+        }
+        # Заготовка "OMNI-" без номера задачи значением по умолчанию не считается.
+        if defaults["taskId"] == "OMNI-":
+            defaults["taskId"] = ""
+        return {key: value for key, value in defaults.items() if value}
 
-class DeleteEntry(QWidget):
+    def manifest_action(self):
+        if warn_if_running(self, self.run_controls):
+            return
+        username = self.username_field.text().strip()
+        password = self.password_field.text().strip()
+        if not username or not password:
+            QMessageBox.warning(self, "Input Error", "Пожалуйста, заполните обязательные поля: Username, Password")
+            return
+        selected_envs = self.env_selector.get_selected_envs()
+        if not selected_envs:
+            QMessageBox.warning(self, "Input Error", "Выберите хотя бы одну среду для выполнения запроса")
+            return
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Создать фичи из манифеста", "",
+            "Манифесты (*.csv *.json *.jsonl *.ndjson *.yaml *.yml);;Все файлы (*)")
+        if not path:
+            return
+        try:
+            records = apply_defaults(read_records(path), self.form_defaults())
+            feature_payloads = [build_feature_payload(record) for record in records]
+        except (OSError, ValueError, KeyError) as e:
+            QMessageBox.warning(self, "Input Error", f"Не удалось загрузить манифест: {e}")
+            return
+        if not feature_payloads:
+            QMessageBox.warning(self, "Input Error", "В манифесте нет записей")
+            return
+        errors = validate_payloads(feature_payloads)
+        if errors:
+            QMessageBox.warning(self, "Input Error", f"Ошибок в манифесте: {len(errors)}\n{format_errors(errors)}")
+            return
+        reply = QMessageBox.question(
+            self, "Подтверждение",
+            f"Создать {len(feature_payloads)} фич в средах {', '.join(selected_envs)}?\n"
+            f"{summarize_ids([payload['id'] for payload in feature_payloads])}"
+            + (f"\n{self.rollout_options.describe(selected_envs)}" if self.rollout_options.isChecked() else ""),
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        if reply != QMessageBox.Yes:
+            return
+
+        from workers import CreateMultipleWorker, RolloutWorker
+        self.result_area.clear()
+        if self.rollout_options.isChecked():
+            self.workers = [RolloutWorker("create", {env: feature_payloads for env in selected_envs},
+                                          self.rollout_options.stages(selected_envs), username, password,
+                                          self.rollout_options.options())]
+        else:
+            self.workers = [CreateMultipleWorker(env, username, password, feature_payloads) for env in selected_envs]
+        for worker in self.workers:
+            worker.result_signal.connect(self.append_result)
+            worker.record_signal.connect(self.result_area.append_record)
+        self.run_controls.attach(self.workers)
+        self.progress_panel.reset()
+        for worker in self.workers:
+            worker.progress_signal.connect(self.progress_panel.update_progress)
+            worker.start()
+
+
+class FeatureListModel(QAbstractTableModel):
     """
-    Виджет одного элемента удаления фичи.
-    Содержит одно текстовое поле для ввода ID и кнопку для удаления этого элемента.
+    Модель списка фич для QTableView.
+    Хранит ID в списке, состояния enabled – в компактном bytearray, а позиции ID – в словаре,
+    поэтому проверка дубликатов и удаление строки выполняются за O(1): на место удаляемой
+    строки переносится последняя. Добавление выполняется пачкой с одним сигналом вставки.
     """
 
-    def __init__(self, remove_callback, parent=None):
+    # При удалении большего числа строк модель пересобирается целиком одним сбросом.
+    BULK_REMOVE_THRESHOLD = 1000
+
+    def __init__(self, with_enabled=False, parent=None):
         super().__init__(parent)
-        self.remove_callback = remove_callback
+        self.with_enabled = with_enabled
+        self._ids = []
+        self._enabled = bytearray()
+        self._rows = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return 2 if self.with_enabled else 1
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return ("ID фичи", "Enabled")[section]
+        return section + 1
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if index.column() == 0:
+            if role in (Qt.DisplayRole, Qt.EditRole):
+                return self._ids[row]
+        elif role == Qt.CheckStateRole:
+            return Qt.Checked if self._enabled[row] else Qt.Unchecked
+        elif role == Qt.DisplayRole:
+            return "true" if self._enabled[row] else "false"
+        return None
+
+    def flags(self, index):
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == 0:
+            return flags | Qt.ItemIsEditable
+        return flags | Qt.ItemIsUserCheckable
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid():
+            return False
+        row = index.row()
+        if index.column() == 0 and role == Qt.EditRole:
+            new_id = str(value).strip()
+            old_id = self._ids[row]
+            if not new_id or (new_id != old_id and new_id in self._rows):
+                return False
+            del self._rows[old_id]
+            self._rows[new_id] = row
+            self._ids[row] = new_id
+        elif index.column() == 1 and role == Qt.CheckStateRole:
+            self._enabled[row] = 1 if value == Qt.Checked else 0
+        else:
+            return False
+        self.dataChanged.emit(index, index)
+        return True
+
+    def add_items(self, items):
+        """
+        Добавляет пары (feature_id, enabled); пустые ID и дубликаты пропускаются.
+        :return: количество добавленных строк
+        """
+        batch = {}
+        for feature_id, enabled in items:
+            feature_id = feature_id.strip()
+            if feature_id and feature_id not in self._rows and feature_id not in batch:
+                batch[feature_id] = 1 if enabled else 0
+        if not batch:
+            return 0
+        first = len(self._ids)
+        self.beginInsertRows(QModelIndex(), first, first + len(batch) - 1)
+        for row, (feature_id, enabled) in enumerate(batch.items(), first):
+            self._rows[feature_id] = row
+        self._ids.extend(batch.keys())
+        self._enabled.extend(batch.values())
+        self.endInsertRows()
+        return len(batch)
+
+    def remove_rows(self, rows):
+        """Удаляет строки с указанными номерами."""
+        rows = sorted(set(rows), reverse=True)
+        if len(rows) > self.BULK_REMOVE_THRESHOLD:
+            removed = set(rows)
+            self.beginResetModel()
+            keep = [row for row in range(len(self._ids)) if row not in removed]
+            self._ids = [self._ids[row] for row in keep]
+            self._enabled = bytearray(self._enabled[row] for row in keep)
+            self._rows = {feature_id: row for row, feature_id in enumerate(self._ids)}
+            self.endResetModel()
+            return
+        for row in rows:
+            last = len(self._ids) - 1
+            removed_id = self._ids[row]
+            if row != last:
+                moved_id = self._ids[last]
+                self._ids[row] = moved_id
+                self._enabled[row] = self._enabled[last]
+                self._rows[moved_id] = row
+                self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+            self.beginRemoveRows(QModelIndex(), last, last)
+            self._ids.pop()
+            self._enabled.pop()
+            del self._rows[removed_id]
+            self.endRemoveRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self._ids = []
+        self._enabled = bytearray()
+        self._rows = {}
+        self.endResetModel()
+
+    def ids(self):
+        """Возвращает список ID фич."""
+        return list(self._ids)
+
+    def items(self):
+        """Возвращает список кортежей (feature_id, "true"/"false")."""
+        return [(feature_id, "true" if enabled else "false") for feature_id, enabled in zip(self._ids, self._enabled)]
+
+
+class FeatureListEditor(QWidget):
+    """
+    Виджет редактирования списка фич на основе FeatureListModel и QTableView.
+    Содержит поле ввода ID с автодополнением по каталогу (Enter или "+" – добавить), вставку списка из буфера обмена (Ctrl+V),
+    загрузку из файла (CSV/JSON/JSONL/TXT) и удаление выделенных строк (Delete).
+    При with_enabled=True у каждой фичи есть флажок Enabled.
+    """
+
+    def __init__(self, with_enabled=False, parent=None):
+        super().__init__(parent)
+        self.model = FeatureListModel(with_enabled)
         self.init_ui()
 
     def init_ui(self):
-        layout = QHBoxLayout()
+        layout = QVBoxLayout()
+        input_layout = QHBoxLayout()
         self.feature_id_edit = QLineEdit()
-        self.feature_id_edit.setPlaceholderText("ID фичи")
-        layout.addWidget(self.feature_id_edit)
-        self.remove_button = QPushButton("X")
-        self.remove_button.setFixedWidth(30)
-        self.remove_button.clicked.connect(lambda: self.remove_callback(self))
-        layout.addWidget(self.remove_button)
+        self.feature_id_edit.setPlaceholderText("ID фичи (Enter – добавить)")
+        self.feature_id_edit.returnPressed.connect(self.add_from_input)
+        # Автодополнение по каталогу фич: модель отсортирована, поэтому поиск по префиксу – двоичный.
+        self.completion_model = QStringListModel(self)
+        self.completer = QCompleter(self.completion_model, self)
+        self.completer.setCaseSensitivity(Qt.CaseInsensitive)
+        self.completer.setModelSorting(QCompleter.CaseInsensitivelySortedModel)
+        self.feature_id_edit.setCompleter(self.completer)
+        input_layout.addWidget(self.feature_id_edit)
+        self.enabled_combo = None
+        if self.model.with_enabled:
+            self.enabled_combo = QComboBox()
+            self.enabled_combo.addItems(["true", "false"])
+            input_layout.addWidget(self.enabled_combo)
+        self.add_button = QPushButton("+")
+        self.add_button.setFixedWidth(30)
+        self.add_button.clicked.connect(self.add_from_input)
+        input_layout.addWidget(self.add_button)
+        layout.addLayout(input_layout)
+
+        buttons_layout = QHBoxLayout()
+        self.paste_button = QPushButton("Вставить из буфера")
+        self.paste_button.clicked.connect(self.paste_from_clipboard)
+        buttons_layout.addWidget(self.paste_button)
+        self.load_button = QPushButton("Загрузить из файла")
+        self.load_button.clicked.connect(self.load_from_file)
+        buttons_layout.addWidget(self.load_button)
+        self.remove_button = QPushButton("Удалить выбранные")
+        self.remove_button.clicked.connect(self.remove_selected)
+        buttons_layout.addWidget(self.remove_button)
+        self.clear_button = QPushButton("Очистить")
+        self.clear_button.clicked.connect(self.model.clear)
+        buttons_layout.addWidget(self.clear_button)
+        buttons_layout.addStretch()
+        self.count_label = QLabel()
+        buttons_layout.addWidget(self.count_label)
+        layout.addLayout(buttons_layout)
+
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        # Фиксированная высота строк: QTableView не измеряет содержимое и отрисовывает только видимые строки.
+        self.view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.view.verticalHeader().setDefaultSectionSize(self.view.fontMetrics().height() + 6)
+        self.view.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        QShortcut(QKeySequence.Delete, self.view, self.remove_selected)
+        QShortcut(QKeySequence.Paste, self.view, self.paste_from_clipboard)
+        layout.addWidget(self.view)
         layout.setContentsMargins(0, 0, 0, 0)
         self.setLayout(layout)
 
-    def get_data(self):
-        return self.feature_id_edit.text().strip()
+        self.model.rowsInserted.connect(self.update_count)
+        self.model.rowsRemoved.connect(self.update_count)
+        self.model.modelReset.connect(self.update_count)
+        self.update_count()
+
+    def update_count(self):
+        self.count_label.setText(f"Всего: {self.model.rowCount()}")
+
+    def set_completions(self, feature_ids):
+        """Задаёт список ID для автодополнения поля ввода."""
+        self.completion_model.setStringList(sorted(feature_ids, key=str.lower))
+
+    def default_enabled(self):
+        return self.enabled_combo is not None and self.enabled_combo.currentText() == "true"
+
+    def add_from_input(self):
+        self.model.add_items([(self.feature_id_edit.text(), self.default_enabled())])
+        self.feature_id_edit.clear()
+
+    def parse_text(self, text):
+        """
+        Разбирает вставленный текст: ID разделяются переводами строк, пробелами, ',' или ';'.
+        Для списка с enabled строка вида "ID<TAB>true" задаёт состояние фичи.
+        """
+        default = self.default_enabled()
+        items = []
+        for line in text.splitlines():
+            tokens = [token for token in re.split(r"[\s,;]+", line) if token]
+            if (self.model.with_enabled and len(tokens) == 2
+                    and tokens[1].lower() in ("true", "false")):
+                items.append((tokens[0], tokens[1].lower() == "true"))
+            else:
+                items.extend((token, default) for token in tokens)
+        return items
+
+    def paste_from_clipboard(self):
+        self.model.add_items(self.parse_text(QApplication.clipboard().text()))
+
+    def load_from_file(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Загрузить список фич", "", "Списки фич (*.csv *.json *.jsonl *.ndjson *.txt);;Все файлы (*)")
+        if not path:
+            return
+        try:
+            records = read_records(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Input Error", f"Не удалось загрузить файл: {e}")
+            return
+        default = self.default_enabled()
+        self.model.add_items(
+            (record["id"], parse_bool(record["enabled"]) if record.get("enabled") not in (None, "") else default)
+            for record in records)
+
+    def remove_selected(self):
+        self.model.remove_rows(index.row() for index in self.view.selectionModel().selectedRows())
+
 
+def summarize_ids(feature_ids, limit=20):
+    """Возвращает перечисление ID для диалога подтверждения, сокращённое до limit элементов."""
+    text = ", ".join(feature_ids[:limit])
+    if len(feature_ids) > limit:
+        text += f" и ещё {len(feature_ids) - limit}"
+    return text
 
-class DeleteTab(QWidget):
+
+class BulkOperationTab(QWidget):
     """
-    Вкладка для удаления фича‑флагов.
-    Содержит поля Username и Password, виджет для выбора сред,
-    а также область для динамического добавления записей удаления (каждая запись – поле для ID).
-    При нажатии на кнопку Delete отправляется DELETE‑запрос для каждого указанного ID.
+    Общая часть вкладок массовых операций над списком фич (DeleteTab, UpdateActivityTab):
+    автодополнение ID из каталога, запуск worker-ов с журналом запуска и продолжение прерванного запуска.
+    Подкласс задаёт op ("delete" или "update") и worker_class – имя worker-а модуля workers, выполняющего
+    операцию в одной среде: worker_class(env, username, password, данные, journal=..., preflight_check=...).
     """
 
+    op = None
+    worker_class = None
+
     def __init__(self):
         super().__init__()
-        self.delete_entries = []
         self.workers = []
+        self.journal = None
+        self.running_workers = 0
+        self.catalogue_worker = None
+        self.catalogue_loaded = False
         self.init_ui()
+        self.preflight_checkbox.toggled.connect(self.on_preflight_toggled)
+
+    def append_result(self, text):
+        self.result_area.append(text)
+
+    def on_preflight_toggled(self, checked):
+        """Асинхронный движок не выполняет предварительную проверку, поэтому вместе с ней недоступен."""
+        if checked:
+            self.async_checkbox.setChecked(False)
+        self.async_checkbox.setEnabled(ASYNC_ENGINE_AVAILABLE and not checked)
+
+    def load_cached_catalogue(self):
+        """Заполняет автодополнение ID из локальных снимков каталога (без сетевых запросов)."""
+        if self.catalogue_loaded:
+            return
+        self.catalogue_loaded = True
+        from catalogue import cached_ids
+        self.feature_list.set_completions(cached_ids())
+
+    def refresh_catalogue(self):
+        if self.catalogue_worker is not None and self.catalogue_worker.isRunning():
+            return
+        username = self.username_field.text().strip()
+        password = self.password_field.text().strip()
+        selected_envs = self.env_selector.get_selected_envs()
+        if not username or not password or not selected_envs:
+            QMessageBox.warning(self, "Input Error",
+                                "Для загрузки каталога заполните Username, Password и выберите среды")
+            return
+        from workers import CatalogueWorker
+        self.catalogue_worker = CatalogueWorker(selected_envs, username, password)
+        self.catalogue_worker.result_signal.connect(self.append_result)
+        self.catalogue_worker.catalogue_signal.connect(self.on_catalogue_loaded)
+        self.catalogue_worker.finished.connect(self.on_catalogue_finished)
+        self.catalogue_button.setEnabled(False)
+        self.catalogue_worker.start()
+
+    def on_catalogue_finished(self):
+        self.catalogue_button.setEnabled(True)
+
+    def on_catalogue_loaded(self, catalogues):
+        from catalogue import cached_ids
+        self.catalogue_loaded = True
+        self.feature_list.set_completions(cached_ids())
+
+    def start_run(self, data, selected_envs, username, password):
+        """
+        Создаёт журнал запуска операции над data во всех selected_envs и запускает worker-ы.
+        Если журнал создать не удалось, запуск выполняется без него (продолжить его будет нельзя).
+        """
+        from journal import Journal
+        jobs = {env: data for env in selected_envs}
+        try:
+            journal = Journal.create(self.op, jobs)
+        except OSError as e:
+            self.append_result(f"Не удалось создать журнал запуска, продолжить прерванный запуск будет нельзя: {e}")
+            journal = None
+        self.start_workers(jobs, journal, username, password)
+
+    def start_workers(self, jobs, journal, username, password):
+        """
+        Запускает worker_class для каждой среды из jobs (или один RolloutWorker для поэтапного запуска,
+        один ProcessEngineWorker, если выбраны отдельные процессы, или один AsyncEngineWorker для асинхронного
+        движка); результаты пишутся в журнал запуска.
+        """
+        import workers
+        self.journal = journal
+        preflight_check = self.preflight_checkbox.isChecked()
+        if self.rollout_options.isChecked():
+            self.workers = [workers.RolloutWorker(self.op, jobs, self.rollout_options.stages(list(jobs)), username,
+                                                  password, self.rollout_options.options(), journal=journal,
+                                                  preflight_check=preflight_check)]
+        elif self.process_checkbox.isChecked():
+            self.workers = [workers.ProcessEngineWorker(self.op, jobs, username, password, journal=journal,
+                                                        preflight_check=preflight_check)]
+        elif self.async_checkbox.isChecked():
+            self.workers = [workers.AsyncEngineWorker([(env, self.op, data) for env, data in jobs.items()],
+                                                      username, password, journal=journal)]
+        else:
+            worker_class = getattr(workers, self.worker_class)
+            self.workers = [worker_class(env, username, password, data, journal=journal,
+                                         preflight_check=preflight_check)
+                            for env, data in jobs.items()]
+        self.running_workers = len(self.workers)
+        for worker in self.workers:
+            worker.result_signal.connect(self.append_result)
+            worker.record_signal.connect(self.result_area.append_record)
+            worker.finished.connect(self.on_worker_finished)
+        self.run_controls.attach(self.workers)
+        self.progress_panel.reset()
+        for worker in self.workers:
+            if hasattr(worker, "progress_signal"):
+                worker.progress_signal.connect(self.progress_panel.update_progress)
+            worker.start()
+
+    def on_worker_finished(self):
+        self.running_workers -= 1
+        if self.running_workers == 0 and self.journal is not None:
+            self.journal.finish()
+            left = sum(len(data) for data in self.journal.remaining().values())
+            if left:
+                self.append_result(f"Не выполнено элементов: {left}. "
+                                   f"Их можно повторить кнопкой «Продолжить прерванный запуск».")
+            self.journal = None
+
+    def resume_action(self):
+        if warn_if_running(self, self.run_controls):
+            return
+        username = self.username_field.text().strip()
+        password = self.password_field.text().strip()
+        if not username or not password:
+            QMessageBox.warning(self, "Input Error", "Заполните обязательные поля: Username, Password")
+            return
+        journal = choose_unfinished_journal(self, self.op)
+        if journal is None:
+            return
+        self.result_area.clear()
+        self.start_workers(journal.resume(), journal, username, password)
+
+
+class DeleteTab(BulkOperationTab):
+    """
+    Вкладка для удаления фича‑флагов.
+    Содержит поля Username и Password, виджет для выбора сред,
+    а также список фич для удаления (FeatureListEditor: ввод, вставка из буфера, загрузка из файла).
+    При нажатии на кнопку Delete отправляется DELETE‑запрос для каждого указанного ID.
+    """
+
+    op = "delete"
+    worker_class = "DeleteMultipleWorker"
 
     def init_ui(self):
         layout = QVBoxLayout()
@@ -263,40 +1129,41 @@ class DeleteTab(QWidget):
         layout.addLayout(form_layout)
         self.env_selector = EnvironmentSelector()
         layout.addWidget(self.env_selector)
+        self.catalogue_button = QPushButton("Обновить каталог фич")
+        self.catalogue_button.setToolTip("Загрузить список фич выбранных сред для автодополнения ID")
+        self.catalogue_button.clicked.connect(self.refresh_catalogue)
+        layout.addWidget(self.catalogue_button, alignment=Qt.AlignLeft)
         self.entries_group = QGroupBox("Фичи для удаления:")
         self.entries_layout = QVBoxLayout()
+        self.feature_list = FeatureListEditor()
+        self.entries_layout.addWidget(self.feature_list)
         self.entries_group.setLayout(self.entries_layout)
         layout.addWidget(self.entries_group)
-        # Добавляем одно поле по умолчанию:
-        self.add_entry()
-        self.add_entry_button = QPushButton("+")
-        self.add_entry_button.setFixedWidth(30)
-        self.add_entry_button.clicked.connect(self.add_entry)
-        layout.addWidget(self.add_entry_button, alignment=Qt.AlignLeft)
+        self.preflight_checkbox = create_preflight_checkbox("Не отправлять запросы для фич, которых нет в среде")
+        layout.addWidget(self.preflight_checkbox)
+        self.process_checkbox = create_process_checkbox()
+        layout.addWidget(self.process_checkbox)
+        self.async_checkbox = create_async_checkbox()
+        layout.addWidget(self.async_checkbox)
+        self.rollout_options = RolloutOptions()
+        layout.addWidget(self.rollout_options)
         self.delete_button = QPushButton("Удалить фича-флаги")
         self.delete_button.clicked.connect(self.submit_action)
         layout.addWidget(self.delete_button)
-        self.result_area = QTextEdit()
-        self.result_area.setReadOnly(True)
+        self.run_controls = RunControls()
+        layout.addWidget(self.run_controls)
+        self.progress_panel = ProgressPanel()
+        layout.addWidget(self.progress_panel)
+        self.resume_button = QPushButton("Продолжить прерванный запуск")
+        self.resume_button.clicked.connect(self.resume_action)
+        layout.addWidget(self.resume_button)
+        self.result_area = ResultLog()
         layout.addWidget(self.result_area)
         self.setLayout(layout)
 
-    def add_entry(self):
-        entry = DeleteEntry(self.remove_entry)
-        self.delete_entries.append(entry)
-        self.entries_layout.addWidget(entry)
-
-    def remove_entry(self, entry):
-        if entry in self.delete_entries:
-            self.entries_layout.removeWidget(entry)
-            entry.deleteLater()
-            self.delete_entries.remove(entry)
-
-    def append_result(self, text):
-        self.result_area.append(text)
-        self.result_area.append("-" * 60)
-
     def submit_action(self):
+        if warn_if_running(self, self.run_controls):
+            return
         self.result_area.clear()
         username = self.username_field.text().strip()
         password = self.password_field.text().strip()
@@ -304,7 +1171,7 @@ class DeleteTab(QWidget):
             QMessageBox.warning(self, "Input Error", "Заполните обязательные поля: Username, Password")
             return
 
-        feature_ids = [entry.get_data() for entry in self.delete_entries if entry.get_data()]
+        feature_ids = self.feature_list.model.ids()
         if not feature_ids:
             QMessageBox.warning(self, "Input Error", "Нет добавленных записей для удаления")
             return
@@ -318,7 +1185,9 @@ class DeleteTab(QWidget):
         msg_box = QMessageBox(self)
         msg_box.setIcon(QMessageBox.Warning)
         msg_box.setWindowTitle("Подтверждение удаления")
-        msg_box.setText(f"Вы действительно хотите удалить фича-флаги: {', '.join(feature_ids)}?")
+        msg_box.setText(f"Вы действительно хотите удалить фича-флаги: {summarize_ids(feature_ids)}?")
+        if self.rollout_options.isChecked():
+            msg_box.setInformativeText(self.rollout_options.describe(selected_envs))
         msg_box.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
         response = msg_box.exec_()
 
@@ -326,59 +1195,21 @@ class DeleteTab(QWidget):
             return  # Пользователь нажал "Нет", прерываем операцию
 
         # Запуск удаления
-        self.workers = []
-        for env in selected_envs:
-            worker = DeleteMultipleWorker(env, username, password, feature_ids)
-            worker.result_signal.connect(self.append_result)
-            self.workers.append(worker)
-            worker.start()
-
-
-class UpdateActivityEntry(QWidget):
-    """
-    Виджет одного элемента обновления активности.
-    Содержит поле для ввода ID фичи, combobox для выбора enabled, и кнопку удаления элемента.
-    """
-
-    def __init__(self, remove_callback, parent=None):
-        super().__init__(parent)
-        self.remove_callback = remove_callback
-        self.init_ui()
-
-    def init_ui(self):
-        layout = QHBoxLayout()
-        self.feature_id_edit = QLineEdit()
-        self.feature_id_edit.setPlaceholderText("ID фичи")
-        layout.addWidget(self.feature_id_edit)
-        self.enabled_combo = QComboBox()
-        self.enabled_combo.addItems(["true", "false"])
-        layout.addWidget(self.enabled_combo)
-        self.remove_button = QPushButton("X")
-        self.remove_button.setFixedWidth(30)
-        self.remove_button.clicked.connect(lambda: self.remove_callback(self))
-        layout.addWidget(self.remove_button)
-        layout.setContentsMargins(0, 0, 0, 0)
-        self.setLayout(layout)
+        self.start_run(feature_ids, selected_envs, username, password)
 
-    def get_data(self):
-        return (self.feature_id_edit.text().strip(), self.enabled_combo.currentText().strip())
 
-
-class UpdateActivityTab(QWidget):
+class UpdateActivityTab(BulkOperationTab):
     """
     Вкладка для изменения активности фича‑флагов.
     Содержит поля Username и Password, виджет для выбора сред,
-    а также область для динамического добавления записей обновления (каждая запись содержит ID и enabled).
+    а также список фич для обновления (FeatureListEditor с флажком enabled у каждой фичи).
     При нажатии на кнопку Update для каждого выбранного окружения токен запрашивается один раз,
     а затем для каждой записи отправляется PUT‑запрос вида:
          {base_url}/{ID}/enabled/{enabled}
     """
 
-    def __init__(self):
-        super().__init__()
-        self.update_entries = []
-        self.workers = []
-        self.init_ui()
+    op = "update"
+    worker_class = "ActivityUpdateWorker"
 
     def init_ui(self):
         main_layout = QVBoxLayout()
@@ -394,40 +1225,42 @@ class UpdateActivityTab(QWidget):
         main_layout.addLayout(form_layout)
         self.env_selector = EnvironmentSelector()
         main_layout.addWidget(self.env_selector)
+        self.catalogue_button = QPushButton("Обновить каталог фич")
+        self.catalogue_button.setToolTip("Загрузить список фич выбранных сред для автодополнения ID")
+        self.catalogue_button.clicked.connect(self.refresh_catalogue)
+        main_layout.addWidget(self.catalogue_button, alignment=Qt.AlignLeft)
         self.entries_group = QGroupBox("Фичи для обновления активности:")
         self.entries_layout = QVBoxLayout()
+        self.feature_list = FeatureListEditor(with_enabled=True)
+        self.entries_layout.addWidget(self.feature_list)
         self.entries_group.setLayout(self.entries_layout)
         main_layout.addWidget(self.entries_group)
-        # Добавляем поле по умолчанию
-        self.add_entry()
-        self.add_entry_button = QPushButton("+")
-        self.add_entry_button.setFixedWidth(30)
-        self.add_entry_button.clicked.connect(self.add_entry)
-        main_layout.addWidget(self.add_entry_button, alignment=Qt.AlignLeft)
+        self.preflight_checkbox = create_preflight_checkbox(
+            "Не отправлять запросы для фич, которых нет в среде или которые уже в нужном состоянии")
+        main_layout.addWidget(self.preflight_checkbox)
+        self.process_checkbox = create_process_checkbox()
+        main_layout.addWidget(self.process_checkbox)
+        self.async_checkbox = create_async_checkbox()
+        main_layout.addWidget(self.async_checkbox)
+        self.rollout_options = RolloutOptions()
+        main_layout.addWidget(self.rollout_options)
         self.update_button = QPushButton("Обновить активность фича-флагов")
         self.update_button.clicked.connect(self.submit_action)
         main_layout.addWidget(self.update_button)
-        self.result_area = QTextEdit()
-        self.result_area.setReadOnly(True)
+        self.run_controls = RunControls()
+        main_layout.addWidget(self.run_controls)
+        self.progress_panel = ProgressPanel()
+        main_layout.addWidget(self.progress_panel)
+        self.resume_button = QPushButton("Продолжить прерванный запуск")
+        self.resume_button.clicked.connect(self.resume_action)
+        main_layout.addWidget(self.resume_button)
+        self.result_area = ResultLog()
         main_layout.addWidget(self.result_area)
         self.setLayout(main_layout)
 
-    def add_entry(self):
-        entry = UpdateActivityEntry(self.remove_entry)
-        self.update_entries.append(entry)
-        self.entries_layout.addWidget(entry)
-
-    def remove_entry(self, entry):
-        if entry in self.update_entries:
-            self.entries_layout.removeWidget(entry)
-            entry.deleteLater()
-            self.update_entries.remove(entry)
-
-    def append_result(self, text):
-        self.result_area.append(text)
-        self.result_area.append("-" * 60)
-
     def submit_action(self):
+        if warn_if_running(self, self.run_controls):
+            return
         self.result_area.clear()
         username = self.username_field.text().strip()
         password = self.password_field.text().strip()
@@ -437,36 +1270,37 @@ class UpdateActivityTab(QWidget):
             missing_fields.append("Username")
         if not password:
             missing_fields.append("Password")
-        if not self.update_entries:
+        if not self.feature_list.model.rowCount():
             missing_fields.append("Нет добавленных записей для обновления")
-        else:
-            for i, entry in enumerate(self.update_entries, 1):
-                feature_id, _ = entry.get_data()
-                if not feature_id:
-                    missing_fields.append(f"В записи {i} не заполнен ID")
 
         if missing_fields:
             QMessageBox.warning(self, "Input Error",
                                 "Заполните обязательные поля: " + ", ".join(missing_fields))
             return
 
-        update_list = []
-        feature_ids = []
-        for entry in self.update_entries:
-            feature_id, enabled = entry.get_data()
-            update_list.append((feature_id, enabled))
-            feature_ids.append(feature_id)
+        update_list = self.feature_list.model.items()
+        feature_ids = self.feature_list.model.ids()
 
         selected_envs = self.env_selector.get_selected_envs()
         if not selected_envs:
             QMessageBox.warning(self, "Input Error", "Выберите хотя бы одну среду для обновления")
             return
 
+        # ID не по формату (например, заведённые до его введения) не блокируют обновление.
+        errors = validate_update_items(update_list)
+        if errors and QMessageBox.question(
+                self, "Проверка списка",
+                f"Записей с ошибками: {len(errors)}\n{format_errors(errors)}\n\nВсё равно продолжить?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No) != QMessageBox.Yes:
+            return
+
         # Подтверждение обновления активности
         msg_box = QMessageBox(self)
         msg_box.setIcon(QMessageBox.Warning)
         msg_box.setWindowTitle("Подтверждение обновления активности")
-        msg_box.setText(f"Вы действительно хотите обновить активность фича-флагов: {', '.join(feature_ids)}?")
+        msg_box.setText(f"Вы действительно хотите обновить активность фича-флагов: {summarize_ids(feature_ids)}?")
+        if self.rollout_options.isChecked():
+            msg_box.setInformativeText(self.rollout_options.describe(selected_envs))
         msg_box.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
         response = msg_box.exec_()
 
@@ -474,20 +1308,500 @@ class UpdateActivityTab(QWidget):
             return  # Пользователь нажал "Нет", прерываем операцию
 
         # Запуск обновления активности
+        self.start_run(update_list, selected_envs, username, password)
+
+
+class CatalogueResultModel(QAbstractTableModel):
+    """Модель результатов поиска по каталогу (только чтение)."""
+
+    COLUMNS = (("ID", "id"), ("Enabled", "enabled"), ("Team", "team"),
+               ("Scheduled For Removal", "isScheduledForRemoval"), ("Planned Removal Date", "plannedRemovalDate"))
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._flags = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._flags)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section][0]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        value = self._flags[index.row()].get(self.COLUMNS[index.column()][1])
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        return "" if value is None else str(value)
+
+    def set_flags(self, flags):
+        self.beginResetModel()
+        self._flags = flags
+        self.endResetModel()
+
+    def flags_at(self, rows):
+        return [self._flags[row] for row in rows]
+
+
+class CatalogueTab(QWidget):
+    """
+    Вкладка поиска по каталогу фич (локальные снимки, загруженные кнопкой "Обновить каталог фич").
+    Поиск выполняется по индексу search.CatalogueIndex при каждом изменении условий;
+    найденные (или выделенные) фичи можно отправить во вкладки удаления и изменения активности.
+    """
+
+    RESULT_LIMIT = 5000
+
+    def __init__(self, delete_tab, update_tab):
+        super().__init__()
+        self.delete_tab = delete_tab
+        self.update_tab = update_tab
+        self.index = None
+        self.index_sources = None
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        form_layout = QFormLayout()
+        self.env_field = QComboBox()
+        self.env_field.addItems(["dev", "test", "preprod", "stage", "prod", "Все"])
+        self.env_field.currentIndexChanged.connect(self.reload)
+        form_layout.addRow("Среда:", self.env_field)
+        self.text_field = QLineEdit()
+        self.text_field.setPlaceholderText("Префикс ID (delivery-team.orders.) или слова из ID")
+        self.text_field.textChanged.connect(self.run_search)
+        form_layout.addRow("ID:", self.text_field)
+        self.team_field = QComboBox()
+        self.team_field.currentIndexChanged.connect(self.run_search)
+        form_layout.addRow("Team:", self.team_field)
+        self.audience_target_field = QLineEdit()
+        self.audience_target_field.setPlaceholderText("Сервис из Audience Target")
+        self.audience_target_field.textChanged.connect(self.run_search)
+        form_layout.addRow("Audience Target:", self.audience_target_field)
+        self.enabled_field = QComboBox()
+        self.enabled_field.addItems(["Любое", "true", "false"])
+        self.enabled_field.currentIndexChanged.connect(self.run_search)
+        form_layout.addRow("Enabled:", self.enabled_field)
+        self.scheduled_field = QComboBox()
+        self.scheduled_field.addItems(["Любое", "true", "false"])
+        self.scheduled_field.currentIndexChanged.connect(self.run_search)
+        form_layout.addRow("Is Scheduled For Removal:", self.scheduled_field)
+        self.removal_before_field = QLineEdit()
+        self.removal_before_field.setPlaceholderText("YYYY-MM-DD")
+        self.removal_before_field.textChanged.connect(self.run_search)
+        form_layout.addRow("Planned Removal Date раньше:", self.removal_before_field)
+        layout.addLayout(form_layout)
+
+        self.results_model = CatalogueResultModel(self)
+        self.results_view = QTableView()
+        self.results_view.setModel(self.results_model)
+        self.results_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.results_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.results_view.verticalHeader().setDefaultSectionSize(self.results_view.fontMetrics().height() + 6)
+        self.results_view.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        layout.addWidget(self.results_view)
+
+        buttons_layout = QHBoxLayout()
+        self.count_label = QLabel()
+        buttons_layout.addWidget(self.count_label)
+        buttons_layout.addStretch()
+        self.to_delete_button = QPushButton("В удаление")
+        self.to_delete_button.clicked.connect(self.send_to_delete)
+        buttons_layout.addWidget(self.to_delete_button)
+        self.to_update_button = QPushButton("В изменение активности")
+        self.to_update_button.clicked.connect(self.send_to_update)
+        buttons_layout.addWidget(self.to_update_button)
+        layout.addLayout(buttons_layout)
+        self.setLayout(layout)
+
+    def selected_envs(self):
+        env = self.env_field.currentText()
+        return ["dev", "test", "preprod", "stage", "prod"] if env == "Все" else [env]
+
+    def reload(self):
+        """Перестраивает индекс, если снимки каталога выбранных сред изменились."""
+        from catalogue import load_snapshot
+        from search import CatalogueIndex
+        snapshots = [load_snapshot(env) for env in self.selected_envs()]
+        sources = tuple(id(snapshot) for snapshot in snapshots)
+        if sources != self.index_sources:
+            flags = {}
+            for snapshot in snapshots:
+                for flag in (snapshot or {}).get("flags", []):
+                    flags.setdefault(flag.get("id"), flag)
+            self.index = CatalogueIndex(flags.values())
+            self.index_sources = sources
+            current_team = self.team_field.currentText()
+            self.team_field.blockSignals(True)
+            self.team_field.clear()
+            self.team_field.addItems(["Любая"] + self.index.teams())
+            self.team_field.setCurrentText(current_team)
+            self.team_field.blockSignals(False)
+        self.run_search()
+
+    def search_conditions(self):
+        """Условия поиска из полей вкладки (аргументы CatalogueIndex.search())."""
+        tri_state = {"Любое": None, "true": True, "false": False}
+        team = self.team_field.currentText()
+        return {
+            "text": self.text_field.text(),
+            "team": None if team in ("", "Любая") else team,
+            "audience_target": self.audience_target_field.text(),
+            "enabled": tri_state[self.enabled_field.currentText()],
+            "scheduled_for_removal": tri_state[self.scheduled_field.currentText()],
+            "removal_before": self.removal_before_field.text().strip() or None
+        }
+
+    def run_search(self):
+        if self.index is None:
+            return
+        found = self.index.search(limit=self.RESULT_LIMIT + 1, **self.search_conditions())
+        truncated = len(found) > self.RESULT_LIMIT
+        self.results_model.set_flags(found[:self.RESULT_LIMIT])
+        self.count_label.setText(f"Найдено: {len(found) - truncated}" + ("+" if truncated else "")
+                                 + f" из {len(self.index.flags)}")
+
+    def chosen_flags(self):
+        """
+        Выделенные фичи, а если ничего не выделено – все найденные, включая не показанные в таблице
+        сверх RESULT_LIMIT.
+        """
+        rows = sorted(index.row() for index in self.results_view.selectionModel().selectedRows())
+        if rows:
+            return self.results_model.flags_at(rows)
+        return self.index.search(**self.search_conditions()) if self.index is not None else []
+
+    def send_to_delete(self):
+        self.delete_tab.feature_list.model.add_items((flag["id"], False) for flag in self.chosen_flags())
+
+    def send_to_update(self):
+        self.update_tab.feature_list.model.add_items(
+            (flag["id"], parse_bool(flag.get("enabled"))) for flag in self.chosen_flags())
+
+
+class DriftModel(QAbstractTableModel):
+    """Модель таблицы расхождений: ID, поле и значения по окружениям."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.envs = []
+        self.rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 2 + len(self.envs)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return (["ID", "Поле"] + self.envs)[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        row = self.rows[index.row()]
+        if index.column() == 0:
+            return row["id"]
+        if index.column() == 1:
+            return row["field"]
+        return row["values"].get(self.envs[index.column() - 2], "")
+
+    def set_drift(self, envs, rows):
+        self.beginResetModel()
+        self.envs = list(envs)
+        self.rows = rows
+        self.endResetModel()
+
+
+class DriftTab(QWidget):
+    """
+    Вкладка сравнения фича‑флагов между окружениями.
+    Каталоги выбранных сред загружаются параллельно (DriftWorker), расхождения по enabled, audience
+    и данным об удалении показываются в таблице и могут быть выгружены в CSV/JSON.
+    Кнопка выравнивания запускает ActivityUpdateWorker для каждой среды, где enabled
+    отличается от эталонной среды.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.workers = []
+        self.drift_worker = None
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        form_layout = QFormLayout()
+        self.username_field = QLineEdit()
+        self.username_field.setMinimumWidth(200)
+        self.username_field.setPlaceholderText("Ivan.Ivanov без @X5.RU")
+        form_layout.addRow("Username (Обязательное):", self.username_field)
+        self.password_field = QLineEdit()
+        self.password_field.setMinimumWidth(200)
+        self.password_field.setEchoMode(QLineEdit.Password)
+        form_layout.addRow("Password (Обязательное):", self.password_field)
+        layout.addLayout(form_layout)
+        self.env_selector = EnvironmentSelector()
+        layout.addWidget(self.env_selector)
+        self.compare_button = QPushButton("Сравнить среды")
+        self.compare_button.clicked.connect(self.compare_action)
+        layout.addWidget(self.compare_button)
+
+        self.drift_model = DriftModel(self)
+        self.drift_view = QTableView()
+        self.drift_view.setModel(self.drift_model)
+        self.drift_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.drift_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.drift_view.verticalHeader().setDefaultSectionSize(self.drift_view.fontMetrics().height() + 6)
+        layout.addWidget(self.drift_view)
+
+        actions_layout = QHBoxLayout()
+        self.export_button = QPushButton("Выгрузить расхождения")
+        self.export_button.clicked.connect(self.export_action)
+        actions_layout.addWidget(self.export_button)
+        actions_layout.addStretch()
+        actions_layout.addWidget(QLabel("Эталонная среда:"))
+        self.reference_field = QComboBox()
+        self.reference_field.addItems(["dev", "test", "preprod", "stage", "prod"])
+        actions_layout.addWidget(self.reference_field)
+        self.converge_button = QPushButton("Выровнять enabled по эталону")
+        self.converge_button.clicked.connect(self.converge_action)
+        actions_layout.addWidget(self.converge_button)
+        layout.addLayout(actions_layout)
+        self.run_controls = RunControls()
+        layout.addWidget(self.run_controls)
+        self.progress_panel = ProgressPanel()
+        layout.addWidget(self.progress_panel)
+
+        self.result_area = ResultLog()
+        layout.addWidget(self.result_area)
+        self.setLayout(layout)
+
+    def append_result(self, text):
+        self.result_area.append(text)
+
+    def credentials(self):
+        username = self.username_field.text().strip()
+        password = self.password_field.text().strip()
+        if not username or not password:
+            QMessageBox.warning(self, "Input Error", "Заполните обязательные поля: Username, Password")
+            return None
+        return username, password
+
+    def compare_action(self):
+        if self.drift_worker is not None and self.drift_worker.isRunning():
+            return
+        credentials = self.credentials()
+        if not credentials:
+            return
+        selected_envs = self.env_selector.get_selected_envs()
+        if len(selected_envs) < 2:
+            QMessageBox.warning(self, "Input Error", "Выберите хотя бы две среды для сравнения")
+            return
+        self.result_area.clear()
+        from workers import DriftWorker
+        self.drift_worker = DriftWorker(selected_envs, *credentials)
+        self.drift_worker.result_signal.connect(self.append_result)
+        self.drift_worker.drift_signal.connect(self.on_drift)
+        self.drift_worker.finished.connect(self.on_compare_finished)
+        self.compare_button.setEnabled(False)
+        self.drift_worker.start()
+
+    def on_compare_finished(self):
+        self.compare_button.setEnabled(True)
+
+    def on_drift(self, result):
+        envs, drift = result
+        self.drift_model.set_drift(envs, drift)
+
+    def export_action(self):
+        if not self.drift_model.rows:
+            QMessageBox.warning(self, "Input Error", "Нет расхождений для выгрузки")
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Выгрузить расхождения", "drift.csv", "CSV (*.csv);;JSON (*.json)")
+        if not path:
+            return
+        from drift import export_drift
+        try:
+            export_drift(self.drift_model.rows, self.drift_model.envs, path)
+        except OSError as e:
+            QMessageBox.warning(self, "Export Error", f"Не удалось сохранить файл: {e}")
+
+    def converge_action(self):
+        if warn_if_running(self, self.run_controls):
+            return
+        credentials = self.credentials()
+        if not credentials:
+            return
+        from drift import convergence_batch
+        reference_env = self.reference_field.currentText()
+        if reference_env not in self.drift_model.envs:
+            QMessageBox.warning(self, "Input Error", "Эталонная среда не участвовала в сравнении")
+            return
+        batches = convergence_batch(self.drift_model.rows, reference_env, self.drift_model.envs)
+        if not batches:
+            QMessageBox.information(self, "Выравнивание", "Расхождений по enabled нет")
+            return
+        summary = ", ".join(f"{env}: {len(batch)}" for env, batch in batches.items())
+        msg_box = QMessageBox(self)
+        msg_box.setIcon(QMessageBox.Warning)
+        msg_box.setWindowTitle("Подтверждение выравнивания")
+        msg_box.setText(f"Привести enabled к значениям среды {reference_env}? Изменений по средам: {summary}")
+        msg_box.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
+        if msg_box.exec_() == QMessageBox.No:
+            return
+        from workers import ActivityUpdateWorker
         self.workers = []
-        for env in selected_envs:
-            worker = ActivityUpdateWorker(env, username, password, update_list)
+        for env, update_list in batches.items():
+            worker = ActivityUpdateWorker(env, *credentials, update_list)
             worker.result_signal.connect(self.append_result)
+            worker.record_signal.connect(self.result_area.append_record)
             self.workers.append(worker)
+        self.run_controls.attach(self.workers)
+        self.progress_panel.reset()
+        for worker in self.workers:
+            if hasattr(worker, "progress_signal"):
+                worker.progress_signal.connect(self.progress_panel.update_progress)
             worker.start()
 
 
+class MetricsModel(QAbstractTableModel):
+    """Модель таблицы метрик запросов: окружение, endpoint, этап, число запросов и длительности в мс."""
+
+    HEADERS = ["Среда", "Endpoint", "Этап", "Запросов", "p50, мс", "p95, мс", "Среднее, мс", "Макс, мс"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.TextAlignmentRole):
+            return None
+        column = index.column()
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignRight | Qt.AlignVCenter) if column >= 3 else None
+        series = self.rows[index.row()]
+        if column < 3:
+            return series[("env", "endpoint", "phase")[column]]
+        if column == 3:
+            return series["count"]
+        value = (series["p50"], series["p95"], series["sum"] / series["count"], series["max"])[column - 4]
+        return f"{value * 1000:.2f}"
+
+    def set_series(self, rows):
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
+
+
+class DiagnosticsTab(QWidget):
+    """
+    Вкладка диагностики: длительность этапов запросов (DNS, connect, TLS, ответ сервера, разбор тела)
+    по средам и endpoint-ам из модуля metrics и статусы ответов. Пока вкладка открыта, таблица
+    обновляется раз в REFRESH_INTERVAL_MS; метрики выгружаются в JSON или формат Prometheus.
+    """
+
+    REFRESH_INTERVAL_MS = 1000
+
+    def __init__(self):
+        super().__init__()
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(self.REFRESH_INTERVAL_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        self.metrics_model = MetricsModel(self)
+        self.metrics_view = QTableView()
+        self.metrics_view.setModel(self.metrics_model)
+        self.metrics_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.metrics_view.verticalHeader().setDefaultSectionSize(self.metrics_view.fontMetrics().height() + 6)
+        self.metrics_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        layout.addWidget(self.metrics_view)
+        self.responses_label = QLabel()
+        self.responses_label.setWordWrap(True)
+        layout.addWidget(self.responses_label)
+        buttons_layout = QHBoxLayout()
+        self.refresh_button = QPushButton("Обновить")
+        self.refresh_button.clicked.connect(self.refresh)
+        buttons_layout.addWidget(self.refresh_button)
+        self.reset_button = QPushButton("Сбросить")
+        self.reset_button.clicked.connect(self.reset_action)
+        buttons_layout.addWidget(self.reset_button)
+        buttons_layout.addStretch()
+        self.export_button = QPushButton("Выгрузить метрики")
+        self.export_button.clicked.connect(self.export_action)
+        buttons_layout.addWidget(self.export_button)
+        layout.addLayout(buttons_layout)
+        self.setLayout(layout)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.refresh_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.refresh_timer.stop()
+
+    def refresh(self):
+        import metrics
+        snapshot = metrics.registry.snapshot()
+        self.metrics_model.set_series(snapshot["series"])
+        responses = {}
+        for response in snapshot["responses"]:
+            key = (response["env"], response["endpoint"])
+            responses.setdefault(key, []).append(f"{response['status']}: {response['count']}")
+        self.responses_label.setText("\n".join(f"[{env}] {endpoint} – {', '.join(statuses)}"
+                                               for (env, endpoint), statuses in responses.items()))
+
+    def reset_action(self):
+        import metrics
+        metrics.registry.reset()
+        self.refresh()
+
+    def export_action(self):
+        path, selected_filter = QFileDialog.getSaveFileName(self, "Выгрузить метрики", "ftm_metrics.json",
+                                                            "JSON (*.json);;Prometheus (*.prom)")
+        if not path:
+            return
+        import metrics
+        if selected_filter.startswith("Prometheus") and not path.lower().endswith(".prom"):
+            path += ".prom"
+        try:
+            metrics.export(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Export Error", f"Не удалось сохранить файл: {e}")
+
+
 class MainWindow(QTabWidget):
     """
     Главное окно приложения, содержащее вкладки:
       - "Создание" для создания фича‑флагов,
       - "Удаление" для удаления фича‑флагов,
-      - "Изменение активности" для обновления активности фича‑флагов.
+      - "Изменение активности" для обновления активности фича‑флагов,
+      - "Каталог" для поиска по каталогу фич,
+      - "Сравнение сред" для поиска и устранения расхождений между средами,
+      - "Диагностика" для просмотра длительности запросов по этапам.
     """
 
     def __init__(self):
@@ -499,3 +1813,18 @@ class MainWindow(QTabWidget):
         self.addTab(self.create_tab, "Создание")
         self.addTab(self.delete_tab, "Удаление")
         self.addTab(self.update_tab, "Изменение активности")
+        self.catalogue_tab = CatalogueTab(self.delete_tab, self.update_tab)
+        self.addTab(self.catalogue_tab, "Каталог")
+        self.drift_tab = DriftTab()
+        self.addTab(self.drift_tab, "Сравнение сред")
+        self.diagnostics_tab = DiagnosticsTab()
+        self.addTab(self.diagnostics_tab, "Диагностика")
+        self.currentChanged.connect(self.on_tab_changed)
+
+    def on_tab_changed(self, index):
+        # Снимки каталога читаются с диска при первом открытии вкладки, а не при запуске.
+        tab = self.widget(index)
+        if hasattr(tab, "load_cached_catalogue"):
+            tab.load_cached_catalogue()
+        elif tab is self.catalogue_tab:
+            self.catalogue_tab.reload()
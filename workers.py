@@ -1,107 +1,103 @@
 """
 Модуль workers содержит классы для выполнения сетевых запросов с использованием QThread из PyQt5.
+Сама логика операций находится в модуле operations, worker-ы передают её сообщения в result_signal,
+а результаты по каждой фиче (results.FlagResult) – в record_signal.
 
 Содержимое:
-  - get_token(): получает Bearer‑токен.
-  - BaseWorker: базовый класс для worker‑ов (объединяет получение токена и отправку HTTP‑запросов).
+  - get_token(): получает Bearer‑токен (реэкспорт из client).
+  - BaseWorker: базовый класс для worker‑ов (объединяет получение токена и отправку HTTP‑запросов
+    через общий пул соединений окружения из модуля client).
   - EnvWorker: для создания фича‑флага (POST‑запрос).
+  - CreateMultipleWorker: для создания нескольких фича‑флагов (параллельные POST‑запросы).
   - DeleteEnvWorker: для удаления одного фича‑флага (DELETE‑запрос).
   - DeleteMultipleWorker: для удаления нескольких фич (для каждой в списке – DELETE‑запрос).
   - ActivityUpdateWorker: для обновления активности фича‑флагов (PUT‑запросы).
+  - CatalogueWorker: обновляет каталоги фич выбранных окружений (см. catalogue).
+  - DriftWorker: сравнивает состояние фич между окружениями (см. drift).
+  - AsyncEngineWorker: выполняет задания всех окружений в одном потоке через asyncio (см. async_engine).
+  - ProcessEngineWorker: выполняет задание каждого окружения в отдельном процессе (см. process_engine).
+  - RolloutWorker: выполняет операцию по окружениям поэтапно (см. scheduler).
 """
 
-import requests
-import urllib3
 from PyQt5.QtCore import QThread, pyqtSignal
-from config import ENV_CONFIG
-
-# Отключаем предупреждения об SSL сертификатах
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-
-def get_token(envKC, username, password):
-    """
-    Получает и возвращает Bearer‑токен для указанного окружения.
-
-    :param envKC: ключ окружения ("dev", "test", "preprod", "stage", "prod")
-    :param username: имя пользователя для авторизации
-    :param password: пароль для авторизации
-    :return: токен (str)
-    :raises: ValueError, если токен не найден или произошла ошибка HTTP.
-    """
-    urls = ENV_CONFIG.get(envKC)
-    if not urls:
-        raise ValueError(f"Окружение {envKC} не настроено в ENV_CONFIG.")
-    token_url = urls["token"]
-    token_payload = {
-        "client_id": "feature-service",
-        "username": username,
-        "grant_type": "password",
-        "password": password
-    }
-    response = requests.post(
-        token_url,
-        data=token_payload,
-        headers={"Content-Type": "application/x-www-form-urlencoded"},
-        verify=False
-    )
-    response.raise_for_status()
-    token_json = response.json()
-    token = token_json.get("access_token")
-    if not token:
-        raise ValueError(f"[{envKC}] Не найден access_token в ответе.")
-    return token
+from client import get_token, send_request, OperationControl, RESPONSE_JSON
+from operations import fetch_token, create_features, delete_features, update_activity
+from progress import ProgressTracker
+from results import FlagResult
+from async_engine import AsyncEngine
+from process_engine import ProcessEngine
+from scheduler import run_rollout
+from catalogue import refresh_all
+from drift import fetch_states, compute_drift
 
 
 class BaseWorker(QThread):
     """
     Базовый класс для worker‑ов.
-    Содержит общую логику получения токена и отправки HTTP‑запросов.
+    Содержит общую логику получения токена и отправки HTTP‑запросов;
+    необязательный journal получает результат по каждой фиче.
+    cancel(), pause() и resume() можно вызывать из GUI‑потока во время выполнения.
+    Ход выполнения (см. progress.ProgressTracker.snapshot()) отправляется через progress_signal,
+    результат по каждой фиче – через record_signal.
     """
     result_signal = pyqtSignal(str)
+    record_signal = pyqtSignal(FlagResult)
+    progress_signal = pyqtSignal(object)
 
-    def __init__(self, envKC, username, password, parent=None):
+    def __init__(self, envKC, username, password, journal=None, parent=None):
         super().__init__(parent)
         self.envKC = envKC
         self.username = username
         self.password = password
+        self.control = OperationControl()
+        self.progress = ProgressTracker(envKC, 0, journal.record if journal is not None else None,
+                                        self.progress_signal.emit)
+
+    def on_result(self, result):
+        """
+        Результат по фиче: учитывается в ходе выполнения и итоге, записывается в журнал запуска и
+        отправляется в record_signal (кроме фич, не отправленных из-за остановки – они есть только в итоге).
+        """
+        self.progress.record(result)
+        if not result.cancelled:
+            self.record_signal.emit(result)
+
+    def cancel(self):
+        """Останавливает worker: новые запросы не отправляются, отправленные завершаются по таймауту."""
+        self.control.cancel()
+
+    def pause(self):
+        self.control.pause()
+
+    def resume(self):
+        self.control.resume()
+
+    def emit_summary(self):
+        """Отправляет итог выполнения: что применено, что нет."""
+        if self.control.cancelled:
+            self.result_signal.emit(f"[{self.envKC}] Операция остановлена пользователем.")
+        self.result_signal.emit(self.progress.format(self.envKC))
 
     def get_token_and_notify(self):
         """
         Получает токен и отправляет уведомление через result_signal.
         :return: токен (str) или None, если произошла ошибка.
         """
-        try:
-            token = get_token(self.envKC, self.username, self.password)
-            self.result_signal.emit(f"[{self.envKC}] Получен токен: {token[:30]}...")
-            return token
-        except Exception as e:
-            self.result_signal.emit(f"[{self.envKC}] Ошибка при получении токена: {str(e)}")
-            return None
+        return fetch_token(self.envKC, self.username, self.password, self.result_signal.emit)
 
-    def send_request(self, method, url, headers=None, json_data=None):
+    def send_request(self, method, url, headers=None, json_data=None, response_mode=RESPONSE_JSON):
         """
-        Отправляет HTTP‑запрос.
+        Отправляет HTTP‑запрос через keep-alive сессию окружения.
         :param method: "POST", "PUT" или "DELETE"
         :param url: URL запроса
         :param headers: заголовки запроса
         :param json_data: данные для POST/PUT (если применимо)
-        :return: ответ (json или текст)
+        :param response_mode: обработка тела ответа (см. client.send_request())
+        :return: ответ (json или текст; LazyBody или None для RESPONSE_LAZY и RESPONSE_STATUS)
         :raises: исключение, если запрос завершился ошибкой.
         """
-        if method == "POST":
-            response = requests.post(url, headers=headers, json=json_data, verify=False)
-        elif method == "PUT":
-            response = requests.put(url, headers=headers, json=json_data, verify=False)
-        elif method == "DELETE":
-            response = requests.delete(url, headers=headers, verify=False)
-        else:
-            raise ValueError("Неподдерживаемый HTTP метод.")
-        response.raise_for_status()
-        try:
-            return response.json()
-        except Exception:
-            return response.text
+        return send_request(self.envKC, method, url, headers=headers, json_data=json_data, control=self.control,
+                            response_mode=response_mode)
 
 
 class EnvWorker(BaseWorker):
@@ -109,78 +105,300 @@ class EnvWorker(BaseWorker):
     Worker для создания фича‑флага – отправляет POST‑запрос.
     """
 
-    def __init__(self, envKC, username, password, feature_payload, parent=None):
-        super().__init__(envKC, username, password, parent)
+    def __init__(self, envKC, username, password, feature_payload, journal=None, parent=None):
+        super().__init__(envKC, username, password, journal, parent)
         self.feature_payload = feature_payload
+        self.progress.total = 1
 
     def run(self):
         token = self.get_token_and_notify()
         if not token:
+            self.progress.finish()
             return
-        feature_url = ENV_CONFIG[self.envKC]["feature"]
-        headers = {
-            "accept": "*/*",
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {token}"
-        }
-        try:
-            resp = self.send_request("POST", feature_url, headers=headers, json_data=self.feature_payload)
-            self.result_signal.emit(f"[{self.envKC}] Feature создан успешно. Ответ: {resp}")
-        except Exception as e:
-            self.result_signal.emit(f"[{self.envKC}] Ошибка при создании: {str(e)}")
+        self.progress.start()
+        create_features(self.envKC, token, [self.feature_payload], self.result_signal.emit, self.on_result,
+                        self.control)
+        self.progress.finish()
+        if self.control.cancelled:
+            self.emit_summary()
+
+
+class CreateMultipleWorker(BaseWorker):
+    """
+    Worker для создания нескольких фича‑флагов (например, из манифеста).
+    Принимает список feature_payloads и для каждого отправляет POST‑запрос;
+    запросы выполняются параллельно с ограничениями из client.run_concurrently().
+    """
+
+    def __init__(self, envKC, username, password, feature_payloads, journal=None, parent=None):
+        super().__init__(envKC, username, password, journal, parent)
+        self.feature_payloads = feature_payloads
+        self.progress.total = len(feature_payloads)
+
+    def run(self):
+        token = self.get_token_and_notify()
+        if not token:
+            self.progress.finish()
+            return
+        self.progress.start()
+        create_features(self.envKC, token, self.feature_payloads, self.result_signal.emit, self.on_result,
+                        self.control)
+        self.progress.finish()
+        self.emit_summary()
 
 
 class DeleteMultipleWorker(BaseWorker):
     """
     Worker для удаления нескольких фича‑флагов.
-    Принимает список feature_ids и для каждого отправляет DELETE‑запрос.
+    Принимает список feature_ids и для каждого отправляет DELETE‑запрос;
+    запросы выполняются параллельно с ограничениями из client.run_concurrently().
+    С preflight_check=True запросы для фич, которых нет в окружении, не отправляются.
     """
 
-    def __init__(self, envKC, username, password, feature_ids, parent=None):
-        super().__init__(envKC, username, password, parent)
+    def __init__(self, envKC, username, password, feature_ids, journal=None, parent=None, preflight_check=False):
+        super().__init__(envKC, username, password, journal, parent)
         self.feature_ids = feature_ids
+        self.preflight_check = preflight_check
+        self.progress.total = len(feature_ids)
 
     def run(self):
         token = self.get_token_and_notify()
         if not token:
+            self.progress.finish()
             return
-        base_url = ENV_CONFIG[self.envKC]["feature"]
-        for feature_id in self.feature_ids:
-            delete_url = f"{base_url}/{feature_id}"
-            headers = {"accept": "*/*", "Authorization": f"Bearer {token}"}
-            try:
-                resp = self.send_request("DELETE", delete_url, headers=headers)
-                self.result_signal.emit(f"[{self.envKC}] Фича с id '{feature_id}' успешно удалена. Ответ: {resp}")
-            except Exception as e:
-                self.result_signal.emit(f"[{self.envKC}] Ошибка при удалении фичи '{feature_id}': {str(e)}")
+        self.progress.start()
+        delete_features(self.envKC, token, self.feature_ids, self.result_signal.emit, self.on_result, self.control,
+                        self.preflight_check)
+        self.progress.finish()
+        self.emit_summary()
 
 
 class ActivityUpdateWorker(BaseWorker):
     """
     Worker для обновления активности фича‑флагов.
     Для каждого обновления из update_list (список кортежей (feature_id, enabled))
-    отправляется PUT‑запрос вида: {base_url}/{feature_id}/enabled/{enabled}
+    отправляется PUT‑запрос вида: {base_url}/{feature_id}/enabled/{enabled};
+    запросы выполняются параллельно с ограничениями из client.run_concurrently().
+    С preflight_check=True запросы для фич, которых нет в окружении или у которых enabled
+    уже имеет нужное значение, не отправляются.
     """
 
-    def __init__(self, envKC, username, password, update_list, parent=None):
-        super().__init__(envKC, username, password, parent)
+    def __init__(self, envKC, username, password, update_list, journal=None, parent=None, preflight_check=False):
+        super().__init__(envKC, username, password, journal, parent)
         self.update_list = update_list
+        self.preflight_check = preflight_check
+        self.progress.total = len(update_list)
 
     def run(self):
         token = self.get_token_and_notify()
         if not token:
+            self.progress.finish()
             return
-        base_url = ENV_CONFIG[self.envKC]["feature"]
-        for feature_id, enabled in self.update_list:
-            update_url = f"{base_url}/{feature_id}/enabled/{enabled}"
-            headers = {
-                "accept": "*/*",
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {token}"
-            }
-            try:
-                resp = self.send_request("PUT", update_url, headers=headers)
-                self.result_signal.emit(
-                    f"[{self.envKC}] Обновление активности фичи '{feature_id}' на '{enabled}' успешно. Ответ: {resp}")
-            except Exception as e:
-                self.result_signal.emit(f"[{self.envKC}] Ошибка при обновлении фичи '{feature_id}': {str(e)}")
+        self.progress.start()
+        update_activity(self.envKC, token, self.update_list, self.result_signal.emit, self.on_result, self.control,
+                        self.preflight_check)
+        self.progress.finish()
+        self.emit_summary()
+
+
+class CatalogueWorker(QThread):
+    """
+    Worker для обновления каталогов фич нескольких окружений.
+    Сообщения о ходе обновления отправляются через result_signal,
+    итоговый словарь {envKC: список фич} – через catalogue_signal.
+    """
+    result_signal = pyqtSignal(str)
+    catalogue_signal = pyqtSignal(object)
+
+    def __init__(self, envs, username, password, parent=None):
+        super().__init__(parent)
+        self.envs = envs
+        self.username = username
+        self.password = password
+
+    def run(self):
+        catalogues = refresh_all(self.envs, self.username, self.password, self.result_signal.emit)
+        self.catalogue_signal.emit(catalogues)
+
+
+class DriftWorker(QThread):
+    """
+    Worker для поиска расхождений между окружениями.
+    Загружает каталоги выбранных окружений параллельно и отправляет через drift_signal
+    кортеж (список окружений, список расхождений из drift.compute_drift()).
+    """
+    result_signal = pyqtSignal(str)
+    drift_signal = pyqtSignal(object)
+
+    def __init__(self, envs, username, password, parent=None):
+        super().__init__(parent)
+        self.envs = envs
+        self.username = username
+        self.password = password
+
+    def run(self):
+        states = fetch_states(self.envs, self.username, self.password, self.result_signal.emit)
+        envs = [env for env in self.envs if env in states]
+        drift = compute_drift({env: states[env] for env in envs})
+        self.result_signal.emit(f"Сравнение {', '.join(envs)}: найдено расхождений – {len(drift)}")
+        self.drift_signal.emit((envs, drift))
+
+
+class AsyncEngineWorker(QThread):
+    """
+    Worker, выполняющий задания сразу для всех выбранных окружений в одном потоке
+    через асинхронный движок async_engine. Сигналы те же, что у BaseWorker: ход выполнения
+    отправляется по каждому окружению, результаты по фичам записываются в необязательный journal,
+    после завершения или остановки по каждому окружению отправляется итог.
+    """
+    result_signal = pyqtSignal(str)
+    record_signal = pyqtSignal(FlagResult)
+    progress_signal = pyqtSignal(object)
+
+    def __init__(self, jobs, username, password, journal=None, parent=None):
+        super().__init__(parent)
+        self.engine = AsyncEngine(jobs, username, password, self.result_signal.emit, self.on_result)
+        totals = {}
+        for env, op, data in jobs:
+            totals[env] = totals.get(env, 0) + (1 if op == "create" else len(data))
+        self.progress = {env: ProgressTracker(env, total, journal.record if journal is not None else None,
+                                              self.progress_signal.emit)
+                         for env, total in totals.items()}
+
+    def on_result(self, result):
+        self.progress[result.env].record(result)
+        if not result.cancelled:
+            self.record_signal.emit(result)
+
+    def run(self):
+        for progress in self.progress.values():
+            progress.start()
+        try:
+            started = self.engine.run()
+        except Exception as e:
+            self.result_signal.emit(f"Ошибка асинхронного движка: {str(e)}")
+            started = {}
+        for env, progress in self.progress.items():
+            progress.finish()
+            if not started.get(env):
+                continue
+            if self.engine.control.cancelled:
+                self.result_signal.emit(f"[{env}] Операция остановлена пользователем.")
+            self.result_signal.emit(progress.format(env))
+
+    def cancel(self):
+        self.engine.cancel()
+
+    def pause(self):
+        self.engine.control.pause()
+
+    def resume(self):
+        self.engine.control.resume()
+
+
+class ProcessEngineWorker(QThread):
+    """
+    Worker, выполняющий операцию op для окружений jobs ({envKC: данные операции}) в отдельных процессах
+    через process_engine. Сигналы те же, что у BaseWorker: ход выполнения отправляется по каждому
+    окружению, результаты по фичам записываются в необязательный journal.
+    """
+    result_signal = pyqtSignal(str)
+    record_signal = pyqtSignal(FlagResult)
+    progress_signal = pyqtSignal(object)
+
+    def __init__(self, op, jobs, username, password, journal=None, preflight_check=False, parent=None):
+        super().__init__(parent)
+        self.engine = ProcessEngine(op, jobs, username, password, self.result_signal.emit, self.on_result,
+                                    preflight_check)
+        self.progress = {env: ProgressTracker(env, len(data), journal.record if journal is not None else None,
+                                              self.progress_signal.emit)
+                         for env, data in jobs.items()}
+
+    def on_result(self, result):
+        self.progress[result.env].record(result)
+        if not result.cancelled:
+            self.record_signal.emit(result)
+
+    def run(self):
+        for progress in self.progress.values():
+            progress.start()
+        try:
+            started = self.engine.run()
+        except Exception as e:
+            self.result_signal.emit(f"Ошибка запуска процессов: {str(e)}")
+            started = {}
+        for env, progress in self.progress.items():
+            progress.finish()
+            if not started.get(env):
+                continue
+            if self.engine.control.cancelled:
+                self.result_signal.emit(f"[{env}] Операция остановлена пользователем.")
+            self.result_signal.emit(progress.format(env))
+
+    def cancel(self):
+        self.engine.control.cancel()
+
+    def pause(self):
+        self.engine.control.pause()
+
+    def resume(self):
+        self.engine.control.resume()
+
+
+class RolloutWorker(QThread):
+    """
+    Worker, выполняющий операцию op по окружениям jobs ({envKC: данные операции}) поэтапно
+    через scheduler.run_rollout(): stages – этапы (scheduler.build_stages()), rollout_options –
+    необязательные параметры run_rollout() (gap, max_error_rate, min_sample).
+    Ход выполнения отправляется по каждому окружению с начала его этапа.
+    """
+    result_signal = pyqtSignal(str)
+    record_signal = pyqtSignal(FlagResult)
+    progress_signal = pyqtSignal(object)
+
+    def __init__(self, op, jobs, stages, username, password, rollout_options=None, journal=None,
+                 preflight_check=False, parent=None):
+        super().__init__(parent)
+        self.op = op
+        self.jobs = jobs
+        self.stages = stages
+        self.username = username
+        self.password = password
+        self.rollout_options = rollout_options or {}
+        self.preflight_check = preflight_check
+        self.control = OperationControl()
+        self.progress = {env: ProgressTracker(env, len(data), journal.record if journal is not None else None,
+                                              self.progress_signal.emit)
+                         for env, data in jobs.items()}
+
+    def on_result(self, result):
+        self.progress[result.env].record(result)
+        if not result.cancelled:
+            self.record_signal.emit(result)
+
+    def on_stage(self, envKC):
+        self.progress[envKC].start()
+
+    def run(self):
+        try:
+            started, _ = run_rollout(self.op, self.jobs, self.stages, self.username, self.password,
+                                     self.result_signal.emit, self.on_result, self.control,
+                                     preflight_check=self.preflight_check, on_stage=self.on_stage,
+                                     **self.rollout_options)
+        except Exception as e:
+            self.result_signal.emit(f"Ошибка поэтапного запуска: {str(e)}")
+            started = {}
+        for stage in self.stages:
+            if stage.env in started:
+                self.progress[stage.env].finish()
+            if started.get(stage.env):
+                self.result_signal.emit(self.progress[stage.env].format(stage.env))
+
+    def cancel(self):
+        self.control.cancel()
+
+    def pause(self):
+        self.control.pause()
+
+    def resume(self):
+        self.control.resume()